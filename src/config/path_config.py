@@ -9,6 +9,9 @@ PROJECT_ROOT = os.path.dirname(
 # 模型模板文件路径
 MODEL_FILE = os.path.join(PROJECT_ROOT, "src", "config", "test2.spp")
 
+# 结果目录
+RESULT_DIR = os.path.join(PROJECT_ROOT, "src", "result")
+
 # 生成的模型保存路径（保存到result目录）
 SAVED_MODEL_FILE = os.path.join(PROJECT_ROOT, "src", "result", "saved.spp")
 
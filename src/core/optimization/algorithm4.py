@@ -2,8 +2,13 @@
 import random
 import math
 import json
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional, Set
 from src.config.path_config import DEFAULT_PRODUCTION_LINE_FILE
+from .pareto_archive import ParetoArchive
+from .solution_types import solution_key
+
+MAX_MOVE_RADIUS = 3  # 邻域耗尽时单个缓冲区最大调整步长
+PROPOSAL_ATTEMPTS = 20  # 每种邻域规模下寻找未访问方案的尝试次数
 
 
 class Algorithm4:
@@ -12,12 +17,14 @@ class Algorithm4:
         buffer_names: List[str],
         max_buffer_per_slot: int,
         buffer_conveyor_map: Dict[str, int],
+        guide: Optional[Any] = None,
     ):
         """
         初始化带平均化的模拟退火算法
         :param buffer_names: 线边缓冲区名称列表（如 ["B1", "B2", ..., "B10"]）
         :param max_buffer_per_slot: 每个缓冲区的最大容量
         :param buffer_conveyor_map: 缓冲区→传送带固定容量映射
+        :param guide: 瓶颈引导（bottleneck.BottleneckGuide），为空时随机选择调整的缓冲区
         """
         # 新增参数：连续无更优解的终止阈值
         self.no_improve_threshold = 100  # 可自定义，如连续10次无改进则终止
@@ -28,6 +35,7 @@ class Algorithm4:
         self.buffer_names = buffer_names
         self.max_buffer = max_buffer_per_slot
         self.buffer_conveyor_map = buffer_conveyor_map
+        self.guide = guide
         self.current_solution: Dict[str, int] = {}
         self.current_total_buffer: int = 0
         self.temperature: float = 0.0
@@ -36,8 +44,23 @@ class Algorithm4:
         self.iteration: int = 0
         # 历史方案: (方案, 总容量, 是否达标, 吞吐量)
         self.history_solutions: List[Tuple[Dict[str, int], int, bool, int]] = []
+        # 历史方案的增量索引：帕累托存档与达标最优方案（只处理新增的历史方案）
+        self.archive = ParetoArchive()
+        self._archived = 0
+        self._best_qualified: Optional[Tuple[Dict[str, int], int, bool, int]] = None
         # 方案吞吐量历史记录（键: 排序后的方案元组, 值: 吞吐量列表）
         self.observations: Dict[Tuple[Tuple[str, int], ...], List[int]] = {}
+        # 已访问方案（已仿真或已被预筛），候选解生成时不再提出
+        self.visited: Set[Tuple[Tuple[str, int], ...]] = set()
+        self.tabu_rejections = 0  # 因已访问而被重新生成的提议数
+        # 可行移动表：步长 → 缓冲区 → 当前容量 → 满足约束的容量增量
+        self.move_table: Dict[int, Dict[str, Dict[int, Tuple[int, ...]]]] = {
+            radius: {
+                buf: self._feasible_moves(self.buffer_conveyor_map[buf], radius)
+                for buf in buffer_names
+            }
+            for radius in range(1, MAX_MOVE_RADIUS + 1)
+        }
 
         self._init_initial_solution()
         self.temperature = max(self.current_total_buffer * 5, 100)  # 保证最低温度
@@ -64,9 +87,54 @@ class Algorithm4:
             f"Algorithm 4 初始解：{self.current_solution}，总容量：{self.current_total_buffer}"
         )
 
-    def _generate_candidate_solution(self) -> Dict[str, int]:
-        """生成满足约束条件的候选解（可同时调整多个缓冲区）"""
+    @staticmethod
+    def _feasible_moves(fixed_cap: int, radius: int) -> Dict[int, Tuple[int, ...]]:
+        """缓冲区各容量下步长不超过 radius 的可行增量（容量非负且总容量在[1, 10]内）"""
+        low, high = max(0, 1 - fixed_cap), 10 - fixed_cap
+        return {
+            cap: tuple(
+                delta
+                for delta in range(-radius, radius + 1)
+                if delta and low <= cap + delta <= high
+            )
+            for cap in range(low, high + 1)
+        }
+
+    def _choose_buffers(self, num_to_change: int, directions: Dict[str, int]) -> List[str]:
+        """选择要调整的缓冲区：有建议方向的缓冲区按引导权重优先被选中"""
+        if not directions:
+            # 从所有缓冲区中随机选择不重复的num_to_change个
+            return random.sample(self.buffer_names, num_to_change)
+        names, weights = list(self.buffer_names), self.guide.weights(directions)
+        chosen = []
+        for _ in range(num_to_change):
+            index = random.choices(range(len(names)), weights=weights)[0]
+            chosen.append(names.pop(index))
+            weights.pop(index)
+        return chosen
+
+    def _propose(
+        self, num_to_change: int, radius: int, directions: Optional[Dict[str, int]] = None
+    ) -> Dict[str, int]:
+        """选 num_to_change 个缓冲区，按可行移动表各做一次调整（有建议方向时取同向增量）"""
+        directions = directions or {}
         candidate = self.current_solution.copy()
+        for buf in self._choose_buffers(num_to_change, directions):
+            moves = self.move_table[radius][buf].get(candidate[buf])
+            direction = directions.get(buf)
+            if moves and direction:
+                moves = tuple(delta for delta in moves if delta * direction > 0) or moves
+            if moves:
+                candidate[buf] += random.choice(moves)
+        return candidate
+
+    def _generate_candidate_solution(self) -> Dict[str, int]:
+        """生成满足约束且未访问过的候选解（可同时调整多个缓冲区）
+
+        按温度决定调整的缓冲区数量；邻域内找不到未访问方案时依次扩大
+        调整的缓冲区数量与单步步长，全部耗尽时才返回已访问的方案。
+        设置了瓶颈引导时，按当前解的状态统计偏向瓶颈相邻与从未满载的缓冲区。
+        """
         # 随机确定本次要调整的缓冲区数量（例如1到3个，可根据需求修改范围）
         if (
             self.temperature > self.initial_temperature * 0.5
@@ -76,26 +144,25 @@ class Algorithm4:
             num_to_change = random.randint(2, 4)
         else:  # 低温阶段（低于初始值的10%）
             num_to_change = random.randint(1, 2)  # 少修改缓冲区，精细优化
-        # 从所有缓冲区中随机选择不重复的num_to_change个
-        selected_bufs = random.sample(self.buffer_names, num_to_change)
-
-        for buf in selected_bufs:
-            fixed_cap = self.buffer_conveyor_map[buf]
-            current_cap = candidate[buf]
-            new_cap = current_cap
-
-            # 为每个选中的缓冲区寻找符合约束的新容量值
-            while True:
-                delta = random.choice([-1, 1])  # 小步微调
-                new_cap = current_cap + delta
-                # 确保容量非负且总容量（固定+缓冲）在[1, 10]范围内
-                if new_cap >= 0 and 1 <= (fixed_cap + new_cap) <= 10:
-                    break
-
-            candidate[buf] = new_cap
 
+        directions = (
+            self.guide.directions(self.current_solution) if self.guide is not None else {}
+        )
+        candidate = self.current_solution.copy()
+        for radius in range(1, MAX_MOVE_RADIUS + 1):
+            for count in range(num_to_change, len(self.buffer_names) + 1):
+                for _ in range(PROPOSAL_ATTEMPTS):
+                    candidate = self._propose(count, radius, directions)
+                    if self._get_solution_key(candidate) not in self.visited:
+                        return candidate
+                    self.tabu_rejections += 1
+        print("⚠️ 邻域内的方案均已访问，返回已访问的候选解")
         return candidate
 
+    def mark_visited(self, solution: Dict[str, int]) -> None:
+        """将方案加入已访问集合（未仿真但已被预筛或剪枝的候选解）"""
+        self.visited.add(self._get_solution_key(solution))
+
     def _calculate_total_buffer(self, solution: Dict[str, int]) -> int:
         """计算方案的总缓冲区容量"""
         return sum(solution.values())
@@ -104,7 +171,7 @@ class Algorithm4:
         self, solution: Dict[str, int]
     ) -> Tuple[Tuple[str, int], ...]:
         """将方案转换为可哈希的元组键（按名称排序）"""
-        return tuple(sorted(solution.items()))
+        return solution_key(solution)
 
     def update_current_solution(
         self, candidate: Dict[str, int], candidate_total: int
@@ -119,33 +186,44 @@ class Algorithm4:
         observations = self.observations.get(solution_key, [])
         return sum(observations) // len(observations) if observations else 0
 
-    def _accept_candidate(
+    def _acceptance_probability(
         self, candidate_total: int, candidate_qualified: bool, current_qualified: bool
-    ) -> bool:
-        """模拟退火接受准则"""
+    ) -> float:
+        """模拟退火接受概率"""
         # 候选解达标且总容量更小：直接接受
         if candidate_qualified and candidate_total < self.current_total_buffer:
-            return True
+            return 1.0
 
         # 候选解达标但总容量更大：按概率接受
         if candidate_qualified and candidate_total >= self.current_total_buffer:
-            accept_prob = math.exp(
+            return math.exp(
                 -(candidate_total - self.current_total_buffer) / self.temperature
             )
-            return random.random() < accept_prob
 
         # 候选解不达标但当前解达标：极低概率接受
         if not candidate_qualified and current_qualified:
-            accept_prob = (
+            return (
                 math.exp(
                     -(self.current_total_buffer - candidate_total) / self.temperature
                 )
                 * 0.1
             )
-            return random.random() < accept_prob
 
         # 两者都不达标：拒绝
-        return False
+        return 0.0
+
+    def _accept_candidate(
+        self, candidate_total: int, candidate_qualified: bool, current_qualified: bool
+    ) -> bool:
+        """模拟退火接受准则"""
+        accept_prob = self._acceptance_probability(
+            candidate_total, candidate_qualified, current_qualified
+        )
+        if accept_prob >= 1.0:
+            return True
+        if accept_prob <= 0.0:
+            return False
+        return random.random() < accept_prob
 
     def reject_candidate(self) -> None:
         """处理拒绝候选解的情况"""
@@ -170,16 +248,35 @@ class Algorithm4:
         """记录历史方案"""
         self.history_solutions.append((solution, total, qualified, throughput))
 
+    def _sync_history(self) -> None:
+        """将新增的历史方案并入帕累托存档与达标最优记录
+
+        历史列表可能被其他优化器直接追加（如共享列表的遗传算法），因此按已处理的
+        条数增量同步，而不是在 add_history_solution 中维护。
+        """
+        history = self.history_solutions
+        for index in range(self._archived, len(history)):
+            solution, total, qualified, throughput = history[index]
+            self.archive.add(solution, throughput)
+            # 总容量相同时保留先出现的方案
+            if qualified and (
+                self._best_qualified is None or total < self._best_qualified[1]
+            ):
+                self._best_qualified = history[index]
+        self._archived = len(history)
+
+    def get_archive(self) -> ParetoArchive:
+        """总容量–平均吞吐量的帕累托存档（已并入全部历史方案）"""
+        self._sync_history()
+        return self.archive
+
     def get_best_solution(self) -> Tuple[Dict[str, int], int, int]:
         """获取最优解（达标且总容量最小）"""
-        qualified_solutions = [s for s in self.history_solutions if s[2]]
-
-        if not qualified_solutions:
+        self._sync_history()
+        if self._best_qualified is None:
             return self.current_solution, self.current_total_buffer, 0.0
 
-        # 按总容量升序排序，取第一个
-        qualified_solutions.sort(key=lambda x: x[1])
-        best_sol, best_total, _, best_throughput = qualified_solutions[0]
+        best_sol, best_total, _, best_throughput = self._best_qualified
         # 新增：若当前最优解优于历史记录，重置计数器
         if best_total < self.best_total_so_far:
             self.best_total_so_far = best_total
@@ -194,3 +291,50 @@ class Algorithm4:
         if solution_key not in self.observations:
             self.observations[solution_key] = []
         self.observations[solution_key].append(throughput)
+        self.visited.add(solution_key)
+
+    def get_state(self) -> Dict[str, Any]:
+        """导出可JSON序列化的完整优化状态（含全局随机数发生器状态），用于检查点"""
+        return {
+            "current_solution": self.current_solution,
+            "current_total_buffer": self.current_total_buffer,
+            "temperature": self.temperature,
+            "initial_temperature": self.initial_temperature,
+            "iteration": self.iteration,
+            "no_improve_count": self.no_improve_count,
+            "best_total_so_far": self.best_total_so_far,
+            "history_solutions": self.history_solutions,
+            "observations": [[list(k), v] for k, v in self.observations.items()],
+            "visited": [list(k) for k in self.visited],
+            "tabu_rejections": self.tabu_rejections,
+            "random_state": random.getstate(),
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """从 get_state 导出的状态恢复，之后的候选解与接受判定与中断前完全一致"""
+        self.current_solution = dict(state["current_solution"])
+        self.current_total_buffer = state["current_total_buffer"]
+        self.temperature = state["temperature"]
+        self.initial_temperature = state["initial_temperature"]
+        self.iteration = state["iteration"]
+        self.no_improve_count = state["no_improve_count"]
+        self.best_total_so_far = state["best_total_so_far"]
+        self.history_solutions = [
+            (dict(sol), total, qualified, throughput)
+            for sol, total, qualified, throughput in state["history_solutions"]
+        ]
+        self.archive = ParetoArchive()
+        self._archived = 0
+        self._best_qualified = None
+        self.observations = {
+            tuple((name, cap) for name, cap in key): list(values)
+            for key, values in state["observations"]
+        }
+        # 较早的检查点没有已访问集合，至少包含所有已仿真方案
+        self.visited = set(self.observations) | {
+            tuple((name, cap) for name, cap in key) for key in state.get("visited", [])
+        }
+        self.tabu_rejections = state.get("tabu_rejections", 0)
+        # JSON 将元组存为列表，random.setstate 需要还原为元组
+        version, internal, gauss_next = state["random_state"]
+        random.setstate((version, tuple(internal), gauss_next))
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单次长时间仿真 + 预热期检测 + 批均值估计
+
+validate_solution 默认对每个方案做5次独立的30天仿真，每次都从空线开始，
+重复经历预热期并复位模型。批均值估计改为每个方案只做一次长时间仿真：
+- 按固定周期（默认1小时）推进仿真并记录每个周期的产出，得到产出时间序列
+- 用 MSER-5 检测初始瞬态：删除使剩余序列均值标准误最小的前若干周期
+- 剩余序列等分为若干批，批均值近似独立同分布，给出稳态均值与置信区间
+- 吞吐量报告为稳态周期产出折算到30天的件数，可直接与29000件比较
+
+与5次独立重复相比（在 summary 中给出）：
+- 模型复位与预热只发生一次，仿真时长相同时有效观测更多，置信区间自由度更高
+  （默认生产线上150天一次运行的半宽约为估计值的0.5%）
+- 估计的是稳态月产能，不含30天仿真从空线开始的预热损失，与"从空线开始跑30天"
+  的原始口径略有差异（默认生产线预热期不足 MSER-5 的一批，差异在噪声范围内）；
+  批均值置信区间依赖批间近似独立，批数过多（批太短）时区间偏窄
+可按研究需要选择口径：--batch-means 启用，其余情况保持独立重复。
+"""
+import copy
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.stat_utils import batch_means, mser_truncation
+from .des_simulator import DEFAULT_END_TIME, SECONDS_PER_DAY, parse_time_seconds
+
+
+def open_ended(graph_data: dict) -> dict:
+    """有向图副本：源不再在30天时停止生成（stop_time 为0表示不停止），
+    与源同时停止的故障也不再停止，仿真时长只由结束时间决定"""
+    graph = copy.deepcopy(graph_data)
+    for node in graph["nodes"]:
+        if node["type"] != "源":
+            continue
+        time_data = node.setdefault("data", {}).setdefault("time", {})
+        source_stop = time_data.get("stop_time")
+        time_data["stop_time"] = "0"
+        for other in graph["nodes"]:
+            failure = other.get("data", {}).get("failure")
+            if failure and source_stop is not None and failure.get("stop_time") == source_stop:
+                failure["stop_time"] = "0"
+    return graph
+
+
+class BatchMeansEstimator:
+    """按周期记录一次长时间仿真的产出序列，MSER-5截断预热期后用批均值估计稳态吞吐量"""
+
+    def __init__(
+        self,
+        period_seconds: float = 3600,
+        num_batches: int = 20,
+        confidence: float = 0.95,
+        mser_batch: int = 5,
+        reference_end_time: str = DEFAULT_END_TIME,
+    ):
+        """
+        :param period_seconds: 产出序列的记录周期（仿真秒）
+        :param num_batches: 截断预热期后的批数
+        :param confidence: 置信区间的置信度
+        :param mser_batch: MSER 的批大小（MSER-5 为5）
+        :param reference_end_time: 吞吐量折算的时长（30天）
+        """
+        self.period_seconds = period_seconds
+        self.num_batches = num_batches
+        self.confidence = confidence
+        self.mser_batch = mser_batch
+        self.reference_periods = parse_time_seconds(reference_end_time) / period_seconds
+
+    def run(self, advance: Callable[[float], int], end_seconds: float) -> Dict[str, Any]:
+        """
+        逐周期推进一次仿真并估计稳态吞吐量
+        :param advance: 推进仿真到给定时刻（秒）并返回累计产出
+        """
+        series: List[int] = []
+        previous, now = 0, 0.0
+        while now + self.period_seconds <= end_seconds:
+            now += self.period_seconds
+            deleted = advance(now)
+            series.append(deleted - previous)
+            previous = deleted
+        if now < end_seconds:
+            advance(end_seconds)  # 不足一个周期的尾段不计入序列
+        return self.estimate(series)
+
+    def estimate(self, series: List[int]) -> Dict[str, Any]:
+        """由产出序列估计稳态吞吐量"""
+        warmup = mser_truncation(series, self.mser_batch)
+        mean, half_width, batch_size = batch_means(
+            series[warmup:], self.num_batches, self.confidence
+        )
+        return {
+            "period_seconds": self.period_seconds,
+            "periods": len(series),
+            "warmup_periods": warmup,
+            "batch_size": batch_size,
+            "mean_per_period": mean,
+            "half_width_per_period": half_width,
+            "throughput": int(round(mean * self.reference_periods)),
+            "half_width": half_width * self.reference_periods,
+        }
+
+    @staticmethod
+    def apply(results: Dict[str, Any], estimate: Dict[str, Any]) -> Dict[str, Any]:
+        """把批均值估计写入结果字典（吞吐量改为折算到30天的稳态估计）"""
+        results["batch_means"] = estimate
+        results["throughput"] = estimate["throughput"]
+        return results
+
+
+class BatchMeansLog:
+    """汇总各次长时间仿真的预热期与置信区间（仿真可能在子进程中执行，按结果字典统计）"""
+
+    def __init__(self):
+        self.runs = 0
+        self.warmup_seconds = 0.0
+        self.simulated_seconds = 0.0
+        self.relative_half_widths: List[float] = []
+
+    def record(self, solution: Dict[str, int], results: Optional[Dict[str, Any]]) -> None:
+        estimate = (results or {}).get("batch_means")
+        if estimate is None:
+            return
+        self.runs += 1
+        period = estimate["period_seconds"]
+        self.warmup_seconds += estimate["warmup_periods"] * period
+        self.simulated_seconds += estimate["periods"] * period
+        if estimate["throughput"]:
+            self.relative_half_widths.append(estimate["half_width"] / estimate["throughput"])
+        print(
+            f"📈 预热期{estimate['warmup_periods'] * period / 3600:g}小时（MSER-5），"
+            f"每批{estimate['batch_size'] * period / 3600:g}小时，稳态吞吐量"
+            f"{estimate['throughput']}±{estimate['half_width']:.0f}件/30天"
+        )
+
+    def summary(self, replications: int = 5, reference_end_time: str = DEFAULT_END_TIME) -> str:
+        if not self.runs:
+            return "批均值估计：没有长时间仿真"
+        reference_days = parse_time_seconds(reference_end_time) / SECONDS_PER_DAY
+        run_days = self.simulated_seconds / self.runs / SECONDS_PER_DAY
+        warmup_hours = self.warmup_seconds / self.runs / 3600
+        mean_width = sum(self.relative_half_widths) / max(1, len(self.relative_half_widths))
+        return (
+            f"批均值估计：{self.runs}次长时间仿真，每次{run_days:g}天，"
+            f"平均预热期{warmup_hours:.1f}小时，置信区间半宽平均为估计值的{mean_width:.2%}；"
+            f"对比{replications}次独立重复：每个方案复位1次而非{replications}次，"
+            f"仿真{run_days:g}天而非{replications * reference_days:g}天，"
+            f"预热只经历1次而非{replications}次（稳态口径，不含30天从空线开始的预热损失）"
+        )
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+优化算法基准：模拟退火（Algorithm4）、遗传算法与贪心分配的"达到目标所需仿真次数"
+
+使用伪后端（FakeBackend）和一个各缓冲区收益不同的可分离响应面：
+真实最优总容量可用动态规划精确求出，且初始方案（全1）不达标，
+算法需要真正搜索。每个随机种子下两种算法使用相同的噪声序列，记录：
+- 达到目标所需仿真次数：首次找到"验证达标、真实吞吐量也达标且总容量
+  不超过 最优总容量 + tolerance"的方案时，累计的单次仿真次数
+- 预算用尽时找到的最优（真实达标）总容量
+
+用法：python -m src.core.optimization.benchmark_optimizers --seeds 10 --budget 300
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+from typing import Callable, Dict, List, Optional
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config.path_config import DEFAULT_PRODUCTION_LINE_FILE
+from src.core.optimization.evaluation_pipeline import validate_batch
+from src.core.optimization.genetic_algorithm import GeneticAlgorithm
+from src.core.optimization.greedy_allocation import GreedyAllocation
+from src.core.optimization.optimize import (
+    create_buffer_conveyor_map,
+    extract_conveyor_capacities,
+    initialize_algorithm,
+    load_production_line_data,
+)
+from src.core.optimization.simulation_backend import BackendEvaluator, FakeBackend
+from src.core.optimization.solution_types import solution_key
+
+SIMULATION_END_TIME = "2592000"
+TARGET_TOTAL = 29000
+BUFFER_NAMES = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8", "B9", "B10"]
+# 各缓冲区的相对收益（模拟瓶颈附近的缓冲区更重要）
+BENCHMARK_WEIGHTS = {
+    "B1": 1.0, "B2": 0.4, "B3": 1.5, "B4": 1.3, "B5": 0.5,
+    "B6": 1.2, "B7": 0.8, "B8": 0.3, "B9": 1.0, "B10": 0.6,
+}
+
+
+def benchmark_throughput(buffer_solution: Dict[str, int]) -> float:
+    """基准响应面：可分离、边际收益递减，全1方案约27800件"""
+    return 23000 + sum(
+        BENCHMARK_WEIGHTS[name] * 1400 * (1 - 0.6**cap)
+        for name, cap in buffer_solution.items()
+    )
+
+
+def optimal_total(bounds: Dict[str, range], throughput_fn=benchmark_throughput) -> int:
+    """可分离响应面上达标的最小总容量（对总容量做动态规划）"""
+    base = throughput_fn({name: 0 for name in bounds})
+    # best[t]：总容量为 t 时可获得的最大增益
+    best = {0: 0.0}
+    for name, caps in bounds.items():
+        gains = {
+            cap: throughput_fn({**{n: 0 for n in bounds}, name: cap}) - base for cap in caps
+        }
+        merged: Dict[int, float] = {}
+        for total, gain in best.items():
+            for cap, extra in gains.items():
+                key = total + cap
+                merged[key] = max(merged.get(key, -1e18), gain + extra)
+        best = merged
+    return min(total for total, gain in best.items() if base + gain >= TARGET_TOTAL)
+
+
+class _Tracker:
+    """统计仿真次数，记录首次达到目标时的累计仿真次数"""
+
+    def __init__(self, backend: FakeBackend, target: int, num_simulations: int):
+        self.backend = backend
+        self.evaluator = BackendEvaluator(backend)
+        self.target = target
+        self.num_simulations = num_simulations
+        self.simulations = 0
+        self.hit: Optional[int] = None
+        self.best_total: Optional[int] = None
+
+    def validate(self, solutions: List[Dict[str, int]]):
+        results = validate_batch(
+            solutions, SIMULATION_END_TIME, self.num_simulations, evaluator=self.evaluator
+        )
+        self.simulations += self.num_simulations * len(
+            {solution_key(s) for s in solutions}
+        )
+        for solution, (qualified, _) in zip(solutions, results):
+            total = sum(solution.values())
+            truly = self.backend.throughput_fn(solution) >= TARGET_TOTAL
+            if qualified and truly:
+                if self.best_total is None or total < self.best_total:
+                    self.best_total = total
+                if total <= self.target and self.hit is None:
+                    self.hit = self.simulations
+        return results
+
+
+def run_annealing(tracker: _Tracker, conv_map: Dict[str, int], budget: int) -> None:
+    """与 optimize.run_annealing 相同的模拟退火主循环（不含预筛与检查点）"""
+    algo4 = initialize_algorithm(BUFFER_NAMES, max_buffer=5, conv_map=conv_map)
+    current_qualified, throughput = tracker.validate([algo4.current_solution])[0]
+    algo4._update_observations(algo4.current_solution, throughput)
+    while algo4.iteration < budget and algo4.temperature > 0.1:
+        candidate = algo4._generate_candidate_solution()
+        candidate_total = algo4._calculate_total_buffer(candidate)
+        candidate_qualified, throughput = tracker.validate([candidate])[0]
+        algo4._update_observations(candidate, throughput)
+        if algo4._accept_candidate(candidate_total, candidate_qualified, current_qualified):
+            algo4.update_current_solution(candidate, candidate_total)
+            current_qualified = candidate_qualified
+        algo4.iteration += 1
+        algo4.cool_temperature()
+
+
+def run_genetic(
+    tracker: _Tracker, conv_map: Dict[str, int], budget: int, population_size: int
+) -> None:
+    algo4 = initialize_algorithm(BUFFER_NAMES, max_buffer=5, conv_map=conv_map)
+    ga = GeneticAlgorithm(
+        BUFFER_NAMES, conv_map, algo4.current_solution, population_size=population_size
+    )
+    ga.initialize(tracker.validate)
+    ga.run(tracker.validate, budget, patience=budget)
+
+
+def run_greedy(tracker: _Tracker, conv_map: Dict[str, int], budget: int) -> None:
+    greedy = GreedyAllocation(BUFFER_NAMES, conv_map)
+    greedy.initialize(tracker.validate)
+    greedy.run(tracker.validate, budget)
+
+
+def benchmark(
+    seeds: int, budget: int, population_size: int, tolerance: int, num_simulations: int
+) -> None:
+    graph_data = load_production_line_data(DEFAULT_PRODUCTION_LINE_FILE)
+    conv_map = create_buffer_conveyor_map(extract_conveyor_capacities(graph_data))
+    bounds = {
+        name: range(max(0, 1 - conv_map[name]), 10 - conv_map[name] + 1)
+        for name in BUFFER_NAMES
+    }
+    optimum = optimal_total(bounds)
+    target = optimum + tolerance
+    print(f"基准响应面最优总容量：{optimum}，目标：达标且总容量≤{target}")
+    print(f"每个方案仿真{num_simulations}次，每种算法最多评估{budget}个方案，{seeds}个随机种子")
+
+    methods: Dict[str, Callable[[_Tracker], None]] = {
+        "模拟退火": lambda tracker: run_annealing(tracker, conv_map, budget),
+        f"遗传算法(种群{population_size})": lambda tracker: run_genetic(
+            tracker, conv_map, budget, population_size
+        ),
+        "贪心分配": lambda tracker: run_greedy(tracker, conv_map, budget),
+    }
+    for name, method in methods.items():
+        hits, finals, used = [], [], []
+        for seed in range(1, seeds + 1):
+            random.seed(seed)
+            tracker = _Tracker(
+                FakeBackend(benchmark_throughput, base_seed=seed), target, num_simulations
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                method(tracker)
+            used.append(tracker.simulations)
+            if tracker.hit is not None:
+                hits.append(tracker.hit)
+            if tracker.best_total is not None:
+                finals.append(tracker.best_total)
+        reached = (
+            f"中位数{statistics.median(hits):.0f}次，平均{statistics.mean(hits):.0f}次"
+            if hits
+            else "均未达到"
+        )
+        final = f"{statistics.mean(finals):.1f}" if finals else "—"
+        print(
+            f"📊 {name}：{len(hits)}/{seeds}次达到目标，所需仿真{reached}；"
+            f"平均共仿真{statistics.mean(used):.0f}次，平均最终最优总容量{final}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="各优化算法的达到目标仿真次数基准")
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--budget", type=int, default=300, help="每种算法最多评估的方案数")
+    parser.add_argument("--population", type=int, default=12, help="遗传算法种群规模")
+    parser.add_argument("--tolerance", type=int, default=0, help="目标总容量允许超出最优的量")
+    parser.add_argument("--replications", type=int, default=5, help="每个方案的仿真次数")
+    args = parser.parse_args()
+    benchmark(args.seeds, args.budget, args.population, args.tolerance, args.replications)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+瓶颈引导的候选解生成
+
+Algorithm4 的候选解是对随机缓冲区的盲目 ±1 调整。仿真后端在吞吐量之外
+还能给出各工位的状态时间占比（加工/阻塞/等待/故障）与各缓冲区的占用统计
+（results() 中的 stations / buffers），据此可以判断调整方向：
+- StateStatistics：在评估步骤中收集每个方案各次仿真的状态统计并取平均
+- BottleneckGuide：对当前解的统计做瓶颈分析
+  - 瓶颈工位取活动时间占比（加工 + 故障）最大的工位
+  - 瓶颈上游紧邻的缓冲区在瓶颈出现等待（缺料）时建议扩容，
+    下游紧邻的缓冲区在瓶颈出现阻塞时建议扩容
+  - 占用量从未达到容量（或满容量时间占比低于阈值）的缓冲区建议缩容
+  Algorithm4 按这些方向提高相应缓冲区被选中的概率，并优先采用同向的增量
+
+没有状态统计的后端（如 FakeBackend）不提供方向，候选解生成退化为原来的随机调整。
+"""
+from typing import Any, Dict, List, Optional
+
+from .solution_types import SolutionKey, solution_key
+
+# 跨重复仿真取最大值（而非平均值）的统计
+PEAK_STATISTICS = ("capacity", "max_occupancy")
+STATION_TYPES = ("工位", "物料终结")
+
+
+class StateStatistics:
+    """按方案累计各次仿真的工位状态占比与缓冲区占用统计"""
+
+    def __init__(self):
+        # 方案 → {"stations": {工位: {状态: 占比之和}}, "buffers": {缓冲区: {统计: 和}}}
+        self.totals: Dict[SolutionKey, Dict[str, Dict[str, Dict[str, float]]]] = {}
+        self.counts: Dict[SolutionKey, int] = {}
+
+    def record(self, solution: Dict[str, int], results: Optional[Dict[str, Any]]) -> None:
+        """记录一次仿真的结果字典（不含 stations 的结果直接忽略）"""
+        if not results or not results.get("stations"):
+            return
+        key = solution_key(solution)
+        totals = self.totals.setdefault(key, {"stations": {}, "buffers": {}})
+        for group in ("stations", "buffers"):
+            for name, values in results.get(group, {}).items():
+                target = totals[group].setdefault(name, {})
+                for stat, value in values.items():
+                    if stat in PEAK_STATISTICS:
+                        target[stat] = max(target.get(stat, 0), value)
+                    else:
+                        target[stat] = target.get(stat, 0.0) + value
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def get(self, solution: Dict[str, int]) -> Optional[Dict[str, Dict[str, Dict[str, float]]]]:
+        """方案各次仿真的平均统计（最大占用量取各次的最大值），未记录时返回 None"""
+        key = solution_key(solution)
+        count = self.counts.get(key)
+        if not count:
+            return None
+        totals = self.totals[key]
+        averaged = {"stations": {}, "buffers": {}}
+        for group, items in totals.items():
+            for name, values in items.items():
+                averaged[group][name] = {
+                    stat: value if stat in PEAK_STATISTICS else value / count
+                    for stat, value in values.items()
+                }
+        return averaged
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "totals": [
+                [list(key), self.totals[key], self.counts[key]] for key in self.totals
+            ]
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.totals, self.counts = {}, {}
+        for key, totals, count in state.get("totals", []):
+            key = tuple((name, cap) for name, cap in key)
+            self.totals[key] = totals
+            self.counts[key] = count
+
+
+class BottleneckGuide:
+    """由当前解的状态统计给出各缓冲区的建议调整方向（+1扩容 / -1缩容）"""
+
+    def __init__(
+        self,
+        graph_data: dict,
+        buffer_names: List[str],
+        statistics: Optional[StateStatistics] = None,
+        weight: float = 4.0,
+        state_threshold: float = 0.01,
+        full_threshold: float = 0.05,
+    ):
+        """
+        :param graph_data: 生产线有向图（nodes/edges），用于确定缓冲区的上下游工位
+        :param buffer_names: 参与优化的缓冲区
+        :param statistics: 状态统计收集器，为空时新建
+        :param weight: 有建议方向的缓冲区被选中的相对权重（无方向的缓冲区为1）
+        :param state_threshold: 瓶颈的等待/阻塞占比超过该值才建议扩容相邻缓冲区
+        :param full_threshold: 满容量时间占比低于该值的缓冲区视为从未满载，建议缩容
+        """
+        self.buffer_names = list(buffer_names)
+        self.statistics = statistics if statistics is not None else StateStatistics()
+        self.weight = weight
+        self.state_threshold = state_threshold
+        self.full_threshold = full_threshold
+        stations = {
+            node["name"] for node in graph_data["nodes"] if node["type"] in STATION_TYPES
+        }
+        # 缓冲区 → 紧邻的上游 / 下游工位
+        self.upstream: Dict[str, List[str]] = {name: [] for name in self.buffer_names}
+        self.downstream: Dict[str, List[str]] = {name: [] for name in self.buffer_names}
+        for edge in graph_data["edges"]:
+            if edge["to"] in self.upstream and edge["from"] in stations:
+                self.upstream[edge["to"]].append(edge["from"])
+            if edge["from"] in self.downstream and edge["to"] in stations:
+                self.downstream[edge["from"]].append(edge["to"])
+        self.guided_proposals = 0
+        self.bottleneck_counts: Dict[str, int] = {}
+
+    @staticmethod
+    def bottleneck(stations: Dict[str, Dict[str, float]]) -> Optional[str]:
+        """活动时间占比（加工 + 故障）最大的工位"""
+        if not stations:
+            return None
+        return max(
+            stations, key=lambda name: stations[name]["working"] + stations[name]["failed"]
+        )
+
+    def directions(self, solution: Dict[str, int]) -> Dict[str, int]:
+        """方案各缓冲区的建议调整方向；没有状态统计时返回空字典"""
+        averaged = self.statistics.get(solution)
+        if averaged is None:
+            return {}
+        stations, buffers = averaged["stations"], averaged["buffers"]
+        bottleneck = self.bottleneck(stations)
+        directions: Dict[str, int] = {}
+        if bottleneck is not None:
+            state = stations[bottleneck]
+            for name in self.buffer_names:
+                feeds = bottleneck in self.downstream[name]
+                drains = bottleneck in self.upstream[name]
+                if (feeds and state["starved"] > self.state_threshold) or (
+                    drains and state["blocked"] > self.state_threshold
+                ):
+                    directions[name] = 1
+        for name in self.buffer_names:
+            stats = buffers.get(name)
+            if name in directions or stats is None or stats["capacity"] <= 0:
+                continue
+            if (
+                stats["max_occupancy"] < stats["capacity"]
+                or stats["full"] < self.full_threshold
+            ):
+                directions[name] = -1
+        if directions and bottleneck is not None:
+            self.guided_proposals += 1
+            self.bottleneck_counts[bottleneck] = self.bottleneck_counts.get(bottleneck, 0) + 1
+        return directions
+
+    def weights(self, directions: Dict[str, int]) -> List[float]:
+        """缓冲区被选中的相对权重（与 buffer_names 顺序一致）"""
+        return [self.weight if name in directions else 1.0 for name in self.buffer_names]
+
+    def summary(self) -> str:
+        if not self.guided_proposals:
+            return "瓶颈引导：仿真后端未提供状态统计，候选解按随机调整生成"
+        ranked = sorted(self.bottleneck_counts.items(), key=lambda item: -item[1])
+        bottlenecks = "，".join(f"{name}: {count}次" for name, count in ranked)
+        return (
+            f"瓶颈引导：{self.guided_proposals}次候选解生成使用了状态统计；"
+            f"识别的瓶颈工位 {bottlenecks}"
+        )
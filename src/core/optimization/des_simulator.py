@@ -0,0 +1,795 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地离散事件仿真引擎（基于事件堆）
+
+直接运行 json_to_simtalk 所使用的同一份有向图JSON（nodes/edges），
+在不依赖Plant Simulation与COM的情况下估计生产线吞吐量，
+可作为 create_plant_simulation_model 的替代评估器使用。
+
+建模约定（尽量贴近Plant Simulation默认行为）：
+- 源：按 interval_time 生成零件，start_time/stop_time 控制生成区间，出口阻塞时等待
+- 工位：单件加工，ProcTime 支持分布；故障按仿真时间计，故障期间暂停加工、不收不发
+- 缓冲区：FIFO，容量满时阻塞上游，加工时间为0
+- 传送器：FIFO积放式，运行时间 = length / speed，容量满时阻塞上游
+- 出口策略：默认循环（非阻塞），含 production_status 的工位按百分比（阻塞）分配
+- 物料终结：可带加工时间，统计 statdeleted / statavglifespan / statthroughputperday
+- 状态统计：工位与物料终结按 加工/阻塞/等待/故障 累计时间占比，
+  缓冲区统计最大与时间平均占用量、满容量时间占比（用于瓶颈分析）
+- 随机数：每个对象独立随机数流；负的 seed 表示与 |seed| 对偶（antithetic）的随机数流
+
+性能：默认生产线一次30天仿真约42万个事件，单核耗时约2.1秒（约20万事件/秒），
+即每核每分钟约28次；节点使用 __slots__，工位接收/结束/离开与单后继出口走内联快路径。
+需要更高吞吐时由 ReplicationExecutor 按CPU核数并行运行多个仿真
+"""
+import copy
+import heapq
+import itertools
+import json
+import math
+import random
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config.path_config import DEFAULT_PRODUCTION_LINE_FILE
+from src.utils.graph_preprocessor import convert_zero_capacity_conveyors_to_edges
+
+SECONDS_PER_DAY = 86400
+DEFAULT_END_TIME = "2592000"  # 30天的秒数
+# Plant Simulation 传送器默认长度(m)与速度(m/s)
+DEFAULT_CONVEYOR_LENGTH = 5.0
+DEFAULT_CONVEYOR_SPEED = 1.0
+NV_MAGICCONST = 4 * math.exp(-0.5) / math.sqrt(2.0)  # 同 random.NV_MAGICCONST
+
+
+def parse_time_seconds(value: Any) -> float:
+    """将时间值转换为秒（支持数字、秒数字符串和"天:小时:分钟:秒"格式）"""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if not text:
+        return 0.0
+    if ":" in text:
+        # 从右向左依次为 秒、分钟、小时、天
+        seconds = 0.0
+        for unit, part in zip((1, 60, 3600, SECONDS_PER_DAY), reversed(text.split(":"))):
+            seconds += unit * float(part)
+        return seconds
+    return float(text)
+
+
+class _AntitheticRandom(random.Random):
+    """对偶随机数流：均匀数取 1-U，正态数关于均值镜像，与同种子的普通流负相关
+
+    gauss / normalvariate（lognormvariate 经由后者）精确镜像；
+    gammavariate、binomialvariate 是拒绝采样，只把其中的均匀数换成 1-U，
+    与普通流的样本并非一一对应，负相关较弱
+    """
+
+    def random(self) -> float:
+        return 1.0 - super().random()
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        # 用原始均匀数复现 Box-Muller 后镜像（Box-Muller 对 1-U 不对称）
+        z = self.gauss_next
+        self.gauss_next = None
+        if z is None:
+            uniform = super().random
+            angle = uniform() * 2.0 * math.pi
+            radius = math.sqrt(-2.0 * math.log(1.0 - uniform()))
+            z = math.cos(angle) * radius
+            self.gauss_next = math.sin(angle) * radius
+        return mu - z * sigma
+
+    def normalvariate(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        # 用原始均匀数复现 Kinderman-Monahan 比值法后镜像（同 random.Random.normalvariate）
+        uniform = super().random
+        while True:
+            u1 = uniform()
+            u2 = 1.0 - uniform()
+            z = NV_MAGICCONST * (u1 - 0.5) / u2
+            if z * z / 4.0 <= -math.log(u2):
+                break
+        return mu - z * sigma
+
+
+def make_sampler(time_value: Any, rng: random.Random) -> Callable[[], float]:
+    """根据时间配置生成采样函数（常量或分布对象）"""
+    if not (isinstance(time_value, dict) and "distribution_pattern" in time_value):
+        constant = parse_time_seconds(time_value)
+        return lambda: constant
+
+    pattern = time_value["distribution_pattern"]
+    params = {k: float(v) for k, v in time_value.get("parameters", {}).items()}
+
+    if pattern == "negexp":
+        rate = 1.0 / params["mean"]
+        return lambda: rng.expovariate(rate)
+    if pattern == "normal":
+        mean, sigma = params["mean"], params["sigma"]
+        # 时间不能为负，截断到0
+        return lambda: max(0.0, rng.gauss(mean, sigma))
+    if pattern == "uniform":
+        lower, upper = params["lower_bound"], params["upper_bound"]
+        return lambda: rng.uniform(lower, upper)
+    if pattern == "lognorm":
+        # 参数为对数正态分布本身的均值与标准差，换算为底层正态分布参数
+        mean, sigma = params["mean"], params["sigma"]
+        s2 = math.log(1.0 + (sigma / mean) ** 2)
+        mu, s = math.log(mean) - s2 / 2, math.sqrt(s2)
+        return lambda: rng.lognormvariate(mu, s)
+    if pattern == "erlang":
+        order = int(params["order"])
+        scale = params["mean"] / order
+        return lambda: rng.gammavariate(order, scale)
+    if pattern == "gamma":
+        # format_time_value 按位置透传参数，Plant Simulation中第二个参数为尺度β，保持一致
+        shape, scale = params["shape"], params["rate"]
+        return lambda: rng.gammavariate(shape, scale)
+    if pattern == "geom":
+        log_q = math.log(1.0 - params["success_probability"])
+        return lambda: float(int(math.log(1.0 - rng.random()) / log_q) + 1)
+    if pattern == "binomial":
+        trials, p = int(params["trials"]), params["success_probability"]
+        return lambda: float(rng.binomialvariate(trials, p))
+    if pattern == "poisson":
+        mean = params["mean"]
+        return lambda: float(_poisson(rng, mean))
+    raise ValueError(f"不支持的分布类型: {pattern}")
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """泊松分布采样（均值较大时使用正态近似）"""
+    if mean > 30:
+        return max(0, int(round(rng.gauss(mean, math.sqrt(mean)))))
+    limit, k, p = math.exp(-mean), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+class _Node:
+    """仿真节点基类：实现出口策略与阻塞/唤醒机制"""
+
+    # 节点属性在事件循环中被高频访问，使用 __slots__ 加快属性存取
+    __slots__ = (
+        "sim",
+        "name",
+        "successors",
+        "blocked_predecessors",
+        "out_part",
+        "failed",
+        "exit_weights",
+        "exit_rng",
+        "_cyclic_index",
+        "_pending_target",
+        "_direct_target",
+    )
+
+    def __init__(self, sim: "DiscreteEventSimulator", name: str):
+        self.sim = sim
+        self.name = name
+        self.successors: List["_Node"] = []
+        self.blocked_predecessors: deque = deque()  # 等待向本节点交付零件的上游
+        self.out_part: Optional[float] = None  # 待离开的零件（值为零件创建时间）
+        self.failed = False
+        # 出口策略：None为循环（非阻塞），否则为百分比权重（阻塞）
+        self.exit_weights: Optional[List[float]] = None
+        self.exit_rng: Optional[random.Random] = None
+        self._cyclic_index = 0
+        self._pending_target: Optional["_Node"] = None
+        # 唯一后继且为循环策略时的直连目标（建模完成后设置），出口时免去策略分派
+        self._direct_target: Optional["_Node"] = None
+
+    def can_accept(self) -> bool:
+        return False
+
+    def receive(self, part: float) -> None:
+        raise NotImplementedError
+
+    def _detach(self) -> None:
+        """零件离开前更新内部状态（在下游接收前调用）"""
+
+    def _after_exit(self) -> None:
+        """零件离开后的处理（唤醒上游、处理下一个零件）"""
+
+    def _select_target(self) -> Optional["_Node"]:
+        successors = self.successors
+        if self.exit_weights is not None:
+            # 百分比策略（阻塞）：零件一旦分配去向就等待该后继
+            if self._pending_target is None:
+                self._pending_target = self.exit_rng.choices(
+                    successors, weights=self.exit_weights
+                )[0]
+            target = self._pending_target
+            if target.can_accept():
+                self._pending_target = None
+                return target
+            if self not in target.blocked_predecessors:
+                target.blocked_predecessors.append(self)
+            return None
+
+        # 循环策略（非阻塞）：从上次使用的下一个后继开始依次尝试
+        count = len(successors)
+        start = self._cyclic_index
+        for offset in range(count):
+            index = (start + offset) % count
+            target = successors[index]
+            if target.can_accept():
+                self._cyclic_index = (index + 1) % count
+                return target
+        for target in successors:
+            if self not in target.blocked_predecessors:
+                target.blocked_predecessors.append(self)
+        return None
+
+    def _try_exit(self) -> None:
+        part = self.out_part
+        if part is None or self.failed:
+            return
+        target = self._direct_target
+        if target is not None:
+            if not target.can_accept():
+                if self not in target.blocked_predecessors:
+                    target.blocked_predecessors.append(self)
+                return
+        elif not self.successors:
+            return
+        else:
+            target = self._select_target()
+            if target is None:
+                return
+        self.out_part = None
+        self._detach()
+        target.receive(part)
+        self._after_exit()
+
+    def _notify_predecessors(self) -> None:
+        blocked = self.blocked_predecessors
+        while blocked and self.can_accept():
+            blocked.popleft()._try_exit()
+
+
+class _Source(_Node):
+    __slots__ = ("interval", "stop", "created")
+
+    def __init__(self, sim, name, interval, start, stop):
+        super().__init__(sim, name)
+        self.interval = interval
+        self.stop = stop
+        self.created = 0
+        if start <= stop:
+            sim.schedule(start, self._on_create)
+
+    def _on_create(self, _=None) -> None:
+        self.created += 1
+        self.out_part = self.sim.now
+        self._try_exit()
+
+    def _after_exit(self) -> None:
+        # 阻塞式生成：零件离开后才开始计算下一个生成间隔
+        next_time = self.sim.now + self.interval()
+        if next_time <= self.stop:
+            self.sim.schedule(next_time, self._on_create)
+
+
+# 工位状态统计的状态名（与 Plant Simulation 的 Working/Blocked/Waiting/Failed 对应）
+STATION_STATES = ("working", "blocked", "starved", "failed")
+
+
+class _Station(_Node):
+    """单件加工工位（物料终结也复用此逻辑）"""
+
+    __slots__ = (
+        "proc_time",
+        "part",
+        "processing",
+        "end_time",
+        "remaining",
+        "_token",
+        "state_time",
+        "_since",
+        "failure_interval",
+        "failure_duration",
+        "failure_stop",
+    )
+
+    def __init__(self, sim, name, proc_time):
+        super().__init__(sim, name)
+        self.proc_time = proc_time
+        self.part: Optional[float] = None
+        self.processing = False
+        self.end_time = 0.0
+        self.remaining = 0.0
+        self._token = 0
+        # 各状态累计时间：状态由标志位推导，标志位改变前结算上一段时间
+        self.state_time = dict.fromkeys(STATION_STATES, 0.0)
+        self._since = 0.0
+
+    def _account(self) -> None:
+        now = self.sim.now
+        if self.failed:
+            state = "failed"
+        elif self.processing:
+            state = "working"
+        elif self.part is not None:
+            state = "blocked"  # 加工完成但无法交付下游
+        else:
+            state = "starved"
+        self.state_time[state] += now - self._since
+        self._since = now
+
+    def can_accept(self) -> bool:
+        return self.part is None and not self.failed
+
+    def receive(self, part: float) -> None:
+        # 热路径：只有空闲（等待）时才能接收，直接结算等待时间并排程加工结束
+        sim = self.sim
+        now = sim.now
+        self.state_time["starved"] += now - self._since
+        self._since = now
+        self.part = part
+        self.processing = True
+        token = self._token = self._token + 1
+        end_time = self.end_time = now + self.proc_time()
+        heapq.heappush(sim._heap, (end_time, sim._sequence(), self._on_end, token))
+
+    def _schedule_end(self, duration: float) -> None:
+        self._token += 1
+        self.end_time = self.sim.now + duration
+        self.sim.schedule(self.end_time, self._on_end, self._token)
+
+    def _on_end(self, token: int) -> None:
+        if token != self._token:
+            return  # 已被故障中断的过期事件
+        # 有效的结束事件必然处于加工状态（故障会作废令牌）
+        now = self.sim.now
+        self.state_time["working"] += now - self._since
+        self._since = now
+        self.processing = False
+        self.out_part = self.part
+        self._try_exit()
+
+    def _detach(self) -> None:
+        # 只在加工完成、未故障时离开，此前处于阻塞状态
+        now = self.sim.now
+        self.state_time["blocked"] += now - self._since
+        self._since = now
+        self.part = None
+
+    def _after_exit(self) -> None:
+        if self.blocked_predecessors:
+            self._notify_predecessors()
+
+    def state_statistics(self, elapsed: float) -> Dict[str, float]:
+        """各状态时间占比（加工/阻塞/等待/故障）"""
+        self._account()
+        return {
+            state: (duration / elapsed if elapsed > 0 else 0.0)
+            for state, duration in self.state_time.items()
+        }
+
+    def add_failure(self, interval, duration, start, stop) -> None:
+        self.failure_interval = interval
+        self.failure_duration = duration
+        self.failure_stop = stop
+        first = start + interval()
+        if first <= stop:
+            self.sim.schedule(first, self._on_failure)
+
+    def _on_failure(self, _=None) -> None:
+        self._account()
+        self.failed = True
+        if self.processing:
+            self.remaining = self.end_time - self.sim.now
+            self._token += 1  # 作废已排程的加工结束事件
+        self.sim.schedule(self.sim.now + self.failure_duration(), self._on_repair)
+
+    def _on_repair(self, _=None) -> None:
+        self._account()
+        self.failed = False
+        now = self.sim.now
+        next_failure = now + self.failure_interval()
+        if next_failure <= self.failure_stop:
+            self.sim.schedule(next_failure, self._on_failure)
+        if self.processing:
+            self._schedule_end(self.remaining)
+        elif self.out_part is not None:
+            self._try_exit()
+        else:
+            self._notify_predecessors()
+
+
+class _Drain(_Station):
+    """物料终结：加工完成后删除零件并统计"""
+
+    __slots__ = ("deleted", "lifespan_sum", "first_exit", "last_exit")
+
+    def __init__(self, sim, name, proc_time):
+        super().__init__(sim, name, proc_time)
+        self.deleted = 0
+        self.lifespan_sum = 0.0
+        self.first_exit: Optional[float] = None
+        self.last_exit: Optional[float] = None
+
+    def _on_end(self, token: int) -> None:
+        if token != self._token:
+            return
+        now = self.sim.now
+        self.state_time["working"] += now - self._since
+        self._since = now
+        self.processing = False
+        self.deleted += 1
+        self.lifespan_sum += now - self.part
+        if self.first_exit is None:
+            self.first_exit = now
+        self.last_exit = now
+        self.part = None
+        if self.blocked_predecessors:
+            self._notify_predecessors()
+
+    def _on_repair(self, _=None) -> None:
+        self._account()
+        self.failed = False
+        next_failure = self.sim.now + self.failure_interval()
+        if next_failure <= self.failure_stop:
+            self.sim.schedule(next_failure, self._on_failure)
+        if self.processing:
+            self._schedule_end(self.remaining)
+        else:
+            self._notify_predecessors()
+
+    def statistics(self, elapsed: float) -> Dict[str, float]:
+        deleted = self.deleted
+        avg_exit_interval = (
+            (self.last_exit - self.first_exit) / (deleted - 1) if deleted > 1 else 0.0
+        )
+        return {
+            "statdeleted": deleted,
+            "statavglifespan": self.lifespan_sum / deleted if deleted else 0.0,
+            "statavgexitinterval": avg_exit_interval,
+            "statthroughputperday": (
+                deleted / (elapsed / SECONDS_PER_DAY) if elapsed > 0 else 0.0
+            ),
+        }
+
+
+class _Buffer(_Node):
+    __slots__ = (
+        "capacity",
+        "queue",
+        "occupancy_area",
+        "full_time",
+        "max_occupancy",
+        "_since",
+    )
+
+    def __init__(self, sim, name, capacity):
+        super().__init__(sim, name)
+        self.capacity = capacity
+        self.queue: deque = deque()
+        # 占用量统计：时间积分、满容量时间与最大占用量
+        self.occupancy_area = 0.0
+        self.full_time = 0.0
+        self.max_occupancy = 0
+        self._since = 0.0
+
+    def _account(self) -> None:
+        now = self.sim.now
+        count = len(self.queue)
+        self.occupancy_area += count * (now - self._since)
+        if count >= self.capacity:
+            self.full_time += now - self._since
+        self._since = now
+
+    def can_accept(self) -> bool:
+        return len(self.queue) < self.capacity
+
+    def receive(self, part: float) -> None:
+        self._account()
+        self.queue.append(part)
+        if len(self.queue) > self.max_occupancy:
+            self.max_occupancy = len(self.queue)
+        if self.out_part is None:
+            self.out_part = self.queue[0]
+            self._try_exit()
+
+    def _detach(self) -> None:
+        self._account()
+        self.queue.popleft()
+
+    def statistics(self, elapsed: float) -> Dict[str, float]:
+        """容量、最大占用量、时间平均占用量与满容量时间占比"""
+        self._account()
+        return {
+            "capacity": self.capacity,
+            "max_occupancy": self.max_occupancy,
+            "mean_occupancy": self.occupancy_area / elapsed if elapsed > 0 else 0.0,
+            "full": self.full_time / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def _after_exit(self) -> None:
+        if self.out_part is None and self.queue:
+            self.out_part = self.queue[0]
+        if self.blocked_predecessors:
+            self._notify_predecessors()
+        self._try_exit()
+
+
+class _Conveyor(_Node):
+    """积放式传送器：零件按进入顺序在 length/speed 后到达出口"""
+
+    __slots__ = ("capacity", "travel_time", "queue", "_head_pending")
+
+    def __init__(self, sim, name, capacity, travel_time):
+        super().__init__(sim, name)
+        self.capacity = capacity
+        self.travel_time = travel_time
+        self.queue: deque = deque()  # (到达出口时间, 零件)
+        self._head_pending = False
+
+    def can_accept(self) -> bool:
+        return len(self.queue) < self.capacity
+
+    def receive(self, part: float) -> None:
+        self.queue.append((self.sim.now + self.travel_time, part))
+        self._advance_head()
+
+    def _advance_head(self) -> None:
+        if self.out_part is not None or self._head_pending or not self.queue:
+            return
+        ready_time, part = self.queue[0]
+        if ready_time <= self.sim.now:
+            self.out_part = part
+            self._try_exit()
+        else:
+            self._head_pending = True
+            self.sim.schedule(ready_time, self._on_head_arrival)
+
+    def _on_head_arrival(self, _=None) -> None:
+        self._head_pending = False
+        self._advance_head()
+
+    def _detach(self) -> None:
+        self.queue.popleft()
+
+    def _after_exit(self) -> None:
+        if self.blocked_predecessors:
+            self._notify_predecessors()
+        self._advance_head()
+
+
+class DiscreteEventSimulator:
+    """基于事件堆的生产线离散事件仿真器（单次运行）"""
+
+    def __init__(self, graph_data: dict, seed: int = 1):
+        self.now = 0.0
+        self._heap: List[Tuple[float, int, Callable, Any]] = []
+        self._sequence = itertools.count().__next__
+        self.nodes: Dict[str, _Node] = {}
+        self.drains: List[_Drain] = []
+        self._build(graph_data, seed)
+
+    def schedule(self, time: float, handler: Callable, arg: Any = None) -> None:
+        heapq.heappush(self._heap, (time, self._sequence(), handler, arg))
+
+    def _build(self, graph_data: dict, seed: int) -> None:
+        nodes = graph_data.get("nodes", [])
+        edges = graph_data.get("edges", [])
+
+        # 故障默认起止时间取源节点的start/stop（与json_to_simtalk保持一致）
+        source_start, source_stop = 0.0, math.inf
+        for node in nodes:
+            if node["type"] == "源":
+                time_data = node.get("data", {}).get("time", {})
+                source_start = parse_time_seconds(time_data.get("start_time", 0))
+                source_stop = parse_time_seconds(time_data.get("stop_time", 0)) or math.inf
+                break
+
+        rng_class = _AntitheticRandom if seed < 0 else random.Random
+
+        def stream(*parts: str) -> random.Random:
+            # 每个对象独立随机数流，便于不同方案间保持随机数同步
+            return rng_class("/".join((str(abs(seed)),) + parts))
+
+        for node in nodes:
+            name, node_type = node["name"], node["type"]
+            data = node.get("data", {})
+            time_data = data.get("time", {})
+            if node_type == "源":
+                stop = parse_time_seconds(time_data.get("stop_time", 0)) or math.inf
+                sim_node = _Source(
+                    self,
+                    name,
+                    make_sampler(time_data.get("interval_time", 0), stream(name)),
+                    parse_time_seconds(time_data.get("start_time", 0)),
+                    stop,
+                )
+            elif node_type in ("工位", "物料终结"):
+                proc_time = make_sampler(time_data.get("processing_time", 0), stream(name))
+                node_class = _Drain if node_type == "物料终结" else _Station
+                sim_node = node_class(self, name, proc_time)
+                failure = data.get("failure")
+                if failure:
+                    failure_rng = stream(name, "failure")
+                    sim_node.add_failure(
+                        make_sampler(failure.get("interval_time"), failure_rng),
+                        make_sampler(failure.get("duration_time", 0), failure_rng),
+                        parse_time_seconds(failure.get("start_time", source_start)),
+                        parse_time_seconds(failure.get("stop_time", source_stop))
+                        or math.inf,
+                    )
+                if node_type == "物料终结":
+                    self.drains.append(sim_node)
+            elif node_type == "缓冲区":
+                sim_node = _Buffer(self, name, int(data.get("capacity", 1)))
+            elif node_type == "传送器":
+                capacity = int(data.get("capacity", -1))
+                length = float(data.get("length", DEFAULT_CONVEYOR_LENGTH))
+                speed = float(data.get("speed", DEFAULT_CONVEYOR_SPEED))
+                sim_node = _Conveyor(
+                    self,
+                    name,
+                    capacity if capacity > 0 else math.inf,
+                    length / speed if speed > 0 else 0.0,
+                )
+            else:
+                raise ValueError(f"不支持的节点类型: {node_type}（{name}）")
+            self.nodes[name] = sim_node
+
+        for edge in edges:
+            self.nodes[edge["from"]].successors.append(self.nodes[edge["to"]])
+
+        # 百分比出口策略（合格/不合格分流）
+        for node in nodes:
+            status = node.get("data", {}).get("production_status")
+            if not status or node["type"] != "工位":
+                continue
+            sim_node = self.nodes[node["name"]]
+            destination = node["data"].get("production_destination")
+            if destination:
+                sim_node.successors = [
+                    self.nodes[destination["qualified"]],
+                    self.nodes[destination["unqualified"]],
+                ]
+            weights = [float(status["qualified"]), float(status["unqualified"])]
+            sim_node.exit_weights = weights[: len(sim_node.successors)]
+            sim_node.exit_rng = stream(node["name"], "exit")
+
+        for sim_node in self.nodes.values():
+            if len(sim_node.successors) == 1 and sim_node.exit_weights is None:
+                sim_node._direct_target = sim_node.successors[0]
+
+    def run(self, end_time: float) -> None:
+        """推进仿真直到 end_time"""
+        heap = self._heap
+        pop = heapq.heappop
+        while heap and heap[0][0] <= end_time:
+            time, _, handler, arg = pop(heap)
+            self.now = time
+            handler(arg)
+        self.now = end_time
+
+    def results(self) -> Dict[str, Any]:
+        """汇总物料终结统计（吞吐量取首个物料终结，与数据表读取顺序一致）
+
+        stations / buffers 为各工位的状态时间占比与各缓冲区的占用统计
+        """
+        drains = {drain.name: drain.statistics(self.now) for drain in self.drains}
+        throughput = self.drains[0].deleted if self.drains else 0
+        stations, buffers = {}, {}
+        for name, node in self.nodes.items():
+            if isinstance(node, _Station):
+                stations[name] = node.state_statistics(self.now)
+            elif isinstance(node, _Buffer):
+                buffers[name] = node.statistics(self.now)
+        return {
+            "end_time": self.now,
+            "throughput": throughput,
+            "drains": drains,
+            "stations": stations,
+            "buffers": buffers,
+        }
+
+
+def apply_buffer_solution(graph_data: dict, buffer_solution: Dict[str, int]) -> dict:
+    """将缓冲区方案写入有向图副本（不修改原数据）"""
+    graph = copy.deepcopy(graph_data)
+    for node in graph["nodes"]:
+        if node["type"] == "缓冲区" and node["name"] in buffer_solution:
+            node.setdefault("data", {})["capacity"] = buffer_solution[node["name"]]
+    return graph
+
+
+def simulate_production_line(
+    graph_data: dict,
+    buffer_solution: Optional[Dict[str, int]] = None,
+    end_time: str = DEFAULT_END_TIME,
+    seed: int = 1,
+    early_stop: Optional[Any] = None,
+    batch_means: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """对有向图运行一次本地仿真，返回物料终结统计
+
+    提供 early_stop（early_termination.EarlyTermination）时按时间片推进，
+    达标与否确定后提前结束，结果中 truncated 记录截断时刻与所用上界；
+    提供 batch_means（batch_means.BatchMeansEstimator）时逐周期记录产出，
+    结果中 batch_means 记录预热期与批均值估计
+    """
+    graph = apply_buffer_solution(graph_data, buffer_solution or {})
+    graph = convert_zero_capacity_conveyors_to_edges(graph)
+    sim = DiscreteEventSimulator(graph, seed=seed)
+    end_seconds = parse_time_seconds(end_time)
+    if early_stop is None and batch_means is None:
+        sim.run(end_seconds)
+        return sim.results()
+
+    def advance(until: float) -> int:
+        sim.run(until)
+        return sim.drains[0].deleted if sim.drains else 0
+
+    if batch_means is not None:
+        estimate = batch_means.run(advance, end_seconds)
+        return batch_means.apply(sim.results(), estimate)
+    truncated = early_stop.run(advance, end_seconds, buffer_solution or {})
+    return early_stop.apply(sim.results(), truncated)
+
+
+class DESEvaluator:
+    """本地仿真评估器，调用方式与 create_plant_simulation_model 一致"""
+
+    def __init__(
+        self,
+        graph_data: Optional[dict] = None,
+        target_total: int = 29000,
+        base_seed: int = 1,
+        verbose: bool = True,
+    ):
+        if graph_data is None:
+            with open(DEFAULT_PRODUCTION_LINE_FILE, "r", encoding="utf-8") as f:
+                graph_data = json.load(f)
+        self.graph_data = graph_data
+        self.target_total = target_total
+        self.base_seed = base_seed
+        self.verbose = verbose
+        # 未指定变体时每次调用递增随机数变体，对应 IncrementRandomNumbersVariantOnReset
+        self.replication = 0
+        self.last_results: Dict[str, Any] = {}  # 最近一次仿真的完整结果（含状态统计）
+
+    def __call__(
+        self,
+        buffer_solution: Dict[str, int],
+        end_time: str = DEFAULT_END_TIME,
+        variant: Optional[int] = None,
+    ) -> Tuple[bool, int]:
+        """
+        :param variant: 随机数变体（公共随机数；负数为对偶流），为空时自动递增
+        """
+        if variant is None:
+            variant = self.base_seed + self.replication
+            self.replication += 1
+        results = simulate_production_line(
+            self.graph_data, buffer_solution, end_time, variant
+        )
+        results["variant"] = variant
+        self.last_results = results
+        throughput = results["throughput"]
+        is_qualified = throughput >= self.target_total
+        if self.verbose:
+            print(
+                f"📊 本地仿真结果：总吞吐量={throughput}件（目标≥{self.target_total}件），"
+                f"是否达标：{is_qualified}"
+            )
+        return is_qualified, throughput
+
+
+if __name__ == "__main__":
+    import time
+
+    evaluator = DESEvaluator()
+    start = time.perf_counter()
+    evaluator({f"B{i}": 1 for i in range(1, 11)})
+    print(f"⏱️ 单次30天仿真耗时：{time.perf_counter() - start:.2f}秒")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+利用吞吐量单调性的支配剪枝索引
+
+吞吐量随各缓冲区容量（统计意义上）单调不减，因此：
+- 方案 x 不达标 ⇒ 逐分量 ≤ x 的方案也不达标
+- 方案 x 达标 ⇒ 逐分量 ≥ x 的方案也达标
+索引只保存两条"边界"：达标方案中的极小元与不达标方案中的极大元
+（被已有边界点支配的新结果不再保存），两者都按总容量排序：
+逐分量 ≤ x 的点总容量必然不大于 x，查询时先二分确定总容量范围，
+只对该范围内的边界点做逐分量比较。
+
+候选解能由索引判定时直接得到结果，不做仿真；同时被两侧判定（噪声导致的
+矛盾证据）时不判定，照常仿真。判定给出的吞吐量是见证方案的吞吐量，
+对达标方案是下界、对不达标方案是上界。
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from .solution_types import BatchValidator
+
+# 边界点：(总容量, 容量向量, 吞吐量)
+_Entry = Tuple[int, Tuple[int, ...], int]
+
+
+class DominanceIndex:
+    """达标极小元 / 不达标极大元索引，按逐分量支配关系即时判定候选解"""
+
+    def __init__(self, buffer_names: List[str]):
+        self.buffer_names = list(buffer_names)
+        self.qualified: List[_Entry] = []  # 达标方案的极小元，按总容量升序
+        self.failed: List[_Entry] = []  # 不达标方案的极大元，按总容量升序
+        self.queries = 0
+        self.decided_qualified = 0
+        self.decided_failed = 0
+        self.conflicts = 0
+
+    def _vector(self, solution: Dict[str, int]) -> Tuple[int, ...]:
+        return tuple(solution[name] for name in self.buffer_names)
+
+    @staticmethod
+    def _leq(a: Tuple[int, ...], b: Tuple[int, ...]) -> bool:
+        return all(x <= y for x, y in zip(a, b))
+
+    def _witness_below(self, total: int, vector: Tuple[int, ...]) -> Optional[_Entry]:
+        """逐分量 ≤ vector 的达标边界点"""
+        end = bisect_right(self.qualified, (total, (float("inf"),)))
+        for entry in self.qualified[:end]:
+            if self._leq(entry[1], vector):
+                return entry
+        return None
+
+    def _witness_above(self, total: int, vector: Tuple[int, ...]) -> Optional[_Entry]:
+        """逐分量 ≥ vector 的不达标边界点"""
+        start = bisect_left(self.failed, (total,))
+        for entry in self.failed[start:]:
+            if self._leq(vector, entry[1]):
+                return entry
+        return None
+
+    def add(self, solution: Dict[str, int], qualified: bool, throughput: int) -> None:
+        """记录一次仿真评估结果，维护两条边界"""
+        vector = self._vector(solution)
+        total = sum(vector)
+        if qualified:
+            if self._witness_below(total, vector) is not None:
+                return  # 已被更小的达标方案覆盖
+            # 删除逐分量 ≥ 新点的旧极小元（总容量不小于新点）
+            start = bisect_left(self.qualified, (total,))
+            self.qualified[start:] = [
+                entry for entry in self.qualified[start:] if not self._leq(vector, entry[1])
+            ]
+            insort(self.qualified, (total, vector, throughput))
+        else:
+            if self._witness_above(total, vector) is not None:
+                return
+            end = bisect_right(self.failed, (total, (float("inf"),)))
+            self.failed[:end] = [
+                entry for entry in self.failed[:end] if not self._leq(entry[1], vector)
+            ]
+            insort(self.failed, (total, vector, throughput))
+
+    def classify(self, solution: Dict[str, int]) -> Optional[Tuple[bool, int]]:
+        """
+        用索引判定候选解
+        :return: (是否达标, 见证方案的吞吐量)；无法判定或证据矛盾时返回 None
+        """
+        self.queries += 1
+        vector = self._vector(solution)
+        total = sum(vector)
+        below = self._witness_below(total, vector)
+        above = self._witness_above(total, vector)
+        if below is not None and above is not None:
+            self.conflicts += 1
+            return None
+        if below is not None:
+            self.decided_qualified += 1
+            print(f"🔎 支配索引：逐分量不小于已达标方案{below[1]}，判定达标，不做仿真")
+            return True, below[2]
+        if above is not None:
+            self.decided_failed += 1
+            print(f"🔎 支配索引：逐分量不大于不达标方案{above[1]}，判定不达标，不做仿真")
+            return False, above[2]
+        return None
+
+    def wrap(self, validate: BatchValidator) -> BatchValidator:
+        """包装批量评估函数：能由索引判定的方案不仿真，其余仿真后写入索引"""
+
+        def validate_with_index(solutions: List[Dict[str, int]]) -> List[Tuple[bool, int]]:
+            results: List[Optional[Tuple[bool, int]]] = [
+                self.classify(solution) for solution in solutions
+            ]
+            pending = [i for i, result in enumerate(results) if result is None]
+            if pending:
+                simulated = validate([solutions[i] for i in pending])
+                for i, (qualified, throughput) in zip(pending, simulated):
+                    self.add(solutions[i], qualified, throughput)
+                    results[i] = (qualified, throughput)
+            return results
+
+        return validate_with_index
+
+    @property
+    def decided(self) -> int:
+        return self.decided_qualified + self.decided_failed
+
+    def summary(self, replications_per_evaluation: float = 5) -> str:
+        saved = self.decided * replications_per_evaluation
+        return (
+            f"支配索引：查询{self.queries}次，判定达标{self.decided_qualified}个、"
+            f"不达标{self.decided_failed}个（矛盾{self.conflicts}次未判定），"
+            f"约节省{saved:.0f}次仿真；边界点 达标{len(self.qualified)}个/"
+            f"不达标{len(self.failed)}个"
+        )
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结果确定后提前结束仿真
+
+一次30天仿真的达标与否往往在结束前就已确定：
+- 累计产出（首个物料终结的 statdeleted）已达到目标 → 必然达标
+- 累计产出 + 剩余时间内可能的最大产出仍达不到目标 → 必然不达标
+  最大产出取 瓶颈最大速率 ×（1+rate_margin）× 剩余时间 + 在制品上限：
+  瓶颈为主路径上不计故障时产能最低的机器（throughput_estimator.bottleneck_rate），
+  在制品上限为各缓冲区与传送器容量之和加机器数（线上的零件都可能在剩余时间内流出）
+
+EarlyTermination 按时间片（默认1天）推进仿真，每片结束后检查上述两个条件，
+任一成立即停止。后端只需提供"推进到时刻t并返回累计产出"的函数：
+DES 后端直接继续事件循环，Plant Simulation 后端逐片设置事件控制器的结束时间后继续运行。
+
+截断的仿真在结果字典中记录 truncated（截断时刻、累计产出、所用上界与瓶颈），
+throughput 改为按截断前的平均产出速率线性外推到结束时间的估计值
+（外推值与判定同侧：达标时不低于目标，不达标时不高于上界），
+使多次重复仿真取平均与公共随机数比较仍可使用。
+"""
+import math
+from typing import Any, Callable, Dict, Optional
+
+from .des_simulator import DEFAULT_END_TIME, SECONDS_PER_DAY, parse_time_seconds
+from .throughput_estimator import bottleneck_rate
+
+STATION_TYPES = ("工位", "物料终结")
+
+
+class EarlyTermination:
+    """按时间片检查累计产出，达标与否确定时提前结束仿真"""
+
+    def __init__(
+        self,
+        graph_data: dict,
+        target_total: int = 29000,
+        slice_seconds: float = SECONDS_PER_DAY,
+        rate_margin: float = 0.02,
+        reference_end_time: str = DEFAULT_END_TIME,
+    ):
+        """
+        :param graph_data: 生产线有向图，用于确定瓶颈速率与在制品上限
+        :param target_total: reference_end_time 时长内的产量目标（其他时长按比例折算）
+        :param slice_seconds: 检查间隔（仿真秒）
+        :param rate_margin: 瓶颈速率的安全裕度（加工时间随机，短时间内可能略快于均值）
+        """
+        self.target_total = target_total
+        self.slice_seconds = slice_seconds
+        self.rate_margin = rate_margin
+        self.reference_seconds = parse_time_seconds(reference_end_time)
+        self.bottleneck, self.rate = bottleneck_rate(graph_data)
+        # 在制品上限中与缓冲区方案无关的部分：传送器容量与机器数
+        self.buffer_names = []
+        self.fixed_wip = 0.0
+        for node in graph_data["nodes"]:
+            if node["type"] == "缓冲区":
+                self.buffer_names.append(node["name"])
+            elif node["type"] == "传送器":
+                capacity = int(node.get("data", {}).get("capacity", -1))
+                self.fixed_wip += capacity if capacity >= 0 else math.inf
+            elif node["type"] in STATION_TYPES:
+                self.fixed_wip += 1
+
+    def wip_bound(self, buffer_solution: Dict[str, int]) -> float:
+        """线上可同时存在的零件数上限"""
+        return self.fixed_wip + sum(buffer_solution.get(name, 1) for name in self.buffer_names)
+
+    def run(
+        self,
+        advance: Callable[[float], int],
+        end_seconds: float,
+        buffer_solution: Dict[str, int],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        分片推进一次仿真
+        :param advance: 推进仿真到给定时刻（秒）并返回累计产出
+        :return: 提前结束时的截断记录，运行到结束时间时返回 None
+        """
+        target = self.target_total * end_seconds / self.reference_seconds
+        wip = self.wip_bound(buffer_solution)
+        rate = self.rate * (1 + self.rate_margin)
+        now = 0.0
+        while now < end_seconds:
+            now = min(now + self.slice_seconds, end_seconds)
+            deleted = advance(now)
+            if now >= end_seconds:
+                return None
+            upper_bound = deleted + wip + rate * (end_seconds - now)
+            if deleted < target <= upper_bound:
+                continue
+            qualified = deleted >= target
+            projected = int(round(deleted * end_seconds / now))
+            return {
+                "time": now,
+                "end_time": end_seconds,
+                "deleted": deleted,
+                "qualified": qualified,
+                "target": target,
+                "upper_bound": upper_bound,
+                "bottleneck": self.bottleneck,
+                "bottleneck_rate_per_day": self.rate * SECONDS_PER_DAY,
+                "throughput": max(projected, math.ceil(target))
+                if qualified
+                else min(projected, int(upper_bound)),
+            }
+        return None
+
+    @staticmethod
+    def apply(results: Dict[str, Any], truncated: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """把截断记录写入结果字典（吞吐量改为外推估计）"""
+        if truncated is not None:
+            results["truncated"] = truncated
+            results["throughput"] = truncated["throughput"]
+        return results
+
+
+class TruncationLog:
+    """汇总各次仿真的截断记录（仿真可能在子进程中执行，按结果字典统计）"""
+
+    def __init__(self):
+        self.runs = 0
+        self.truncated_qualified = 0
+        self.truncated_failed = 0
+        self.simulated_seconds = 0.0
+        self.full_seconds = 0.0
+
+    def record(self, solution: Dict[str, int], results: Optional[Dict[str, Any]]) -> None:
+        if not results:
+            return
+        self.runs += 1
+        end_seconds = results.get("end_time", 0.0)
+        truncated = results.get("truncated")
+        if truncated is not None:
+            end_seconds = truncated["end_time"]
+            self.simulated_seconds += truncated["time"]
+            if truncated["qualified"]:
+                self.truncated_qualified += 1
+                reason = "已达到目标"
+            else:
+                self.truncated_failed += 1
+                reason = f"上界{truncated['upper_bound']:.0f}件达不到目标"
+            print(
+                f"⏹️ 第{truncated['time'] / SECONDS_PER_DAY:g}天累计产出{truncated['deleted']}件，"
+                f"{reason}，提前结束（外推吞吐量{truncated['throughput']}件）"
+            )
+        else:
+            self.simulated_seconds += end_seconds
+        self.full_seconds += end_seconds
+
+    def summary(self) -> str:
+        truncated = self.truncated_qualified + self.truncated_failed
+        saved = 1 - self.simulated_seconds / self.full_seconds if self.full_seconds else 0.0
+        return (
+            f"提前结束：{self.runs}次仿真中{truncated}次截断"
+            f"（判定达标{self.truncated_qualified}次、不达标{self.truncated_failed}次），"
+            f"节省仿真时长{saved:.1%}"
+        )
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+持久化的仿真评估缓存（SQLite）
+
+模拟退火经常重复访问同一方案，而 validate_solution 每次都从头仿真，
+进程退出后结果也全部丢失。评估缓存以"生产线指纹 + 方案键 + 仿真时长"
+为键，保存每次重复仿真的吞吐量、随机数变体与耗时：
+- 再次评估同一方案时直接复用已有的重复仿真，只补齐缺少的次数
+- 重启后的优化运行不必为已经做过的仿真再付一次代价
+
+独立抽样时记录后端实际使用的变体（base_seed + 递增计数）；重启后后端计数
+从 max_variant 之后开始，补齐的仿真不会重复使用已缓存的随机数种子
+（Plant Simulation 未指定变体时由模型内部递增，变体记为空）。
+
+生产线指纹由有向图（不含缓冲区容量，容量属于方案本身）、仿真后端与
+随机数使用方式共同决定，任何一项变化都会使用新的缓存空间。
+"""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.config.path_config import RESULT_DIR
+
+DEFAULT_CACHE_FILE = os.path.join(RESULT_DIR, "evaluation_cache.sqlite")
+
+
+def production_line_fingerprint(graph_data: dict, *context: str) -> str:
+    """生产线指纹：有向图去掉缓冲区容量后的规范化JSON，加上后端等上下文"""
+    nodes = []
+    for node in graph_data.get("nodes", []):
+        node = copy.deepcopy(node)
+        if node.get("type") == "缓冲区":
+            node.get("data", {}).pop("capacity", None)
+        nodes.append(node)
+    canonical = json.dumps(
+        {"nodes": nodes, "edges": graph_data.get("edges", []), "context": context},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def solution_key(solution: Dict[str, int]) -> str:
+    """方案键：按缓冲区名称排序的JSON，与 Algorithm4._get_solution_key 顺序一致"""
+    return json.dumps(sorted(solution.items()))
+
+
+class EvaluationCache:
+    """按重复仿真序号存取方案评估结果"""
+
+    def __init__(self, fingerprint: str, db_file: str = DEFAULT_CACHE_FILE):
+        """
+        :param fingerprint: 生产线指纹（production_line_fingerprint）
+        :param db_file: SQLite 数据库文件
+        """
+        self.fingerprint = fingerprint
+        self.db_file = db_file
+        self.reused = 0  # 复用的重复仿真次数
+        self.stored = 0  # 新写入的重复仿真次数
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_file)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS replications (
+                fingerprint TEXT NOT NULL,
+                solution TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                replication INTEGER NOT NULL,
+                variant INTEGER,
+                throughput INTEGER NOT NULL,
+                elapsed REAL,
+                created REAL,
+                PRIMARY KEY (fingerprint, solution, end_time, replication)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def load(
+        self, solution: Dict[str, int], end_time: str, limit: Optional[int] = None
+    ) -> List[Tuple[Optional[int], int]]:
+        """读取方案已有的重复仿真 [(随机数变体, 吞吐量)]，按重复序号排序"""
+        rows = self._conn.execute(
+            "SELECT variant, throughput FROM replications "
+            "WHERE fingerprint = ? AND solution = ? AND end_time = ? "
+            "ORDER BY replication",
+            (self.fingerprint, solution_key(solution), end_time),
+        ).fetchall()
+        if limit is not None:
+            rows = rows[:limit]
+        self.reused += len(rows)
+        return rows
+
+    def store(
+        self,
+        solution: Dict[str, int],
+        end_time: str,
+        first_replication: int,
+        variants: List[Optional[int]],
+        throughputs: List[int],
+        elapsed: List[float],
+    ) -> None:
+        """写入从 first_replication 开始的一批重复仿真结果"""
+        key = solution_key(solution)
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO replications VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (self.fingerprint, key, end_time, first_replication + i, v, t, e, now)
+                for i, (v, t, e) in enumerate(zip(variants, throughputs, elapsed))
+            ],
+        )
+        self._conn.commit()
+        self.stored += len(throughputs)
+
+    def max_variant(self) -> Optional[int]:
+        """当前指纹下已缓存的最大随机数变体（按绝对值），没有记录变体时返回 None"""
+        row = self._conn.execute(
+            "SELECT MAX(ABS(variant)) FROM replications WHERE fingerprint = ?",
+            (self.fingerprint,),
+        ).fetchone()
+        return row[0]
+
+    def summary(self) -> str:
+        return f"评估缓存：复用{self.reused}次仿真，新增{self.stored}次（{self.db_file}）"
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评估流水线
+
+方案评估涉及的组件（仿真后端与单次评估函数、并行执行器、序贯检验、公共随机数、
+评估缓存、状态统计、提前结束与批均值记录、多保真度预筛、支配索引）由
+EvaluationPipeline.from_options 按运行选项一次性构建并集中持有。
+模拟退火主循环、推测式退火、并行回火、遗传算法、贪心分配与OCBA排序选择
+只接收流水线对象，通过 validate / simulate 等方法评估方案，
+不再把这些组件逐个作为参数层层传递。
+
+validate_solution / validate_batch / simulate_batch 是流水线使用的无状态评估函数，
+也可单独调用（如基准脚本只需评估函数而不需要其他组件）。
+"""
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .batch_means import BatchMeansLog
+from .bottleneck import StateStatistics
+from .dominance_index import DominanceIndex
+from .early_termination import TruncationLog
+from .evaluation_cache import EvaluationCache, production_line_fingerprint
+from .multi_fidelity import MultiFidelityScreen
+from .optimization_options import (
+    DEFAULT_REPLICATIONS,
+    DEFAULT_SIMULATION_END_TIME,
+    OptimizationOptions,
+)
+from .random_streams import CommonRandomNumbers
+from .replication_executor import ReplicationExecutor
+from .sequential_sampling import SequentialQualificationTest
+from .simulation_backend import BackendEvaluator, SimulationBackend, create_backend
+from .simulator_pool import SimulatorPool
+from .solution_types import BatchValidator, solution_key
+
+# 并行重复仿真执行器：多进程执行器或仿真实例池（接口相同）
+Executor = Union[ReplicationExecutor, SimulatorPool]
+# 单次仿真评估函数：(方案, end_time, variant) → (是否达标, 吞吐量)
+Evaluator = Callable[..., Tuple[bool, int]]
+TARGET_TOTAL = 29000  # 30天产量目标
+
+
+def validate_solution(
+    solution: dict,
+    end_time: str,
+    num_simulations: int = 5,
+    evaluator: Optional[Evaluator] = None,
+    executor: Optional[Executor] = None,
+    sequential: Optional[SequentialQualificationTest] = None,
+    streams: Optional[CommonRandomNumbers] = None,
+    cache: Optional[EvaluationCache] = None,
+    statistics: Optional[StateStatistics] = None,
+    truncations: Optional[TruncationLog] = None,
+    estimates: Optional[BatchMeansLog] = None,
+) -> tuple[bool, int]:
+    """验证解决方案的产能是否达标（多次仿真取平均值）
+
+    :param evaluator: 单次仿真评估函数 (方案, end_time, variant) → (是否达标, 吞吐量)，
+        如 BackendEvaluator 或 DESEvaluator（本地仿真）；为空时调用
+        create_plant_simulation_model，该路径无法指定随机数变体，不支持 streams
+    :param executor: 多进程执行器或仿真实例池，提供时各次仿真并行执行、按完成顺序汇总
+    :param sequential: 序贯检验，提供时忽略 num_simulations，判定达到置信度即停止
+    :param streams: 公共随机数管理，提供时第k次仿真在各方案间使用同一随机数变体
+    :param cache: 评估缓存，提供时复用已有的重复仿真，只补齐缺少的次数
+    :param statistics: 状态统计收集器，提供时记录每次仿真的工位与缓冲区状态统计
+    :param truncations: 提前结束记录汇总，提供时统计每次仿真是否被截断
+    :param estimates: 批均值估计汇总，提供时记录每次长时间仿真的预热期与置信区间
+    """
+    return validate_batch(
+        [solution],
+        end_time,
+        num_simulations,
+        evaluator=evaluator,
+        executor=executor,
+        sequential=sequential,
+        streams=streams,
+        cache=cache,
+        statistics=statistics,
+        truncations=truncations,
+        estimates=estimates,
+    )[0]
+
+
+def simulate_batch(
+    solutions: List[dict],
+    end_time: str,
+    first: int,
+    count: int,
+    evaluator: Optional[Evaluator] = None,
+    executor: Optional[Executor] = None,
+    streams: Optional[CommonRandomNumbers] = None,
+    cache: Optional[EvaluationCache] = None,
+    statistics: Optional[StateStatistics] = None,
+    truncations: Optional[TruncationLog] = None,
+    estimates: Optional[BatchMeansLog] = None,
+    limit: Optional[int] = None,
+) -> Tuple[List[Optional[int]], List[List[int]]]:
+    """为已各完成 first 次重复仿真的一组方案各补 count 次仿真
+
+    公共随机数下第k次仿真使用 streams 分配的变体（对偶模式补齐为偶数次，
+    但不超过 limit 次）；独立抽样时变体由后端递增，实际使用的变体从结果字典的 variant 读取。
+    结果写入评估缓存。返回 (各方案各次仿真的随机数变体, 各方案的吞吐量列表)。
+    """
+    if streams is not None:
+        if evaluator is None and executor is None:
+            raise ValueError(
+                "公共随机数/对偶变量需要能指定随机数变体的评估函数（BackendEvaluator 或 DESEvaluator）"
+            )
+        count = streams.batch_size(count, limit)
+        batch = streams.variants(first, count)
+    else:
+        batch = [None] * count
+    # 每次仿真的完整结果交给状态统计、截断记录与批均值估计汇总
+    observers = [o.record for o in (statistics, truncations, estimates) if o is not None]
+    # 各方案按完成顺序记录的 (实际使用的变体, 吞吐量)
+    used: Dict[Tuple, List[Tuple[Optional[int], Optional[int]]]] = {}
+
+    def observe(solution: dict, results: Optional[dict]) -> None:
+        results = results or {}
+        used.setdefault(solution_key(solution), []).append(
+            (results.get("variant"), results.get("throughput"))
+        )
+        for record in observers:
+            record(solution, results)
+
+    if executor is not None:
+        start = time.perf_counter()
+        results = executor.evaluate_batch(
+            solutions,
+            end_time,
+            count,
+            batch if streams is not None else None,
+            observer=observe,
+        )
+        # 并行批次无法区分单次耗时，按平均分摊
+        elapsed = [(time.perf_counter() - start) / (count * len(solutions))] * count
+        elapsed_of = [elapsed] * len(solutions)
+    else:
+        results, elapsed_of = [], []
+        for solution in solutions:
+            runs, elapsed = [], []
+            for variant in batch:
+                # 在主进程中执行一次仿真
+                start = time.perf_counter()
+                print(f"--- 第 {first + len(runs) + 1} 次仿真 ---")
+                if evaluator is None:
+                    from src.core.optimization.plant_simulator01 import (
+                        create_plant_simulation_model,
+                    )
+
+                    qualified, throughput = create_plant_simulation_model(
+                        buffer_solution=solution
+                    )
+                else:
+                    qualified, throughput = evaluator(solution, end_time, variant)
+                    observe(solution, getattr(evaluator, "last_results", None))
+                runs.append(throughput)
+                elapsed.append(time.perf_counter() - start)
+            results.append(runs)
+            elapsed_of.append(elapsed)
+    if streams is not None:
+        variants_of = [batch] * len(solutions)
+    else:
+        observed = [used.get(solution_key(s), []) for s in solutions]
+        variants_of = [[variant for variant, _ in runs] or batch for runs in observed]
+        if executor is not None:
+            # 并行执行按完成顺序观测，吞吐量按同一顺序取，与变体一一对应
+            results = [[throughput for _, throughput in runs] for runs in observed]
+    if cache is not None:
+        for solution, variants, runs, elapsed in zip(solutions, variants_of, results, elapsed_of):
+            cache.store(solution, end_time, first, variants, runs, elapsed)
+    return variants_of, results
+
+
+def validate_batch(
+    solutions: List[dict],
+    end_time: str,
+    num_simulations: int = 5,
+    evaluator: Optional[Evaluator] = None,
+    executor: Optional[Executor] = None,
+    sequential: Optional[SequentialQualificationTest] = None,
+    streams: Optional[CommonRandomNumbers] = None,
+    cache: Optional[EvaluationCache] = None,
+    statistics: Optional[StateStatistics] = None,
+    target_total: int = TARGET_TOTAL,
+    truncations: Optional[TruncationLog] = None,
+    estimates: Optional[BatchMeansLog] = None,
+) -> List[Tuple[bool, int]]:
+    """批量验证多个方案，返回与输入顺序一致的 (是否达标, 平均吞吐量)
+
+    各方案缺少的重复仿真按轮合并为一批提交给执行器，使多个方案同时占满
+    所有仿真实例；重复的方案只评估一次。参数含义同 validate_solution。
+    target_total 为 end_time 时长内的产量目标（短时长预筛时按时长折算）。
+    """
+    keys = [solution_key(solution) for solution in solutions]
+    unique = list(dict.fromkeys(keys))
+    solution_of = dict(zip(keys, solutions))
+    throughputs: Dict[Tuple, List[int]] = {key: [] for key in unique}
+    variants: Dict[Tuple, List[Optional[int]]] = {key: [] for key in unique}
+
+    def replicate(group: List[Tuple], count: int, limit: int) -> None:
+        """为已完成次数相同的一组方案各补 count 次仿真（对偶补齐后不超过 limit 次）"""
+        variants_of, results = simulate_batch(
+            [solution_of[key] for key in group],
+            end_time,
+            len(throughputs[group[0]]),
+            count,
+            evaluator=evaluator,
+            executor=executor,
+            streams=streams,
+            cache=cache,
+            statistics=statistics,
+            truncations=truncations,
+            estimates=estimates,
+            limit=limit,
+        )
+        for key, used, runs in zip(group, variants_of, results):
+            variants[key].extend(used)
+            throughputs[key].extend(runs)
+
+    if cache is not None:
+        limit = num_simulations if sequential is None else sequential.max_replications
+        for key in unique:
+            for variant, throughput in cache.load(solution_of[key], end_time, limit):
+                variants[key].append(variant)
+                throughputs[key].append(throughput)
+            if throughputs[key]:
+                print(f"♻️ 复用缓存中的{len(throughputs[key])}次仿真结果")
+
+    max_replications = num_simulations if sequential is None else sequential.max_replications
+    while True:
+        # 每轮按 (已完成次数, 需补次数) 分组，同组方案合并为一批仿真
+        if sequential is None:
+            # 执行多次仿真（补齐缓存中缺少的次数）
+            pending = {
+                key: max(0, num_simulations - len(throughputs[key])) for key in unique
+            }
+            pending = {key: count for key, count in pending.items() if count > 0}
+        else:
+            undecided = [
+                key
+                for key in unique
+                if sequential.decide(throughputs[key], variants[key]) is None
+            ]
+            # 序贯模式：按剩余置信区间缺口估计各方案还需的次数
+            pending = {
+                key: sequential.next_batch_size(
+                    len(throughputs[key]), throughputs[key], variants[key]
+                )
+                for key in undecided
+            }
+        if not pending:
+            break
+        groups: Dict[Tuple[int, int], List[Tuple]] = {}
+        for key, count in pending.items():
+            groups.setdefault((len(throughputs[key]), count), []).append(key)
+        for (completed, count), group in groups.items():
+            replicate(group, count, max_replications - completed)
+
+    results = {}
+    for key in unique:
+        runs = throughputs[key]
+        if streams is not None:
+            streams.observe(solution_of[key], variants[key], runs)
+
+        # 计算平均吞吐量
+        avg_throughput = int(round(sum(runs) / len(runs)))
+        # 判断是否达标（基于平均吞吐量；序贯模式按置信区间判定）
+        if sequential is None:
+            is_qualified = avg_throughput >= target_total
+        else:
+            is_qualified = sequential.decide(runs, variants[key])
+            sequential.record(len(runs), is_qualified, solution_of[key])
+        print(
+            f"📊 {len(runs)}次仿真平均吞吐量: {avg_throughput}，是否达标: {is_qualified}"
+        )
+        results[key] = (is_qualified, avg_throughput)
+    return [results[key] for key in keys]
+
+
+def skip_cached_variants(
+    cache: EvaluationCache, backend, executor: Optional[Executor] = None
+) -> None:
+    """独立抽样：后端与实例池的变体计数越过缓存中最大的变体，
+    重启或续跑后补齐的仿真不会重复使用已缓存的随机数种子"""
+    last = cache.max_variant()
+    if last is None:
+        return
+    if executor is not None:
+        executor.next_variant = max(executor.next_variant, last + 1)
+    if hasattr(backend, "replication"):
+        backend.replication = max(backend.replication, last + 1 - backend.base_seed)
+
+
+
+class EvaluationPipeline:
+    """方案评估流水线：集中持有评估组件，为各优化器提供批量评估与追加仿真"""
+
+    def __init__(
+        self,
+        backend: Optional[SimulationBackend] = None,
+        end_time: str = DEFAULT_SIMULATION_END_TIME,
+        replications: int = DEFAULT_REPLICATIONS,
+        evaluator: Optional[Evaluator] = None,
+        executor: Optional[Executor] = None,
+        sequential: Optional[SequentialQualificationTest] = None,
+        streams: Optional[CommonRandomNumbers] = None,
+        cache: Optional[EvaluationCache] = None,
+        statistics: Optional[StateStatistics] = None,
+        truncations: Optional[TruncationLog] = None,
+        estimates: Optional[BatchMeansLog] = None,
+        fidelity: Optional[MultiFidelityScreen] = None,
+        dominance: Optional[DominanceIndex] = None,
+        target_total: int = TARGET_TOTAL,
+        executor_factory: Optional[Callable[[], Executor]] = None,
+    ):
+        """
+        :param backend: 主进程的仿真后端（load 时加载，close 时释放）
+        :param end_time: 全长仿真的结束时间
+        :param replications: 固定重复次数（提供 sequential 时不使用）
+        :param evaluator: 单次仿真评估函数，为空时使用 BackendEvaluator(backend)
+        :param fidelity: 多保真度预筛，提供时候选解先做短时长仿真
+        :param dominance: 支配索引，提供时被已评估方案支配的候选解直接判定
+        :param executor_factory: 后端加载成功后创建并行执行器（各工作进程加载自己的后端实例）
+        其余参数含义同 validate_solution
+        """
+        if evaluator is None and backend is not None:
+            evaluator = BackendEvaluator(backend)
+        self.backend = backend
+        self.end_time = end_time
+        self.replications = replications
+        self.evaluator = evaluator
+        self.executor = executor
+        self.sequential = sequential
+        self.streams = streams
+        self.cache = cache
+        self.statistics = statistics
+        self.truncations = truncations
+        self.estimates = estimates
+        self.fidelity = fidelity
+        self.dominance = dominance
+        self.target_total = target_total
+        self._executor_factory = executor_factory
+
+    @classmethod
+    def from_options(
+        cls,
+        options: OptimizationOptions,
+        graph_data: dict,
+        buffer_names: List[str],
+        statistics: Optional[StateStatistics] = None,
+    ) -> "EvaluationPipeline":
+        """
+        按运行选项构建流水线（选项应已 normalize）
+        :param graph_data: 生产线有向图（评估缓存按其指纹区分生产线）
+        :param buffer_names: 缓冲区名称（支配索引的分量顺序）
+        :param statistics: 瓶颈引导的状态统计收集器
+        """
+        backend = create_backend(options.backend_name, **options.backend_options)
+        streams = options.streams
+        if streams is not None and streams.antithetic and not backend.supports_antithetic:
+            print(f"⚠️ 仿真后端 {options.backend_name} 不支持对偶随机数，仅使用公共随机数")
+            streams.antithetic = False
+        estimates = BatchMeansLog() if options.batch_means_days > 0 else None
+        cache = None
+        if options.cache_file:
+            cache = EvaluationCache(
+                # 随机数使用方式不同的结果不可混用；提前结束的吞吐量为外推估计，
+                # 批均值估计为稳态估计，均与完整仿真的结果分开缓存
+                production_line_fingerprint(
+                    graph_data,
+                    options.backend_name,
+                    options.stream_mode,
+                    *(["early-stop"] if options.early_stop else []),
+                    *(
+                        [f"batch-means/{options.batch_means_period:g}"]
+                        if estimates is not None
+                        else []
+                    ),
+                ),
+                options.cache_file,
+            )
+        workers = options.parallel_workers
+        if workers is None:
+            workers = os.cpu_count() or 1
+        executor_factory = None
+        if workers > 0:
+
+            def executor_factory() -> Executor:
+                # 各工作进程加载自己的后端实例，按完成顺序汇总重复仿真
+                worker_backend = create_backend(
+                    options.backend_name, **options.backend_options
+                )
+                if options.use_pool:
+                    return SimulatorPool(worker_backend, size=workers)
+                return ReplicationExecutor(worker_backend, max_workers=workers)
+
+        return cls(
+            backend,
+            end_time=options.end_time,
+            replications=options.replications,
+            sequential=options.sequential,
+            streams=streams,
+            cache=cache,
+            statistics=statistics,
+            truncations=TruncationLog() if options.early_stop else None,
+            estimates=estimates,
+            fidelity=(
+                MultiFidelityScreen(
+                    options.fidelity_levels,
+                    options.end_time,
+                    margin=options.fidelity_margin,
+                    audit_rate=options.fidelity_audit,
+                )
+                if options.fidelity_levels
+                else None
+            ),
+            dominance=DominanceIndex(buffer_names) if options.dominance else None,
+            executor_factory=executor_factory,
+        )
+
+    def load(self) -> bool:
+        """加载主进程的仿真后端（仅一次，后续只修改缓冲区），成功后启动并行执行器"""
+        if self.backend is not None and not self.backend.load():
+            return False
+        if self.executor is None and self._executor_factory is not None:
+            self.executor = self._executor_factory()
+        return True
+
+    @property
+    def increment(self) -> int:
+        """每轮追加仿真的批量（并行时为执行器的并发数）"""
+        return self.executor.size if self.executor is not None else 4
+
+    def validate(
+        self, solutions: List[dict], num_simulations: Optional[int] = None
+    ) -> List[Tuple[bool, int]]:
+        """全长批量评估，返回与输入顺序一致的 (是否达标, 平均吞吐量)"""
+        return validate_batch(
+            solutions,
+            self.end_time,
+            num_simulations or self.replications,
+            evaluator=self.evaluator,
+            executor=self.executor,
+            sequential=self.sequential,
+            streams=self.streams,
+            cache=self.cache,
+            statistics=self.statistics,
+            target_total=self.target_total,
+            truncations=self.truncations,
+            estimates=self.estimates,
+        )
+
+    def validate_solution(self, solution: dict) -> Tuple[bool, int]:
+        """全长评估单个方案"""
+        return self.validate([solution])[0]
+
+    def validate_single(self, solution: dict) -> Tuple[bool, int]:
+        """单次仿真的粗评估（代理模型 single 预筛），不参与序贯检验与状态统计"""
+        return validate_solution(
+            solution,
+            self.end_time,
+            1,
+            evaluator=self.evaluator,
+            executor=self.executor,
+            streams=self.streams,
+            cache=self.cache,
+            truncations=self.truncations,
+            estimates=self.estimates,
+        )
+
+    def validate_short(
+        self, solutions: List[dict], end_time: str, num_simulations: int, target_total: int
+    ) -> List[Tuple[bool, int]]:
+        """短时长评估（多保真度预筛），不参与公共随机数比较与状态统计（预热期占比与全长仿真不同）"""
+        return validate_batch(
+            solutions,
+            end_time,
+            num_simulations,
+            evaluator=self.evaluator,
+            executor=self.executor,
+            cache=self.cache,
+            target_total=target_total,
+            truncations=self.truncations,
+            estimates=self.estimates,
+        )
+
+    def batch_validator(
+        self, after: Optional[Callable[[List[dict]], None]] = None
+    ) -> BatchValidator:
+        """
+        优化器使用的候选解批量评估函数：全长评估外依次叠加多保真度预筛与支配索引
+        :param after: 全长评估后以方案列表调用的回调（如并行回火的公共随机数比较）
+        """
+
+        def validate(solutions: List[dict]) -> List[Tuple[bool, int]]:
+            results = self.validate(solutions)
+            if after is not None:
+                after(solutions)
+            return results
+
+        if self.fidelity is not None:
+            validate = self.fidelity.wrap(validate, self.validate_short)
+        if self.dominance is not None:
+            validate = self.dominance.wrap(validate)
+        return validate
+
+    def simulate(
+        self, solutions: List[dict], first: int, count: int
+    ) -> Tuple[List[List[Optional[int]]], List[List[int]]]:
+        """为已各完成 first 次仿真的方案各补 count 次（OCBA 的追加仿真）"""
+        return simulate_batch(
+            solutions,
+            self.end_time,
+            first,
+            count,
+            evaluator=self.evaluator,
+            executor=self.executor,
+            streams=self.streams,
+            cache=self.cache,
+            truncations=self.truncations,
+            estimates=self.estimates,
+            limit=count,  # 对偶补齐不能超出分配的次数（预算）
+        )
+
+    def prior(self, solution: dict) -> List[Tuple[Optional[int], int]]:
+        """方案已有的逐次仿真 [(随机数变体, 吞吐量)]，取自评估缓存或公共随机数记录"""
+        if self.cache is not None:
+            return self.cache.load(solution, self.end_time)
+        if self.streams is not None:
+            return list(self.streams.samples.get(solution_key(solution), {}).items())
+        return []
+
+    def skip_cached_variants(self) -> None:
+        """独立抽样时使后端与执行器的变体计数越过评估缓存中已用的变体"""
+        if self.cache is not None and self.streams is None:
+            skip_cached_variants(self.cache, self.backend, self.executor)
+
+    def checkpoint_objects(self) -> Dict[str, Any]:
+        """检查点需保存/恢复状态的评估组件"""
+        return dict(
+            streams=self.streams,
+            sequential=self.sequential,
+            executor=self.executor,
+            backend=self.backend,
+        )
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.close()
+        if self.cache is not None:
+            self.cache.close()
+        # 释放仿真后端资源（COM后端在此释放COM环境）
+        if self.backend is not None:
+            self.backend.close()
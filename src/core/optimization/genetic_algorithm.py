@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+稳态遗传算法缓冲区优化
+
+作为 Algorithm4 的替代，在整数缓冲区向量上进化一个种群：
+- 约束与 Algorithm4 相同：每个缓冲区 1 <= 传送带固定容量 + 缓冲区容量 <= 10，
+  且缓冲区容量非负；交叉与变异后的个体按此约束修复（截断到边界）
+- 锦标赛选择父代，均匀交叉，逐基因 ±1 变异
+- 每代的子代作为一批提交给评估函数（validate_batch）；与已评估个体或
+  同批其他个体重复的基因组在仿真前合并，直接复用已有结果
+- 稳态替换：子代与父代合并后保留最优的 population_size 个，
+  当前最优个体不会丢失（精英保留）
+
+个体优劣按约束优先比较：达标个体优于不达标个体；达标个体之间总容量
+小者优；不达标个体之间吞吐量高者优，引导种群向可行域移动。
+"""
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .solution_types import BatchValidator, solution_key
+
+# 个体：(方案, 总容量, 是否达标, 吞吐量)
+Individual = Tuple[Dict[str, int], int, bool, int]
+
+MAX_TOTAL_CAPACITY = 10  # 单个位置（传送带固定容量 + 缓冲区）的容量上限
+
+
+class GeneticAlgorithm:
+    """稳态遗传算法：锦标赛选择、均匀交叉、±1变异、约束修复与精英保留"""
+
+    def __init__(
+        self,
+        buffer_names: List[str],
+        buffer_conveyor_map: Dict[str, int],
+        initial_solution: Dict[str, int],
+        population_size: int = 12,
+        offspring_size: Optional[int] = None,
+        crossover_rate: float = 0.9,
+        mutation_rate: Optional[float] = None,
+        tournament_size: int = 2,
+        max_attempts: int = 20,
+        history_solutions: Optional[List[Individual]] = None,
+    ):
+        """
+        :param buffer_names: 缓冲区名称（基因顺序）
+        :param buffer_conveyor_map: 缓冲区→传送带固定容量映射
+        :param initial_solution: 初始方案，作为初始种群的第一个个体
+        :param population_size: 种群规模（初始种群一次批量评估）
+        :param offspring_size: 每代子代数（一批评估的方案数），默认种群规模的一半
+        :param crossover_rate: 交叉概率，否则子代复制第一个父代
+        :param mutation_rate: 逐基因变异概率，默认 1/基因数；每个子代至少变异一个基因
+        :param tournament_size: 锦标赛规模
+        :param max_attempts: 子代与已评估个体重复时重新生成的最多次数
+        :param history_solutions: 记录评估结果的历史列表（可与 Algorithm4 共享）
+        """
+        self.buffer_names = list(buffer_names)
+        self.buffer_conveyor_map = buffer_conveyor_map
+        self.initial_solution = dict(initial_solution)
+        self.population_size = max(2, population_size)
+        self.offspring_size = offspring_size or max(1, self.population_size // 2)
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = (
+            mutation_rate if mutation_rate is not None else 1.0 / len(self.buffer_names)
+        )
+        self.tournament_size = max(1, tournament_size)
+        self.max_attempts = max_attempts
+        self.history_solutions = history_solutions if history_solutions is not None else []
+        self.population: List[Individual] = []
+        # 已评估基因组 → (是否达标, 吞吐量)
+        self.evaluated: Dict[Tuple[Tuple[str, int], ...], Tuple[bool, int]] = {}
+        self.generations = 0
+        self.evaluations = 0  # 提交仿真的方案数（去重后）
+        self.duplicates = 0  # 仿真前合并的重复基因组数
+        self.no_improve_generations = 0
+
+    def bounds(self, name: str) -> Tuple[int, int]:
+        """缓冲区容量的取值范围（含两端）"""
+        fixed_cap = self.buffer_conveyor_map[name]
+        return max(0, 1 - fixed_cap), MAX_TOTAL_CAPACITY - fixed_cap
+
+    def repair(self, genome: Dict[str, int]) -> Dict[str, int]:
+        """将越界的基因截断到约束边界"""
+        repaired = {}
+        for name in self.buffer_names:
+            low, high = self.bounds(name)
+            repaired[name] = min(max(genome[name], low), high)
+        return repaired
+
+    def random_genome(self) -> Dict[str, int]:
+        """以初始方案为中心随机扰动生成个体（容量过大的区域几乎不可能最优）"""
+        return self.repair(
+            {
+                name: self.initial_solution[name] + random.randint(-1, 2)
+                for name in self.buffer_names
+            }
+        )
+
+    @staticmethod
+    def _rank(individual: Individual) -> Tuple:
+        """排序键（越小越优）：达标优先，达标比总容量，不达标比吞吐量"""
+        _, total, qualified, throughput = individual
+        if qualified:
+            return (0, total, -throughput)
+        return (1, -throughput, total)
+
+    def _tournament(self) -> Dict[str, int]:
+        contestants = random.sample(
+            self.population, min(self.tournament_size, len(self.population))
+        )
+        return min(contestants, key=self._rank)[0]
+
+    def _crossover(self, first: Dict[str, int], second: Dict[str, int]) -> Dict[str, int]:
+        if random.random() >= self.crossover_rate:
+            return dict(first)
+        return {
+            name: first[name] if random.random() < 0.5 else second[name]
+            for name in self.buffer_names
+        }
+
+    def _mutate(self, genome: Dict[str, int]) -> Dict[str, int]:
+        mutated = dict(genome)
+        genes = [name for name in self.buffer_names if random.random() < self.mutation_rate]
+        for name in genes or [random.choice(self.buffer_names)]:
+            mutated[name] += random.choice([-1, 1])
+        return self.repair(mutated)
+
+    def _offspring(self) -> Dict[str, int]:
+        return self._mutate(self._crossover(self._tournament(), self._tournament()))
+
+    def _evaluate(
+        self, genomes: List[Dict[str, int]], validate: BatchValidator
+    ) -> List[Individual]:
+        """批量评估：已评估过的基因组直接复用结果，其余去重后一次提交"""
+        pending = {}
+        for genome in genomes:
+            key = solution_key(genome)
+            if key in self.evaluated or key in pending:
+                self.duplicates += 1
+            else:
+                pending[key] = genome
+        if pending:
+            results = validate(list(pending.values()))
+            self.evaluations += len(pending)
+            for (key, genome), (qualified, throughput) in zip(pending.items(), results):
+                self.evaluated[key] = (qualified, throughput)
+                self.history_solutions.append(
+                    (genome, sum(genome.values()), qualified, throughput)
+                )
+        individuals = []
+        for genome in genomes:
+            qualified, throughput = self.evaluated[solution_key(genome)]
+            individuals.append((genome, sum(genome.values()), qualified, throughput))
+        return individuals
+
+    def initialize(self, validate: BatchValidator) -> None:
+        """初始种群：初始方案加随机扰动个体（互不重复），一次批量评估"""
+        genomes = {solution_key(self.initial_solution): self.repair(self.initial_solution)}
+        for _ in range(self.population_size * self.max_attempts):
+            if len(genomes) >= self.population_size:
+                break
+            genome = self.random_genome()
+            genomes.setdefault(solution_key(genome), genome)
+        self.population = sorted(
+            self._evaluate(list(genomes.values()), validate), key=self._rank
+        )
+
+    def step(self, validate: BatchValidator) -> None:
+        """一代：选择、交叉、变异、修复生成子代 → 批量评估 → 稳态替换"""
+        members = {solution_key(individual[0]) for individual in self.population}
+        children: Dict[Tuple[Tuple[str, int], ...], Dict[str, int]] = {}
+        for _ in range(self.offspring_size):
+            child = self._offspring()
+            # 与种群或本代子代重复的个体不增加多样性，重新生成
+            for _ in range(self.max_attempts):
+                key = solution_key(child)
+                if key not in members and key not in children:
+                    break
+                child = self._offspring()
+            children.setdefault(solution_key(child), child)
+        print(
+            f"\n--- 遗传算法第 {self.generations + 1} 代：{len(children)}个子代批量评估 ---"
+        )
+        best_before = self._rank(self.population[0])
+        offspring = [
+            individual
+            for individual in self._evaluate(list(children.values()), validate)
+            if solution_key(individual[0]) not in members
+        ]
+        self.population = sorted(self.population + offspring, key=self._rank)[
+            : self.population_size
+        ]
+        self.generations += 1
+        improved = self._rank(self.population[0]) < best_before
+        self.no_improve_generations = 0 if improved else self.no_improve_generations + 1
+
+    def run(
+        self,
+        validate: BatchValidator,
+        max_evaluations: int,
+        patience: int = 20,
+        on_iteration: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """
+        运行到仿真方案数用尽或连续 patience 代最优个体没有改进
+        :param max_evaluations: 提交仿真的方案总数上限（与单链的最大迭代次数可比）
+        :param on_iteration: 每代结束时以代数调用（模型保存策略等）
+        """
+        while self.evaluations < max_evaluations and self.no_improve_generations < patience:
+            self.step(validate)
+            if on_iteration is not None:
+                on_iteration(self.generations)
+        if self.no_improve_generations >= patience:
+            print(f"\n提前终止：连续{patience}代最优个体无改进")
+
+    def get_best_solution(self) -> Tuple[Dict[str, int], int, int]:
+        """当前最优个体 (方案, 总容量, 吞吐量)"""
+        solution, total, _, throughput = self.population[0]
+        return solution, total, throughput
+
+    def summary(self) -> str:
+        solution, total, qualified, throughput = self.population[0]
+        return (
+            f"遗传算法：种群{self.population_size}，{self.generations}代，"
+            f"仿真{self.evaluations}个方案，仿真前合并重复基因组{self.duplicates}个；"
+            f"最优个体总容量{total}（吞吐量{throughput}，达标：{qualified}）"
+        )
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+贪心边际分配缓冲区优化
+
+吞吐量对每个缓冲区容量近似单调且边际收益递减（凹），贪心分配在这类
+问题上效果很好，且每步只需一批可并行的仿真：
+- 增加阶段：从满足约束的最小容量出发，每步把所有"某个缓冲区+1"的邻居
+  作为一批提交给评估函数（validate_batch），取单位容量吞吐量增益最大者
+  （每步只增加一个单位，即吞吐量最高的邻居），直到达标
+- 削减阶段：从达标方案出发，每步批量评估所有"某个缓冲区-1"的邻居，
+  在仍达标的邻居中取吞吐量最高者，直到任何削减都会不达标，去掉增加阶段
+  因噪声或贪心顺序多分配的容量
+
+每步 O(缓冲区数) 个方案并行评估，取代数百次顺序的模拟退火迭代。
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .genetic_algorithm import MAX_TOTAL_CAPACITY
+from .solution_types import BatchValidator, solution_key
+
+
+
+class GreedyAllocation:
+    """增加阶段逐单位分配边际增益最大的缓冲区，达标后削减阶段去掉多余容量"""
+
+    def __init__(
+        self,
+        buffer_names: List[str],
+        buffer_conveyor_map: Dict[str, int],
+        trim: bool = True,
+        history_solutions: Optional[List[Tuple[Dict[str, int], int, bool, int]]] = None,
+    ):
+        """
+        :param buffer_names: 缓冲区名称
+        :param buffer_conveyor_map: 缓冲区→传送带固定容量映射（约束同 Algorithm4）
+        :param trim: 达标后是否执行削减阶段
+        :param history_solutions: 记录评估结果的历史列表（可与 Algorithm4 共享）
+        """
+        self.buffer_names = list(buffer_names)
+        self.buffer_conveyor_map = buffer_conveyor_map
+        self.trim = trim
+        self.history_solutions = history_solutions if history_solutions is not None else []
+        self.current = {name: self.bounds(name)[0] for name in self.buffer_names}
+        self.qualified = False
+        self.throughput = 0
+        # 已评估方案 → (是否达标, 吞吐量)
+        self.evaluated: Dict[Tuple[Tuple[str, int], ...], Tuple[bool, int]] = {}
+        self.phase = "add"  # add / remove / done
+        self.added: List[str] = []
+        self.removed: List[str] = []
+        self.evaluations = 0
+
+    def bounds(self, name: str) -> Tuple[int, int]:
+        """缓冲区容量的取值范围（含两端）"""
+        fixed_cap = self.buffer_conveyor_map[name]
+        return max(0, 1 - fixed_cap), MAX_TOTAL_CAPACITY - fixed_cap
+
+    def _evaluate(
+        self, solutions: List[Dict[str, int]], validate: BatchValidator
+    ) -> List[Tuple[bool, int]]:
+        """批量评估，已评估过的方案直接复用结果"""
+        pending = [s for s in solutions if solution_key(s) not in self.evaluated]
+        if pending:
+            for solution, (qualified, throughput) in zip(pending, validate(pending)):
+                self.evaluated[solution_key(solution)] = (qualified, throughput)
+                self.history_solutions.append(
+                    (solution, sum(solution.values()), qualified, throughput)
+                )
+            self.evaluations += len(pending)
+        return [self.evaluated[solution_key(solution)] for solution in solutions]
+
+    def _neighbours(self, delta: int) -> List[Tuple[str, Dict[str, int]]]:
+        """各缓冲区调整 delta 后仍满足约束的邻居"""
+        neighbours = []
+        for name in self.buffer_names:
+            low, high = self.bounds(name)
+            if low <= self.current[name] + delta <= high:
+                neighbours.append((name, {**self.current, name: self.current[name] + delta}))
+        return neighbours
+
+    def _move(self, solution: Dict[str, int], qualified: bool, throughput: int) -> None:
+        self.current, self.qualified, self.throughput = solution, qualified, throughput
+
+    def initialize(self, validate: BatchValidator) -> None:
+        """评估最小容量方案"""
+        qualified, throughput = self._evaluate([self.current], validate)[0]
+        self._move(self.current, qualified, throughput)
+        if qualified:
+            self.phase = "remove" if self.trim else "done"
+
+    def step(self, validate: BatchValidator) -> None:
+        """一步：批量评估全部邻居，按当前阶段选择移动"""
+        delta = 1 if self.phase == "add" else -1
+        neighbours = self._neighbours(delta)
+        print(
+            f"\n--- 贪心分配（{'增加' if delta > 0 else '削减'}阶段）：总容量"
+            f"{sum(self.current.values())}，{len(neighbours)}个邻居批量评估 ---"
+        )
+        results = self._evaluate([solution for _, solution in neighbours], validate)
+        if self.phase == "add":
+            if not neighbours:
+                print("⚠️ 所有缓冲区已达容量上限，仍未达标")
+                self.phase = "done"
+                return
+            # 每步增加一个单位容量，单位容量增益最大即吞吐量最高
+            (name, solution), (qualified, throughput) = max(
+                zip(neighbours, results), key=lambda item: item[1][1]
+            )
+            self.added.append(name)
+            self._move(solution, qualified, throughput)
+            if qualified:
+                self.phase = "remove" if self.trim else "done"
+            return
+        feasible = [
+            (neighbour, result)
+            for neighbour, result in zip(neighbours, results)
+            if result[0]
+        ]
+        if not feasible:
+            self.phase = "done"
+            return
+        (name, solution), (qualified, throughput) = max(
+            feasible, key=lambda item: item[1][1]
+        )
+        self.removed.append(name)
+        self._move(solution, qualified, throughput)
+
+    def run(
+        self,
+        validate: BatchValidator,
+        max_evaluations: int,
+        on_iteration: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """
+        运行到削减阶段结束或仿真方案数用尽
+        :param max_evaluations: 提交仿真的方案总数上限（与单链的最大迭代次数可比）
+        :param on_iteration: 每步结束时以步数调用（模型保存策略等）
+        """
+        steps = 0
+        while self.phase != "done" and self.evaluations < max_evaluations:
+            self.step(validate)
+            steps += 1
+            if on_iteration is not None:
+                on_iteration(steps)
+
+    def get_best_solution(self) -> Tuple[Dict[str, int], int, int]:
+        """当前方案 (方案, 总容量, 吞吐量)"""
+        return self.current, sum(self.current.values()), self.throughput
+
+    def summary(self) -> str:
+        return (
+            f"贪心分配：仿真{self.evaluations}个方案，增加{len(self.added)}个单位"
+            f"（{'、'.join(self.added) or '无'}），削减{len(self.removed)}个单位"
+            f"（{'、'.join(self.removed) or '无'}）；最终总容量"
+            f"{sum(self.current.values())}（吞吐量{self.throughput}，达标：{self.qualified}）"
+        )
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模型持久化策略
+
+优化过程中每次修改缓冲区和每次仿真后都保存 .spp 文件代价很高，
+持久化策略决定何时把内存中的模型写回磁盘：
+- never：优化过程中从不保存
+- checkpoint：每N次迭代保存一次作为检查点（并行回火、遗传算法与贪心分配
+  分别以轮、代、步为一次迭代）
+- final：只在优化结束后保存最终最优模型
+模型是否与磁盘不一致由后端跟踪（PlantSimState.model_dirty）：只有缓冲区容量
+与建线等模型内容的修改才标记为待保存，重置与运行仿真不标记，未改变时不重复写盘。
+"""
+from .simulation_backend import SimulationBackend
+
+SAVE_MODES = ("never", "checkpoint", "final")
+
+
+class ModelPersistencePolicy:
+    """按策略保存仿真模型，并统计保存/跳过次数"""
+
+    def __init__(
+        self,
+        backend: SimulationBackend,
+        mode: str = "final",
+        checkpoint_interval: int = 50,
+    ):
+        """
+        :param backend: 仿真后端（提供 save_model）
+        :param mode: 保存模式（never / checkpoint / final）
+        :param checkpoint_interval: checkpoint 模式下的保存间隔（迭代次数）
+        """
+        if mode not in SAVE_MODES:
+            raise ValueError(f"未知的保存模式: {mode}，可选：{', '.join(SAVE_MODES)}")
+        self.backend = backend
+        self.mode = mode
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.saves = 0
+        self.skipped = 0  # 按策略未保存的次数
+
+    def _save(self) -> bool:
+        ok = self.backend.save_model()
+        if ok:
+            self.saves += 1
+        return ok
+
+    def on_iteration(self, iteration: int) -> bool:
+        """每次迭代结束时调用；checkpoint 模式下到达间隔时保存"""
+        if self.mode == "checkpoint" and iteration % self.checkpoint_interval == 0:
+            return self._save()
+        self.skipped += 1
+        return True
+
+    def finalize(self) -> bool:
+        """优化结束（最终模型已应用并仿真）后调用；never 模式不保存"""
+        if self.mode == "never":
+            return True
+        ok = self._save()
+        print(f"💾 模型保存策略：{self.mode}，保存{self.saves}次，跳过{self.skipped}次")
+        return ok
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多保真度评估：短时长仿真预筛候选解
+
+每个候选解都按30天（SIMULATION_END_TIME）仿真多次，而大多数候选解明显
+达不到29000件。多保真度评估先用短时长仿真（如3–5天）估计吞吐量并按时长
+线性折算到30天：
+- 折算吞吐量低于 29000×(1-margin) 的候选解直接判定不达标，不做全长仿真
+- 其余候选解进入下一保真度等级，最后一级之后按全长仿真验证
+
+保真度等级（天数, 重复次数）可配置，按顺序逐级筛选。短时长仿真从空线开始，
+预热期占比更大，折算吞吐量略偏低（DES 后端上3天约低1%），margin 需覆盖
+这部分偏差与短时长的噪声。达标判定始终来自全长仿真，预筛只负责淘汰。
+
+为评估预筛的可靠性：进入全长仿真的候选解比较其最后一级的预筛判定
+（折算吞吐量是否≥29000）与全长仿真的判定；被淘汰的候选解按 audit_rate
+的概率仍做全长仿真（结果以全长仿真为准），统计淘汰判定与全长仿真不一致的次数。
+"""
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .des_simulator import parse_time_seconds
+from .solution_types import BatchValidator, SolutionKey, solution_key
+
+# 保真度等级：(仿真天数, 重复次数)
+FidelityLevel = Tuple[float, int]
+DEFAULT_FIDELITY_LEVELS: List[FidelityLevel] = [(3, 2)]
+# 短时长批量评估：(方案列表, 仿真结束时间, 重复次数, 折算后的目标产量) → [(是否达标, 平均吞吐量)]
+ShortValidator = Callable[[List[Dict[str, int]], str, int, int], List[Tuple[bool, int]]]
+
+
+def parse_fidelity_level(text: str) -> FidelityLevel:
+    """解析命令行的保真度等级 "天数:重复次数"（省略重复次数时为2）"""
+    days, _, replications = text.partition(":")
+    return float(days), int(replications) if replications else 2
+
+
+class MultiFidelityScreen:
+    """按保真度等级逐级用短时长仿真淘汰明显不达标的候选解"""
+
+    def __init__(
+        self,
+        levels: List[FidelityLevel],
+        full_end_time: str,
+        target_total: int = 29000,
+        margin: float = 0.03,
+        audit_rate: float = 0.05,
+    ):
+        """
+        :param levels: 保真度等级 [(仿真天数, 重复次数)]，按顺序逐级筛选
+        :param full_end_time: 全长仿真结束时间（秒）
+        :param target_total: 全长仿真的产量目标
+        :param margin: 折算吞吐量低于 target_total×(1-margin) 时淘汰
+        :param audit_rate: 被淘汰的候选解仍做全长仿真以核对判定的概率
+        """
+        self.levels = [(float(days), int(n)) for days, n in levels]
+        self.full_end_time = full_end_time
+        self.full_seconds = parse_time_seconds(full_end_time)
+        self.target_total = target_total
+        self.margin = margin
+        self.audit_rate = audit_rate
+        self.screened = 0  # 参与预筛的候选解数
+        self.rejected = [0] * len(self.levels)  # 各级淘汰数
+        self.short_days = 0.0  # 短时长仿真累计的仿真天数
+        self.promoted = 0  # 进入全长仿真的候选解数（不含核对）
+        self.audited = 0
+        self.audit_disagreements = 0  # 被淘汰但全长仿真达标
+        self.compared = 0
+        self.disagreements = 0  # 进入全长仿真的候选解中预筛判定与全长仿真不一致
+        # 等待全长仿真结果的预筛判定：方案 → (是否为核对, 预筛判定是否达标)
+        self._pending: Dict[SolutionKey, Tuple[bool, bool]] = {}
+
+    def _end_time(self, days: float) -> str:
+        return str(int(round(days * 86400)))
+
+    def screen(
+        self, solutions: List[Dict[str, int]], validate_short: ShortValidator
+    ) -> List[Optional[Tuple[bool, int]]]:
+        """
+        逐级短时长仿真预筛
+        :return: 与输入顺序一致；被淘汰的方案为 (False, 折算吞吐量)，
+            需要全长仿真（含抽中核对）的方案为 None
+        """
+        results: List[Optional[Tuple[bool, int]]] = [None] * len(solutions)
+        remaining = list(range(len(solutions)))
+        self.screened += len(solutions)
+        threshold = self.target_total * (1 - self.margin)
+        verdicts: Dict[int, bool] = {}
+        for level, (days, replications) in enumerate(self.levels):
+            if not remaining:
+                break
+            end_time = self._end_time(days)
+            scale = self.full_seconds / parse_time_seconds(end_time)
+            print(
+                f"🔬 保真度{level + 1}：{len(remaining)}个候选解各做{replications}次"
+                f"{days:g}天仿真，折算吞吐量低于{threshold:.0f}件的淘汰"
+            )
+            short = validate_short(
+                [solutions[i] for i in remaining],
+                end_time,
+                replications,
+                int(round(self.target_total / scale)),
+            )
+            self.short_days += days * replications * len(remaining)
+            promoted = []
+            for i, (_, throughput) in zip(remaining, short):
+                scaled = int(round(throughput * scale))
+                verdicts[i] = scaled >= self.target_total
+                if scaled < threshold:
+                    self.rejected[level] += 1
+                    results[i] = (False, scaled)
+                    print(f"🔬 折算吞吐量{scaled}件，判定不达标，不做全长仿真")
+                else:
+                    promoted.append(i)
+            remaining = promoted
+        self.promoted += len(remaining)
+        for i in remaining:
+            key = solution_key(solutions[i])
+            self._pending[key] = (False, verdicts.get(i, True))
+        for i, result in enumerate(results):
+            if result is not None and random.random() < self.audit_rate:
+                # 核对：被淘汰的候选解仍做全长仿真，结果以全长仿真为准
+                self.audited += 1
+                self._pending[solution_key(solutions[i])] = (True, False)
+                results[i] = None
+        return results
+
+    def record_full(self, solution: Dict[str, int], qualified: bool) -> None:
+        """记录全长仿真的判定，与该方案的预筛判定比较"""
+        pending = self._pending.pop(solution_key(solution), None)
+        if pending is None:
+            return
+        audit, predicted = pending
+        if audit:
+            self.audit_disagreements += qualified
+        else:
+            self.compared += 1
+            self.disagreements += predicted != qualified
+
+    def wrap(self, validate: BatchValidator, validate_short: ShortValidator) -> BatchValidator:
+        """包装全长批量评估函数：先逐级预筛，只对未淘汰的方案做全长仿真"""
+
+        def validate_with_screen(solutions: List[Dict[str, int]]) -> List[Tuple[bool, int]]:
+            results = self.screen(solutions, validate_short)
+            pending = [i for i, result in enumerate(results) if result is None]
+            if pending:
+                full = validate([solutions[i] for i in pending])
+                for i, (qualified, throughput) in zip(pending, full):
+                    self.record_full(solutions[i], qualified)
+                    results[i] = (qualified, throughput)
+            return results
+
+        return validate_with_screen
+
+    def summary(self, replications_per_evaluation: float = 5) -> str:
+        full_days = self.full_seconds / 86400
+        # 不预筛时所有候选解都做全长仿真
+        baseline = self.screened * replications_per_evaluation * full_days
+        spent = self.short_days + (self.promoted + self.audited) * (
+            replications_per_evaluation * full_days
+        )
+        levels = "，".join(
+            f"{days:g}天×{n}次淘汰{rejected}个"
+            for (days, n), rejected in zip(self.levels, self.rejected)
+        )
+        rejected = sum(self.rejected)
+        return (
+            f"多保真度预筛：{self.screened}个候选解，{levels}；"
+            f"全长仿真{self.promoted}个（预筛判定不一致{self.disagreements}/{self.compared}），"
+            f"淘汰后核对{self.audited}个（误淘汰{self.audit_disagreements}个）；"
+            f"淘汰的候选解平均仿真{self._rejected_cost(rejected):.1f}天，"
+            f"总仿真天数约为全部全长仿真的{spent / baseline if baseline else 0:.0%}"
+        )
+
+    def _rejected_cost(self, rejected: int) -> float:
+        """被淘汰的候选解平均消耗的仿真天数"""
+        if not rejected:
+            return 0.0
+        # 第k级淘汰的方案消耗前k级的仿真，按各级淘汰数加权
+        total, cumulative = 0.0, 0.0
+        for (days, n), level_rejected in zip(self.levels, self.rejected):
+            cumulative += days * n
+            total += cumulative * level_rejected
+        return total / rejected
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓冲区优化的运行选项
+
+命令行参数解析后一次性构建为 OptimizationOptions，normalize 校正互不兼容的
+选项组合；评估流水线（EvaluationPipeline.from_options）与各优化器都从本对象
+读取配置，optimize.main 只负责解析参数与调度。
+"""
+import argparse
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .evaluation_cache import DEFAULT_CACHE_FILE
+from .model_persistence import SAVE_MODES
+from .multi_fidelity import DEFAULT_FIDELITY_LEVELS, parse_fidelity_level
+from .optimizer_checkpoint import DEFAULT_CHECKPOINT_FILE
+from .random_streams import CommonRandomNumbers
+from .sequential_sampling import SequentialQualificationTest
+from .simulation_backend import BACKENDS
+from .surrogate import SCREEN_MODES
+
+DEFAULT_SIMULATION_END_TIME = "2592000"  # 仿真结束时间（秒，30天）
+DEFAULT_REPLICATIONS = 5  # 每个方案的重复仿真次数
+
+
+@dataclass
+class OptimizationOptions:
+    """
+    缓冲区优化选项
+    :param backend_name: 仿真后端（plantsim / des / fake），非plantsim时无需Plant Simulation
+    :param max_iterations: 最大迭代次数
+    :param parallel_workers: 并行仿真的工作进程数，默认每个CPU核心一个（0表示在主进程中顺序执行）
+    :param use_pool: 是否改用仿真实例池（健康检查、超时与故障会话回收），默认用多进程执行器
+    :param save_mode: 模型保存策略（never / checkpoint / final）
+    :param checkpoint_interval: checkpoint 策略下每隔多少次迭代保存模型
+        （并行回火按轮、遗传算法按代、贪心分配按步计）
+    :param sequential: 序贯检验（自适应重复次数），为空时每个方案固定仿真5次
+    :param streams: 公共随机数（可选对偶变量），为空时每次仿真使用新的随机数变体
+    :param cache_file: 评估缓存数据库文件，为空时不使用缓存
+    :param state_file: 优化状态检查点文件，为空时不写检查点（resume 时默认为 DEFAULT_CHECKPOINT_FILE）
+    :param state_interval: 每隔多少次迭代写一次检查点（启用检查点时同时启用评估缓存）
+    :param resume: 是否从检查点继续上次中断的优化
+    :param screen_mode: 代理模型预筛方式（skip / single），为空时不预筛
+    :param screen_threshold: 预测接受概率低于该值的候选解被预筛
+    :param analytic_margin: 解析估计剪枝的安全裕度，为空时不剪枝
+    :param tempering_chains: 并行回火的链数（>1时启用，每轮批量评估各链的候选解）
+    :param temperature_ratio: 并行回火最低温度与最高温度之比
+    :param genetic_population: 遗传算法的种群规模（>1时启用，每代子代批量评估）
+    :param greedy: 是否改用贪心边际分配（每步批量评估全部 ±1 邻居）
+    :param ocba_budget: 优化结束后OCBA排序选择阶段的重复仿真预算（0表示不启用）
+    :param guided: 是否按仿真的工位/缓冲区状态统计做瓶颈引导的候选解生成
+    :param report_targets: 结束时从帕累托存档回答的其他目标产量（各自的最小总容量）
+    :param dominance: 是否用支配索引（吞吐量单调性）直接判定被已有结果支配的候选解
+    :param speculative_width: 推测式并行退火每批的候选解数（>1时启用，按"假设拒绝"批量验证）
+    :param fidelity_levels: 多保真度预筛的等级 [(仿真天数, 重复次数)]，为空时不预筛
+    :param fidelity_margin: 折算到30天的吞吐量低于 29000×(1-margin) 的候选解被淘汰
+    :param fidelity_audit: 被淘汰的候选解仍做全长仿真以核对预筛判定的概率
+    :param early_stop: 是否分片运行仿真，累计产出已达标或上界已不可能达标时提前结束
+    :param early_stop_slice: 提前结束的检查间隔（仿真秒）
+    :param batch_means_days: 批均值估计的单次仿真天数（>0时启用，每个方案只做一次长时间仿真，
+        MSER-5截断预热期后用批均值估计稳态吞吐量）
+    :param batch_means_period: 批均值估计记录产出序列的周期（仿真秒）
+    """
+
+    backend_name: str = "plantsim"
+    max_iterations: int = 500
+    parallel_workers: Optional[int] = None
+    use_pool: bool = False
+    save_mode: str = "final"
+    checkpoint_interval: int = 50
+    sequential: Optional[SequentialQualificationTest] = None
+    streams: Optional[CommonRandomNumbers] = None
+    cache_file: Optional[str] = None
+    state_file: Optional[str] = None
+    state_interval: int = 1
+    resume: bool = False
+    screen_mode: Optional[str] = None
+    screen_threshold: float = 0.01
+    analytic_margin: Optional[float] = None
+    tempering_chains: int = 0
+    temperature_ratio: float = 0.01
+    genetic_population: int = 0
+    greedy: bool = False
+    ocba_budget: int = 0
+    guided: bool = False
+    report_targets: Optional[List[float]] = None
+    dominance: bool = False
+    speculative_width: int = 0
+    fidelity_levels: Optional[List[Tuple[float, int]]] = None
+    fidelity_margin: float = 0.03
+    fidelity_audit: float = 0.05
+    early_stop: bool = False
+    early_stop_slice: float = 86400
+    batch_means_days: float = 0
+    batch_means_period: float = 3600
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "OptimizationOptions":
+        """由 build_parser 解析出的命令行参数构建选项"""
+        return cls(
+            backend_name=args.backend,
+            max_iterations=args.max_iterations,
+            parallel_workers=args.workers,
+            use_pool=args.pool,
+            save_mode=args.save_mode,
+            checkpoint_interval=args.checkpoint_interval,
+            sequential=(
+                SequentialQualificationTest(
+                    confidence=args.confidence,
+                    min_replications=args.min_replications,
+                    max_replications=args.max_replications,
+                )
+                if args.adaptive
+                else None
+            ),
+            streams=(
+                CommonRandomNumbers(antithetic=args.antithetic)
+                if args.crn or args.antithetic
+                else None
+            ),
+            cache_file=args.cache,
+            state_file=args.state_file,
+            state_interval=args.state_interval,
+            resume=args.resume,
+            screen_mode=args.screen,
+            screen_threshold=args.screen_threshold,
+            analytic_margin=args.analytic_prune,
+            tempering_chains=args.tempering,
+            temperature_ratio=args.temperature_ratio,
+            genetic_population=args.genetic,
+            greedy=args.greedy,
+            ocba_budget=args.ocba_budget,
+            guided=args.guided,
+            report_targets=args.report_targets,
+            dominance=args.dominance,
+            speculative_width=args.speculative,
+            fidelity_levels=(
+                [parse_fidelity_level(level) for level in args.fidelity]
+                or DEFAULT_FIDELITY_LEVELS
+                if args.fidelity is not None
+                else None
+            ),
+            fidelity_margin=args.fidelity_margin,
+            fidelity_audit=args.fidelity_audit,
+            early_stop=args.early_stop,
+            early_stop_slice=args.early_stop_slice,
+            batch_means_days=args.batch_means,
+            batch_means_period=args.batch_means_period,
+        )
+
+    @property
+    def population_based(self) -> bool:
+        """是否使用种群类优化器（并行回火 / 遗传算法 / 贪心分配）"""
+        return self.tempering_chains > 1 or self.genetic_population > 1 or self.greedy
+
+    @property
+    def end_time(self) -> str:
+        """全长仿真的结束时间（批均值估计时为单次长时间仿真的时长）"""
+        if self.batch_means_days > 0:
+            return str(int(self.batch_means_days * 86400))
+        return DEFAULT_SIMULATION_END_TIME
+
+    @property
+    def replications(self) -> int:
+        """固定重复次数（批均值估计每个方案只做一次长时间仿真）"""
+        return 1 if self.batch_means_days > 0 else DEFAULT_REPLICATIONS
+
+    @property
+    def backend_options(self) -> Dict[str, Any]:
+        """传给 create_backend 的后端选项（批均值估计与提前结束互斥）"""
+        if self.batch_means_days > 0:
+            return {"batch_means_period": self.batch_means_period}
+        if self.early_stop:
+            return {"early_stop": True, "slice_seconds": self.early_stop_slice}
+        return {}
+
+    @property
+    def stream_mode(self) -> str:
+        """随机数使用方式（评估缓存按此区分，不同方式的结果不可混用）"""
+        if self.streams is None:
+            return "independent"
+        return "antithetic" if self.streams.antithetic else "crn"
+
+    def normalize(self) -> None:
+        """校正互不兼容的选项组合并打印提示（构建评估流水线前调用一次）"""
+        if self.batch_means_days > 0:
+            if self.backend_name == "fake":
+                print("⚠️ 伪后端不产生产出序列，不支持批均值估计，已忽略该选项")
+                self.batch_means_days = 0
+            else:
+                antithetic = self.streams is not None and self.streams.antithetic
+                if (
+                    self.early_stop
+                    or self.sequential is not None
+                    or self.fidelity_levels
+                    or antithetic
+                ):
+                    print(
+                        "⚠️ 批均值估计每个方案只做一次长时间仿真，"
+                        "不支持提前结束、序贯抽样、多保真度预筛与对偶变量，已忽略这些选项"
+                    )
+                    self.early_stop, self.sequential, self.fidelity_levels = False, None, None
+                    if antithetic:
+                        self.streams.antithetic = False
+        if self.early_stop and self.backend_name == "fake":
+            print("⚠️ 伪后端即时返回结果，不支持提前结束，已忽略该选项")
+            self.early_stop = False
+        if self.population_based:
+            if self.screen_mode or self.analytic_margin is not None or self.resume:
+                print("⚠️ 并行回火、遗传算法与贪心分配不支持预筛、解析剪枝与断点续跑，已忽略这些选项")
+            # 检查点只覆盖单链的模拟退火状态
+            self.screen_mode, self.analytic_margin = None, None
+            self.resume, self.state_file = False, None
+        elif self.speculative_width > 1 and (
+            self.screen_mode or self.analytic_margin is not None or self.dominance
+        ):
+            print("⚠️ 推测式并行退火不支持预筛、解析剪枝与支配索引，已忽略这些选项")
+            self.screen_mode, self.analytic_margin, self.dominance = None, None, False
+        if self.resume and not self.state_file:
+            self.state_file = DEFAULT_CHECKPOINT_FILE
+        if self.state_file and not self.cache_file:
+            # 检查点只记录已完成的迭代，中断时进行中的迭代靠评估缓存避免重复仿真
+            print(f"ℹ️ 启用检查点时同时启用评估缓存：{DEFAULT_CACHE_FILE}")
+            self.cache_file = DEFAULT_CACHE_FILE
+
+    def checkpoint_config(self) -> Dict[str, Any]:
+        """检查点记录的运行配置，续跑时必须与检查点一致"""
+        return {
+            "backend": self.backend_name,
+            "end_time": self.end_time,
+            "adaptive": self.sequential is not None,
+            "crn": self.streams is not None,
+            "antithetic": self.streams is not None and self.streams.antithetic,
+            "screen": self.screen_mode,
+            "analytic_margin": self.analytic_margin,
+            "guided": self.guided,
+            "dominance": self.dominance,
+            "fidelity": [list(level) for level in self.fidelity_levels or []],
+            "early_stop": self.early_stop,
+            "batch_means": self.batch_means_days,
+        }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """optimize 的命令行参数定义"""
+    parser = argparse.ArgumentParser(description="发动机缸盖生产线缓冲区优化")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="plantsim")
+    parser.add_argument("--max-iterations", type=int, default=500)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="并行仿真的工作进程数（默认每个CPU核心一个，0表示在主进程中顺序执行）",
+    )
+    parser.add_argument(
+        "--pool", action="store_true", help="改用带健康检查与故障回收的仿真实例池"
+    )
+    parser.add_argument("--save-mode", choices=SAVE_MODES, default="final")
+    parser.add_argument("--checkpoint-interval", type=int, default=50)
+    parser.add_argument("--adaptive", action="store_true", help="序贯抽样自适应重复次数")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--min-replications", type=int, default=2)
+    parser.add_argument("--max-replications", type=int, default=10)
+    parser.add_argument("--crn", action="store_true", help="各方案使用公共随机数")
+    parser.add_argument("--antithetic", action="store_true", help="公共随机数成对使用对偶流")
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=DEFAULT_CACHE_FILE,
+        default=None,
+        help="启用评估缓存（可指定SQLite文件）",
+    )
+    parser.add_argument(
+        "--state-file",
+        nargs="?",
+        const=DEFAULT_CHECKPOINT_FILE,
+        default=None,
+        help="启用优化状态检查点（可指定文件），同时启用评估缓存",
+    )
+    parser.add_argument("--state-interval", type=int, default=1, help="检查点间隔（迭代数）")
+    parser.add_argument(
+        "--resume", action="store_true", help="从检查点继续上次的优化（并继续写检查点）"
+    )
+    parser.add_argument("--screen", choices=SCREEN_MODES, help="代理模型预筛候选解")
+    parser.add_argument("--screen-threshold", type=float, default=0.01)
+    parser.add_argument(
+        "--analytic-prune",
+        type=float,
+        metavar="MARGIN",
+        help="校准后的解析估计低于目标×(1-MARGIN)的候选解不做仿真"
+        "（每个候选解估计约0.2秒，按评估缓存中的仿真记录校准）",
+    )
+    parser.add_argument(
+        "--tempering", type=int, default=0, metavar="K", help="并行回火链数（K>1时启用）"
+    )
+    parser.add_argument("--temperature-ratio", type=float, default=0.01)
+    parser.add_argument(
+        "--genetic", type=int, default=0, metavar="N", help="遗传算法种群规模（N>1时启用）"
+    )
+    parser.add_argument(
+        "--ocba-budget",
+        type=int,
+        default=0,
+        help="优化结束后用OCBA在候选方案间分配的重复仿真次数",
+    )
+    parser.add_argument(
+        "--guided",
+        action="store_true",
+        help="按仿真的工位/缓冲区状态统计做瓶颈引导的候选解生成（模拟退火与并行回火）",
+    )
+    parser.add_argument(
+        "--report-targets",
+        type=float,
+        nargs="+",
+        metavar="T",
+        help="结束时从帕累托存档给出各目标产量所需的最小总容量",
+    )
+    parser.add_argument(
+        "--greedy", action="store_true", help="贪心边际分配（每步并行评估全部±1邻居）"
+    )
+    parser.add_argument(
+        "--dominance",
+        action="store_true",
+        help="被已评估方案逐分量支配的候选解直接判定达标/不达标，不做仿真",
+    )
+    parser.add_argument(
+        "--speculative",
+        type=int,
+        default=0,
+        metavar="K",
+        help="推测式并行退火：每批假设拒绝生成K个候选解并行验证（通常取 --workers）",
+    )
+    parser.add_argument(
+        "--fidelity",
+        nargs="*",
+        metavar="DAYS:N",
+        help="多保真度预筛：先做N次DAYS天仿真，折算后明显不达标的候选解不做全长仿真"
+        "（不带参数时为3:2）",
+    )
+    parser.add_argument("--fidelity-margin", type=float, default=0.03)
+    parser.add_argument(
+        "--fidelity-audit", type=float, default=0.05, help="被淘汰的候选解仍做全长仿真核对的概率"
+    )
+    parser.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="分片运行仿真，累计产出已达标或按瓶颈最大速率已不可能达标时提前结束",
+    )
+    parser.add_argument(
+        "--early-stop-slice", type=float, default=86400, help="提前结束的检查间隔（仿真秒）"
+    )
+    parser.add_argument(
+        "--batch-means",
+        type=float,
+        nargs="?",
+        const=150,
+        default=0,
+        metavar="DAYS",
+        help="每个方案只做一次DAYS天（默认150）的长时间仿真，MSER-5截断预热期后按批均值估计",
+    )
+    parser.add_argument(
+        "--batch-means-period", type=float, default=3600, help="产出序列的记录周期（仿真秒）"
+    )
+    return parser
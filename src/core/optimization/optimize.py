@@ -1,41 +1,39 @@
-import time
-import pythoncom
 import json
 import sys
 import os
-from typing import Dict
+from typing import Dict, Optional, Tuple, Union
 
-# 添加项目根目录到 Python 路径，确保相对导入正常工作
+# 添加项目根目录到 Python 路径，包内导入与脚本方式运行都使用同一组绝对导入
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
-# 根据运行环境选择导入方式
-try:
-    # 首先尝试相对导入（在包环境中）
-    from .algorithm4 import Algorithm4
-    from .plant_simulator01 import (
-        create_plant_simulation_model,
-        init_plant_sim_instance,
-        add_production_line,
-        reset_and_increment,
-        modify_buffer_capacity,
-        run_simulation,
-        get_simulation_results,
-    )
-except ImportError:
-    # 如果相对导入失败，使用绝对导入
-    from src.core.optimization.algorithm4 import Algorithm4
-    from src.core.optimization.plant_simulator01 import (
-        create_plant_simulation_model,
-        init_plant_sim_instance,
-        add_production_line,
-        reset_and_increment,
-        modify_buffer_capacity,
-        run_simulation,
-        get_simulation_results,
-    )
-from src.config.path_config import MODEL_FILE, DEFAULT_PRODUCTION_LINE_FILE
+from src.config.path_config import DEFAULT_PRODUCTION_LINE_FILE
+from src.core.optimization.algorithm4 import Algorithm4
+from src.core.optimization.bottleneck import BottleneckGuide
+from src.core.optimization.evaluation_pipeline import EvaluationPipeline
+from src.core.optimization.genetic_algorithm import GeneticAlgorithm
+from src.core.optimization.greedy_allocation import GreedyAllocation
+from src.core.optimization.model_persistence import ModelPersistencePolicy
+from src.core.optimization.optimization_options import OptimizationOptions, build_parser
+from src.core.optimization.optimizer_checkpoint import OptimizerCheckpoint
+from src.core.optimization.parallel_tempering import ParallelTempering
+from src.core.optimization.ranking_selection import OCBASelection
+from src.core.optimization.speculative_annealing import SpeculativeAnnealing
+from src.core.optimization.surrogate import RidgeSurrogate, SurrogateScreen
+from src.core.optimization.throughput_estimator import (
+    AnalyticPruner,
+    ThroughputEstimator,
+    calibration_fingerprints,
+    load_cached_records,
+)
+
+TARGET_DAILY_THROUGHPUT = 29000 / 30  # 目标日产能
+BUFFER_NAMES = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8", "B9", "B10"]
+MAX_BUFFER = 5  # 初始化算法时单个缓冲区的容量上限
+STOP_TEMPERATURE = 0.1  # 停止温度
+# 种群类优化器：每轮批量评估多个候选解
+Population = Union[ParallelTempering, GeneticAlgorithm, GreedyAllocation]
 
 
 def load_production_line_data(file_path: str) -> dict:
@@ -70,139 +68,268 @@ def create_buffer_conveyor_map(conveyor_cap: dict) -> dict:
 
 
 def initialize_algorithm(
-    buffer_names: list, max_buffer: int, conv_map: dict
+    buffer_names: list,
+    max_buffer: int,
+    conv_map: dict,
+    guide: Optional[BottleneckGuide] = None,
 ) -> Algorithm4:
     """初始化优化算法实例"""
     return Algorithm4(
         buffer_names=buffer_names,
         max_buffer_per_slot=max_buffer,
         buffer_conveyor_map=conv_map,
+        guide=guide,
     )
 
 
-def validate_solution(
-    solution: dict, end_time: str, num_simulations: int = 5
-) -> tuple[bool, int]:
-    """验证解决方案的产能是否达标（多次仿真取平均值）"""
-    total_throughput = 0
-    # 执行多次仿真
-    for i in range(num_simulations):
-        print(f"--- 第 {i + 1}/{num_simulations} 次仿真 ---")
-        qualified, throughput = create_plant_simulation_model(buffer_solution=solution)
-        total_throughput += throughput
-
-    # 计算平均吞吐量
-    avg_throughput = int(round(total_throughput / num_simulations))
-    # 判断是否达标（基于平均吞吐量）
-    target_total = 29000  # 月产能目标
-    is_qualified = avg_throughput >= target_total
-    print(
-        f"📊 {num_simulations}次仿真平均吞吐量: {avg_throughput}，是否达标: {is_qualified}"
-    )
-    return is_qualified, avg_throughput
-
-
-def main():
-    # 初始化COM组件
-    pythoncom.CoInitialize()
-    DEBUG_MODE = False
-    SIMULATION_END_TIME = "2592000"  # 仿真结束时间（秒）
-    TARGET_DAILY_THROUGHPUT = 29000 / 30  # 目标日产能
-    BUFFER_NAMES = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8", "B9", "B10"]
-
-    try:
-        # 显示欢迎信息
-        print("=" * 50)
-        print("发动机缸盖生产线缓冲区优化系统")
-        print(f"目标：月产能≥29000件，最小化总缓冲区容量")
-        print("=" * 50)
-
-        # 加载生产线数据
-        graph_data = load_production_line_data(DEFAULT_PRODUCTION_LINE_FILE)
 
-        # 处理传送带与缓冲区映射关系
-        conveyor_capacities = extract_conveyor_capacities(graph_data)
-        buffer_conveyor_map = create_buffer_conveyor_map(conveyor_capacities)
 
-        # 初始化优化算法
-        algo4 = initialize_algorithm(
-            buffer_names=BUFFER_NAMES, max_buffer=5, conv_map=buffer_conveyor_map
+def build_population(
+    options: OptimizationOptions,
+    algo4: Algorithm4,
+    conv_map: dict,
+    guide: Optional[BottleneckGuide] = None,
+) -> Optional[Population]:
+    """按选项构建种群类优化器（并行回火 / 遗传算法 / 贪心分配），均未启用时返回 None"""
+    if options.greedy:
+        return GreedyAllocation(
+            BUFFER_NAMES, conv_map, history_solutions=algo4.history_solutions
         )
-
-        # 设置迭代参数
-        max_iterations = 500  # 最大迭代次数
-        stop_temperature = 0.1  # 停止温度
-
-        print(f"\n=== 启动Algorithm 4缓冲区优化 ===")
-        print(f"目标：月产能≥29000件")
-        print(f"迭代参数：最大迭代次数={max_iterations}, 停止温度={stop_temperature}")
-
-        # 验证初始解
+    if options.tempering_chains > 1:
+        return ParallelTempering(
+            [algo4]
+            + [
+                initialize_algorithm(
+                    buffer_names=BUFFER_NAMES,
+                    max_buffer=MAX_BUFFER,
+                    conv_map=conv_map,
+                    guide=guide,
+                )
+                for _ in range(options.tempering_chains - 1)
+            ],
+            temperature_ratio=options.temperature_ratio,
+        )
+    if options.genetic_population > 1:
+        return GeneticAlgorithm(
+            BUFFER_NAMES,
+            conv_map,
+            algo4.current_solution,
+            population_size=options.genetic_population,
+            history_solutions=algo4.history_solutions,
+        )
+    return None
+
+
+def build_pruner(options: OptimizationOptions, graph_data: dict) -> Optional[AnalyticPruner]:
+    """按选项构建解析估计剪枝（用评估缓存中的完整仿真校准），未启用时返回 None"""
+    if options.analytic_margin is None:
+        return None
+    estimator = ThroughputEstimator(graph_data, options.end_time)
+    # 用评估缓存中同一生产线、同一后端的完整仿真校准解析估计的系统偏差
+    records = (
+        load_cached_records(
+            options.cache_file,
+            calibration_fingerprints(graph_data, options.backend_name),
+            options.end_time,
+            limit=50,
+        )
+        if options.cache_file and options.batch_means_days <= 0 and not options.early_stop
+        else []
+    )
+    if len(records) >= 5:
+        report = estimator.evaluate_against_records(records)
+        print(
+            f"📐 解析估计按缓存中{report['records']}个方案校准："
+            f"原始平均误差{report['raw_mean_error']:+.2%}，校准系数{report['calibration']:.4f}"
+        )
+    else:
+        print("⚠️ 评估缓存中可用于校准的方案不足5个，解析估计不校准（默认生产线上偏高约2%）")
+    return AnalyticPruner(estimator, options.analytic_margin)
+
+
+def run_population(
+    population: Population,
+    pipeline: EvaluationPipeline,
+    max_iterations: int,
+    persistence: ModelPersistencePolicy,
+) -> None:
+    """种群类优化器：每轮的候选解合并为一批，经评估流水线验证"""
+    compare = None
+    if pipeline.streams is not None and isinstance(population, ParallelTempering):
+
+        def compare(solutions):
+            for chain, candidate in zip(population.chains, solutions):
+                pipeline.streams.compare(chain.current_solution, candidate)
+
+    validate = pipeline.batch_validator(after=compare)
+    population.initialize(validate)
+    population.run(validate, max_iterations, on_iteration=persistence.on_iteration)
+
+
+def run_annealing(
+    algo4: Algorithm4,
+    pipeline: EvaluationPipeline,
+    max_iterations: int,
+    persistence: ModelPersistencePolicy,
+    checkpoint: Optional[OptimizerCheckpoint] = None,
+    restored: Optional[Dict] = None,
+    screen: Optional[SurrogateScreen] = None,
+    pruner: Optional[AnalyticPruner] = None,
+    speculative: Optional[SpeculativeAnnealing] = None,
+    guide: Optional[BottleneckGuide] = None,
+) -> None:
+    """
+    模拟退火主循环：验证初始解（或从检查点恢复）后逐个候选解迭代，
+    启用推测式并行退火时每步按"假设拒绝"批量验证多个候选解
+    :param restored: 检查点中读出的状态，提供时跳过初始解验证
+    """
+    streams, fidelity, dominance_index = pipeline.streams, pipeline.fidelity, pipeline.dominance
+    checkpoint_objects = dict(pipeline.checkpoint_objects(), screen=screen, guide=guide)
+
+    if restored is not None:
+        loop_state = checkpoint.restore(restored, algo4, **checkpoint_objects)
+        # 检查点中的变体计数可能早于其后写入缓存的仿真
+        pipeline.skip_cached_variants()
+        current_qualified = loop_state["current_qualified"]
+        current_throughput = loop_state["current_throughput"]
+        if screen is not None:
+            screen.surrogate.fit(algo4.observations)
+        if dominance_index is not None:
+            for solution, _, qualified, throughput in algo4.history_solutions:
+                dominance_index.add(solution, qualified, throughput)
+    else:
+        # 运行仿真验证初始解
         initial_solution = algo4.current_solution
         initial_total = algo4.current_total_buffer
-        print(f"\n验证初始解：{initial_solution}")
-
-        # 初始化仿真环境
-        if not init_plant_sim_instance(MODEL_FILE):
-            print("❌ 初始化Plant Simulation失败，退出程序")
-            return
-
-        # 加载生产线（仅一次，后续只修改缓冲区）
-        if not add_production_line():
-            print("❌ 添加生产线失败，退出程序")
-            return
-
-        reset_and_increment()  # 移到这里，作为初始化步骤执行一次
-
-        # 将初始缓冲区方案注入到有向图数据
-        for node in graph_data["nodes"]:
-            if node["name"] in BUFFER_NAMES and node["type"] == "缓冲区":
-                node["data"]["capacity"] = initial_solution[node["name"]]
-
-        time.sleep(10)
-
-        # 运行仿真验证初始解
-        current_qualified, current_throughput = validate_solution(
-            solution=initial_solution, end_time=SIMULATION_END_TIME
-        )
+        current_qualified, current_throughput = pipeline.validate_solution(initial_solution)
 
         # 更新观测记录和历史
+        if dominance_index is not None:
+            dominance_index.add(initial_solution, current_qualified, current_throughput)
         algo4._update_observations(initial_solution, current_throughput)
+        if screen is not None:
+            screen.surrogate.update(initial_solution, current_throughput)
         algo4.add_history_solution(
             initial_solution, initial_total, current_qualified, current_throughput
         )
+        if checkpoint is not None:
+            checkpoint.save(
+                algo4,
+                {
+                    "current_qualified": current_qualified,
+                    "current_throughput": current_throughput,
+                },
+                **checkpoint_objects,
+            )
 
-        # 主迭代循环
-        while (
-            algo4.iteration < max_iterations
-            and algo4.temperature > stop_temperature
-            and algo4.no_improve_count < algo4.no_improve_threshold
-        ):  # 新增条件
-            print(
-                f"\n--- 迭代 {algo4.iteration + 1}/{max_iterations}，温度：{algo4.temperature:.2f} ---"
+    validate_speculative = pipeline.batch_validator() if speculative is not None else None
+    # 主迭代循环
+    while (
+        algo4.iteration < max_iterations
+        and algo4.temperature > STOP_TEMPERATURE
+        and algo4.no_improve_count < algo4.no_improve_threshold
+    ):  # 新增条件
+        if speculative is not None:
+            current_qualified, current_throughput = speculative.step(
+                validate_speculative,
+                current_qualified,
+                current_throughput,
+                max_iterations,
+                STOP_TEMPERATURE,
+                on_evaluated=streams.compare if streams is not None else None,
+                on_iteration=persistence.on_iteration,
+                sequential=pipeline.sequential,
             )
-            print(
-                f"连续无更优解次数：{algo4.no_improve_count}/{algo4.no_improve_threshold}"
-            )  # 新增：打印计数器
+            # 检查点只在整批处理完后写入（批内跨过写入间隔时）
+            if checkpoint is not None:
+                checkpoint.on_iteration(
+                    algo4.iteration,
+                    algo4,
+                    {
+                        "current_qualified": current_qualified,
+                        "current_throughput": current_throughput,
+                    },
+                    **checkpoint_objects,
+                )
+            continue
+        print(
+            f"\n--- 迭代 {algo4.iteration + 1}/{max_iterations}，温度：{algo4.temperature:.2f} ---"
+        )
+        print(
+            f"连续无更优解次数：{algo4.no_improve_count}/{algo4.no_improve_threshold}"
+        )  # 新增：打印计数器
+
+        # 1. 生成候选解
+        candidate_solution = algo4._generate_candidate_solution()
+        candidate_total = algo4._calculate_total_buffer(candidate_solution)
+
+        # 显示当前解与候选解信息
+        print(
+            f"当前解：{algo4.current_solution}（总容量：{algo4.current_total_buffer}，"
+            f"达标：{current_qualified}，吞吐量：{current_throughput:.2f}）"
+        )
+        print(f"候选解：{candidate_solution}（总容量：{candidate_total}）")
 
-            # 1. 生成候选解
-            candidate_solution = algo4._generate_candidate_solution()
-            candidate_total = algo4._calculate_total_buffer(candidate_solution)
+        # 2. 支配索引判定、解析估计剪枝与代理模型预筛：不做完整验证
+        decided = (
+            dominance_index.classify(candidate_solution)
+            if dominance_index is not None
+            else None
+        )
+        pruned = decided is None and pruner is not None and pruner.prune(candidate_solution)
+        screened = (
+            decided is None
+            and not pruned
+            and screen is not None
+            and screen.screen_out(algo4, candidate_solution, candidate_total, current_qualified)
+        )
+        if screened and screen.mode == "single":
+            single_qualified, _ = pipeline.validate_single(candidate_solution)
+            screened = screen.after_single(single_qualified)
+        rejected = (
+            decided is None
+            and not pruned
+            and not screened
+            and fidelity is not None
+            and fidelity.screen([candidate_solution], pipeline.validate_short)[0] is not None
+        )
 
-            # 显示当前解与候选解信息
-            print(
-                f"当前解：{algo4.current_solution}（总容量：{algo4.current_total_buffer}，"
-                f"达标：{current_qualified}，吞吐量：{current_throughput:.2f}）"
+        if decided is not None:
+            # 由已评估方案的支配关系判定，吞吐量取见证方案的值（达标为下界、不达标为上界）
+            candidate_qualified, candidate_throughput = decided
+            algo4.mark_visited(candidate_solution)
+            accept = algo4._accept_candidate(
+                candidate_total=candidate_total,
+                candidate_qualified=candidate_qualified,
+                current_qualified=current_qualified,
             )
-            print(f"候选解：{candidate_solution}（总容量：{candidate_total}）")
-
-            # 2. 验证候选解
-            candidate_qualified, candidate_throughput = validate_solution(
-                solution=candidate_solution, end_time=SIMULATION_END_TIME
+        elif pruned:
+            algo4.mark_visited(candidate_solution)
+            accept = False
+        elif screened:
+            screen.record_skip()
+            algo4.mark_visited(candidate_solution)
+            accept = False
+        elif rejected:
+            algo4.mark_visited(candidate_solution)
+            accept = False
+        else:
+            # 3. 验证候选解
+            candidate_qualified, candidate_throughput = pipeline.validate_solution(
+                candidate_solution
             )
 
-            # 3. 更新观测记录
+            if streams is not None:
+                streams.compare(algo4.current_solution, candidate_solution)
+            if fidelity is not None:
+                fidelity.record_full(candidate_solution, candidate_qualified)
+
+            # 4. 更新观测记录
+            if dominance_index is not None:
+                dominance_index.add(candidate_solution, candidate_qualified, candidate_throughput)
             algo4._update_observations(candidate_solution, candidate_throughput)
+            if screen is not None:
+                screen.surrogate.update(candidate_solution, candidate_throughput)
             algo4.add_history_solution(
                 candidate_solution,
                 candidate_total,
@@ -210,54 +337,225 @@ def main():
                 candidate_throughput,
             )
 
-            # 4. 判断是否接受候选解
+            # 5. 判断是否接受候选解
             accept = algo4._accept_candidate(
                 candidate_total=candidate_total,
                 candidate_qualified=candidate_qualified,
                 current_qualified=current_qualified,
             )
 
-            if accept:
-                print(
-                    f"✅ 接受候选解，总容量从 {algo4.current_total_buffer} 变为 {candidate_total}"
-                )
-                algo4.update_current_solution(candidate_solution, candidate_total)
-                current_qualified = candidate_qualified
-                current_throughput = candidate_throughput
-            else:
-                algo4.reject_candidate()  # 调用拒绝处理方法
-                print(f"❌ 拒绝候选解")
+        if accept:
+            print(f"✅ 接受候选解，总容量从 {algo4.current_total_buffer} 变为 {candidate_total}")
+            algo4.update_current_solution(candidate_solution, candidate_total)
+            current_qualified = candidate_qualified
+            current_throughput = candidate_throughput
+        else:
+            algo4.reject_candidate()  # 调用拒绝处理方法
+            print(f"❌ 拒绝候选解")
+
+        # 无论接受与否，都递增迭代次数并冷却温度
+        algo4.iteration += 1
+        algo4.cool_temperature()
+        persistence.on_iteration(algo4.iteration)
+        if checkpoint is not None:
+            checkpoint.on_iteration(
+                algo4.iteration,
+                algo4,
+                {
+                    "current_qualified": current_qualified,
+                    "current_throughput": current_throughput,
+                },
+                **checkpoint_objects,
+            )
+
+    # 优化结束时，打印终止原因
+    if algo4.no_improve_count >= algo4.no_improve_threshold:
+        print(f"\n提前终止：连续{algo4.no_improve_threshold}次迭代无更优解")
+
+
+def select_best(
+    algo4: Algorithm4, pipeline: EvaluationPipeline, ocba_budget: int = 0
+) -> Tuple[dict, int, float]:
+    """最优方案 (方案, 总容量, 吞吐量)；ocba_budget>0 时把额外的重复仿真分配给
+    达标与否仍不确定的候选，再选出最优方案"""
+    best_solution, best_total, best_throughput = algo4.get_best_solution()
+    if ocba_budget > 0:
+        selection = OCBASelection(
+            pipeline.simulate, budget=ocba_budget, increment=pipeline.increment
+        )
+        selection.add_candidates(algo4.history_solutions, pipeline.prior)
+        selected = selection.run()
+        if selected is not None:
+            best_solution = selected["solution"]
+            best_total = selected["total"]
+            best_throughput = selected["throughput"]
+    return best_solution, best_total, best_throughput
+
+
+def print_summary(
+    algo4: Algorithm4,
+    pipeline: EvaluationPipeline,
+    options: OptimizationOptions,
+    screen: Optional[SurrogateScreen] = None,
+    pruner: Optional[AnalyticPruner] = None,
+    population: Optional[Population] = None,
+    speculative: Optional[SpeculativeAnnealing] = None,
+    guide: Optional[BottleneckGuide] = None,
+) -> None:
+    """打印帕累托存档与各评估组件、优化器的统计"""
+    print(f"历史达标方案数量：{len([s for s in algo4.history_solutions if s[2]])}")
+    print(f"候选解生成：避开已访问方案{algo4.tabu_rejections}次")
+    print(algo4.get_archive().report(options.report_targets))
+    sequential, streams = pipeline.sequential, pipeline.streams
+    if sequential is not None:
+        print(sequential.summary())
+    if streams is not None:
+        print(streams.summary())
+        if options.backend_name == "fake":
+            print(
+                "ℹ️ 伪后端的噪声相关性由 crn_correlation / antithetic_correlation 设定，"
+                "上述方差缩减只反映这些设定，不能作为真实仿真中的效果"
+            )
+    if pipeline.cache is not None:
+        print(pipeline.cache.summary())
+    decisions = sequential.decisions if sequential is not None else []
+    replications_per_evaluation = (
+        sum(n for n, _, _ in decisions) / len(decisions) if decisions else 5
+    )
+    if screen is not None:
+        print(screen.summary(replications_per_evaluation))
+    if pruner is not None:
+        print(pruner.summary(replications_per_evaluation))
+    if pipeline.dominance is not None:
+        print(pipeline.dominance.summary(replications_per_evaluation))
+    if pipeline.fidelity is not None:
+        print(pipeline.fidelity.summary(replications_per_evaluation))
+    if pipeline.truncations is not None:
+        print(pipeline.truncations.summary())
+    if pipeline.estimates is not None:
+        print(pipeline.estimates.summary())
+    if population is not None:
+        print(population.summary())
+    if speculative is not None:
+        print(speculative.summary())
+    if guide is not None:
+        print(guide.summary())
+
+
+def main(options: Optional[OptimizationOptions] = None) -> None:
+    """
+    运行缓冲区优化：按选项构建评估流水线与优化器并调度
+    :param options: 运行选项（含义见 OptimizationOptions），为空时使用默认选项
+    """
+    options = options or OptimizationOptions()
+    options.normalize()
+    pipeline = None
+    try:
+        # 显示欢迎信息
+        print("=" * 50)
+        print("发动机缸盖生产线缓冲区优化系统")
+        print(f"目标：月产能≥29000件，最小化总缓冲区容量")
+        print("=" * 50)
+
+        # 加载生产线数据，处理传送带与缓冲区映射关系
+        graph_data = load_production_line_data(DEFAULT_PRODUCTION_LINE_FILE)
+        conv_map = create_buffer_conveyor_map(extract_conveyor_capacities(graph_data))
+
+        # 瓶颈引导：评估时收集状态统计，候选解偏向瓶颈相邻与从未满载的缓冲区
+        guide = BottleneckGuide(graph_data, BUFFER_NAMES) if options.guided else None
+        pipeline = EvaluationPipeline.from_options(
+            options,
+            graph_data,
+            BUFFER_NAMES,
+            statistics=guide.statistics if guide is not None else None,
+        )
+        persistence = ModelPersistencePolicy(
+            pipeline.backend, options.save_mode, options.checkpoint_interval
+        )
+
+        # 初始化优化算法
+        algo4 = initialize_algorithm(
+            buffer_names=BUFFER_NAMES, max_buffer=MAX_BUFFER, conv_map=conv_map, guide=guide
+        )
+        population = build_population(options, algo4, conv_map, guide)
+        # 推测式并行退火：按"假设拒绝"一次生成多个候选解并行验证
+        speculative = (
+            SpeculativeAnnealing(algo4, options.speculative_width)
+            if population is None and options.speculative_width > 1
+            else None
+        )
+        screen = (
+            SurrogateScreen(
+                RidgeSurrogate(BUFFER_NAMES),
+                options.screen_mode,
+                threshold=options.screen_threshold,
+            )
+            if options.screen_mode
+            else None
+        )
+        pruner = build_pruner(options, graph_data)
 
-            # 无论接受与否，都递增迭代次数并冷却温度
-            algo4.iteration += 1
-            algo4.cool_temperature()
+        print(f"\n=== 启动Algorithm 4缓冲区优化 ===")
+        print(f"目标：月产能≥29000件")
+        print(f"迭代参数：最大迭代次数={options.max_iterations}, 停止温度={STOP_TEMPERATURE}")
+        print(f"\n验证初始解：{algo4.current_solution}")
 
-        # 优化结束时，打印终止原因
-        if algo4.no_improve_count >= algo4.no_improve_threshold:
-            print(f"\n提前终止：连续{algo4.no_improve_threshold}次迭代无更优解")
+        # 初始化仿真环境并加载生产线（仅一次，后续只修改缓冲区），启动并行执行器
+        if not pipeline.load():
+            print(f"❌ 初始化仿真后端 {options.backend_name} 失败，退出程序")
+            return
+
+        # 检查点：续跑时恢复全部优化状态，跳过初始解验证
+        checkpoint = None
+        restored = None
+        if options.state_file:
+            checkpoint = OptimizerCheckpoint(
+                options.state_file, options.state_interval, config=options.checkpoint_config()
+            )
+            if options.resume:
+                restored = checkpoint.load()
+                if restored is None:
+                    print(f"⚠️ 未找到检查点 {options.state_file}，从头开始优化")
+
+        pipeline.skip_cached_variants()
+        if population is not None:
+            run_population(population, pipeline, options.max_iterations, persistence)
+        else:
+            run_annealing(
+                algo4,
+                pipeline,
+                options.max_iterations,
+                persistence,
+                checkpoint=checkpoint,
+                restored=restored,
+                screen=screen,
+                pruner=pruner,
+                speculative=speculative,
+                guide=guide,
+            )
 
         # 优化结束，输出结果
         print(f"\n=== Algorithm 4优化结束 ===")
-        best_solution, best_total, best_throughput = algo4.get_best_solution()
+        best_solution, best_total, best_throughput = select_best(
+            algo4, pipeline, options.ocba_budget
+        )
         print(f"最优缓冲区方案：{best_solution}")
         print(f"最优总缓冲区容量：{best_total} 件")
         print(f"最优方案吞吐量：{best_throughput} 件")
         print(f"是否达标：{best_throughput >= TARGET_DAILY_THROUGHPUT}")
-        print(f"历史达标方案数量：{len([s for s in algo4.history_solutions if s[2]])}")
+        print_summary(algo4, pipeline, options, screen, pruner, population, speculative, guide)
 
         # 生成最终模型
         print("\n=== 生成最终优化模型 ===")
-        create_plant_simulation_model(
-            buffer_solution=best_solution,
-            end_time=SIMULATION_END_TIME,
-        )
+        pipeline.evaluator(best_solution, pipeline.end_time)
+        persistence.finalize()
 
     except Exception as e:
         print(f"发生错误：{str(e)}")
     finally:
-        # 释放COM资源
-        pythoncom.CoUninitialize()
+        if pipeline is not None:
+            pipeline.close()
 
 
 if __name__ == "__main__":
-    main()
+    main(OptimizationOptions.from_args(build_parser().parse_args()))
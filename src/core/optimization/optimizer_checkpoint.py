@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+优化过程检查点与断点续跑
+
+一次500次迭代的优化需要数小时的Plant Simulation仿真，COM崩溃或机器重启
+会丢失当前解、温度、no_improve_count、history_solutions 与 observations。
+检查点在每N次迭代结束时把完整的优化状态（含随机数发生器状态、随机数
+变体计数、公共随机数、序贯检验、预筛记录与瓶颈引导的状态统计）原子地
+写入JSON文件（先写临时文件再 os.replace），--resume 从最近的检查点继续，候选解序列与中断前完全一致。
+检查点需用 --state-file 或 --resume 显式启用，默认每次迭代结束都写一次
+（状态只有几十KB，写入相对一次仿真可忽略）。
+
+中断时正在进行的那次迭代会重新执行；启用检查点时 OptimizationOptions.normalize 同时启用
+评估缓存，该迭代中已完成的仿真直接复用，不会重复仿真。
+Plant Simulation 后端未显式指定随机数变体时，其模型内部的变体递增无法恢复。
+"""
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from src.config.path_config import RESULT_DIR
+
+DEFAULT_CHECKPOINT_FILE = os.path.join(RESULT_DIR, "optimizer_checkpoint.json")
+CHECKPOINT_VERSION = 1
+
+
+class OptimizerCheckpoint:
+    """按迭代间隔保存/恢复优化状态"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CHECKPOINT_FILE,
+        interval: int = 1,
+        config: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        :param path: 检查点文件
+        :param interval: 每隔多少次迭代写一次检查点
+        :param config: 运行配置（后端、随机数方式等），续跑时必须与检查点一致
+        """
+        self.path = path
+        self.interval = max(1, interval)
+        self.config = config or {}
+        self.saves = 0
+        self.last_iteration = 0  # 最近一次 on_iteration 的迭代次数
+
+    def save(
+        self,
+        algo4,
+        loop_state: Dict[str, Any],
+        streams=None,
+        sequential=None,
+        executor=None,
+        backend=None,
+        screen=None,
+        guide=None,
+    ) -> None:
+        """原子写入检查点：临时文件写完并落盘后再替换旧文件"""
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "saved_at": time.time(),
+            "config": self.config,
+            "algorithm": algo4.get_state(),
+            "loop": loop_state,
+            "streams": streams.get_state() if streams is not None else None,
+            "sequential": sequential.get_state() if sequential is not None else None,
+            "screen": screen.get_state() if screen is not None else None,
+            "guide": guide.statistics.get_state() if guide is not None else None,
+            # 随机数变体计数，保证续跑后独立抽样不重复已用过的变体
+            "executor_next_variant": getattr(executor, "next_variant", None),
+            "backend_replication": getattr(backend, "replication", None),
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.saves += 1
+
+    def on_iteration(self, iteration: int, algo4, loop_state: Dict[str, Any], **kwargs) -> bool:
+        """每次迭代结束时调用，越过间隔边界时写检查点
+
+        接受候选解时迭代计数可能一次增加2，按是否越过 interval 的整数倍判断而不是取模
+        """
+        previous, self.last_iteration = self.last_iteration, iteration
+        if iteration // self.interval <= previous // self.interval:
+            return False
+        self.save(algo4, loop_state, **kwargs)
+        return True
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """读取检查点；文件不存在时返回 None，配置不一致时抛出 ValueError"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"检查点版本不兼容: {data.get('version')}")
+        mismatched = {
+            key: (data["config"].get(key), value)
+            for key, value in self.config.items()
+            if data["config"].get(key) != value
+        }
+        if mismatched:
+            details = "，".join(f"{k}: {old} → {new}" for k, (old, new) in mismatched.items())
+            raise ValueError(f"检查点的运行配置与本次不一致（{details}）")
+        return data
+
+    def restore(
+        self,
+        data: Dict[str, Any],
+        algo4,
+        streams=None,
+        sequential=None,
+        executor=None,
+        backend=None,
+        screen=None,
+        guide=None,
+    ) -> Dict[str, Any]:
+        """将检查点恢复到各对象，返回主循环状态"""
+        algo4.set_state(data["algorithm"])
+        if streams is not None and data["streams"] is not None:
+            streams.set_state(data["streams"])
+        if sequential is not None and data["sequential"] is not None:
+            sequential.set_state(data["sequential"])
+        if screen is not None and data["screen"] is not None:
+            screen.set_state(data["screen"])
+        if guide is not None and data.get("guide") is not None:
+            guide.statistics.set_state(data["guide"])
+        if executor is not None and data["executor_next_variant"] is not None:
+            executor.next_variant = data["executor_next_variant"]
+        if backend is not None and data["backend_replication"] is not None:
+            backend.replication = data["backend_replication"]
+        self.last_iteration = algo4.iteration
+        print(
+            f"♻️ 已从检查点恢复：迭代{algo4.iteration}，温度{algo4.temperature:.2f}，"
+            f"历史方案{len(algo4.history_solutions)}个（{self.path}）"
+        )
+        return data["loop"]
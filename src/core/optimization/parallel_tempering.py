@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并行回火（replica exchange）缓冲区优化
+
+Algorithm4 只推进一条马尔可夫链，每次评估一个候选解，仿真实例池中
+其余实例处于空闲。并行回火同时运行K条温度不同的模拟退火链：
+- 每轮每条链各生成一个候选解，K个候选解作为一批提交给评估函数
+  （validate_batch），K个仿真实例同时忙碌
+- 各链按 Algorithm4._accept_candidate 的语义（29000件达标规则）独立判定接受
+- 随后相邻温度的链按 Metropolis 准则交换状态：高温链大步探索，
+  找到的好解逐级交换到低温链精细优化
+
+温度阶梯按几何级数从 Algorithm4 的初始温度降到其 temperature_ratio 倍，
+在运行中保持不变。各链共享历史方案与观测记录，最优解取自全部链。
+"""
+import math
+import random
+from typing import Callable, Dict, List, Optional
+
+from .algorithm4 import Algorithm4
+from .solution_types import BatchValidator
+
+
+
+class ParallelTempering:
+    """K条温度不同的模拟退火链，批量评估候选解并交换相邻链的状态"""
+
+    def __init__(
+        self,
+        chains: List[Algorithm4],
+        temperature_ratio: float = 0.01,
+        unqualified_penalty: Optional[float] = None,
+    ):
+        """
+        :param chains: 初始化好的 Algorithm4 实例（链数即每轮评估的候选解数），
+            第一条链温度最低，其历史方案与观测记录由全部链共享
+        :param temperature_ratio: 最低温度与最高温度之比
+        :param unqualified_penalty: 交换判定中不达标方案的能量惩罚，
+            默认取所有缓冲区容量上限之和，保证达标方案能量总是更低
+        """
+        if not chains:
+            raise ValueError("并行回火至少需要一条链")
+        self.chains = chains
+        coldest = chains[0]
+        top = coldest.initial_temperature or coldest.temperature
+        count = len(chains)
+        for k, chain in enumerate(chains):
+            # 第一条链最冷，最后一条链保持初始温度
+            exponent = (count - 1 - k) / (count - 1) if count > 1 else 0.0
+            chain.temperature = top * temperature_ratio**exponent
+            chain.initial_temperature = top
+            chain.history_solutions = coldest.history_solutions
+            chain.observations = coldest.observations
+            chain.visited = coldest.visited
+        if unqualified_penalty is None:
+            unqualified_penalty = 10 * len(coldest.buffer_names)
+        self.unqualified_penalty = unqualified_penalty
+        self.qualified: List[bool] = [False] * count
+        self.throughputs: List[int] = [0] * count
+        self.rounds = 0
+        self.evaluations = 0
+        self.no_improve_rounds = 0
+        self.best_total = math.inf
+        # 相邻链交换统计（第k项为第k与第k+1条链）
+        self.swap_attempts = [0] * (count - 1)
+        self.swap_accepts = [0] * (count - 1)
+
+    @property
+    def coldest(self) -> Algorithm4:
+        return self.chains[0]
+
+    def _energy(self, k: int) -> float:
+        chain = self.chains[k]
+        penalty = 0 if self.qualified[k] else self.unqualified_penalty
+        return chain.current_total_buffer + penalty
+
+    def _record(self, solution: Dict[str, int], qualified: bool, throughput: int) -> None:
+        """记录一次评估到共享的观测与历史，并跟踪最优达标总容量"""
+        total = self.coldest._calculate_total_buffer(solution)
+        self.coldest._update_observations(solution, throughput)
+        self.coldest.add_history_solution(solution, total, qualified, throughput)
+        if qualified:
+            self.best_total = min(self.best_total, total)
+
+    def initialize(self, validate: BatchValidator) -> None:
+        """验证所有链共同的初始解"""
+        solution = self.coldest.current_solution
+        qualified, throughput = validate([solution])[0]
+        self._record(solution, qualified, throughput)
+        self.qualified = [qualified] * len(self.chains)
+        self.throughputs = [throughput] * len(self.chains)
+        for chain in self.chains[1:]:
+            chain.current_solution = solution.copy()
+            chain.current_total_buffer = self.coldest.current_total_buffer
+
+    def step(self, validate: BatchValidator) -> None:
+        """一轮：各链生成候选解 → 批量评估 → 各链判定接受 → 相邻链交换"""
+        candidates = [chain._generate_candidate_solution() for chain in self.chains]
+        print(
+            f"\n--- 并行回火第 {self.rounds + 1} 轮：{len(candidates)}个候选解批量评估，"
+            f"温度 {' / '.join(f'{chain.temperature:.1f}' for chain in self.chains)} ---"
+        )
+        results = validate(candidates)
+        self.evaluations += len(candidates)
+        best_before = self.best_total
+
+        recorded = set()
+        for k, (chain, candidate, (qualified, throughput)) in enumerate(
+            zip(self.chains, candidates, results)
+        ):
+            key = chain._get_solution_key(candidate)
+            if key not in recorded:
+                recorded.add(key)
+                self._record(candidate, qualified, throughput)
+            total = chain._calculate_total_buffer(candidate)
+            if chain._accept_candidate(
+                candidate_total=total,
+                candidate_qualified=qualified,
+                current_qualified=self.qualified[k],
+            ):
+                # 不调用 update_current_solution：它会冷却温度，而回火的温度阶梯保持不变
+                chain.current_solution = candidate.copy()
+                chain.current_total_buffer = total
+                self.qualified[k] = qualified
+                self.throughputs[k] = throughput
+            chain.iteration += 1
+
+        self._swap()
+        self.rounds += 1
+        improved = self.best_total < best_before
+        self.no_improve_rounds = 0 if improved else self.no_improve_rounds + 1
+
+    def _swap(self) -> None:
+        """相邻链交换：奇偶轮交替尝试 (0,1),(2,3)… 与 (1,2),(3,4)…"""
+        for k in range(self.rounds % 2, len(self.chains) - 1, 2):
+            cold, hot = self.chains[k], self.chains[k + 1]
+            delta = (1.0 / cold.temperature - 1.0 / hot.temperature) * (
+                self._energy(k) - self._energy(k + 1)
+            )
+            self.swap_attempts[k] += 1
+            if delta < 0 and random.random() >= math.exp(delta):
+                continue
+            self.swap_accepts[k] += 1
+            cold.current_solution, hot.current_solution = (
+                hot.current_solution,
+                cold.current_solution,
+            )
+            cold.current_total_buffer, hot.current_total_buffer = (
+                hot.current_total_buffer,
+                cold.current_total_buffer,
+            )
+            self.qualified[k], self.qualified[k + 1] = self.qualified[k + 1], self.qualified[k]
+            self.throughputs[k], self.throughputs[k + 1] = (
+                self.throughputs[k + 1],
+                self.throughputs[k],
+            )
+
+    def run(
+        self,
+        validate: BatchValidator,
+        max_evaluations: int,
+        patience: Optional[int] = None,
+        on_iteration: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """
+        运行到评估次数用尽或连续 patience 轮没有更优达标解
+        :param max_evaluations: 候选解评估总数上限（与单链的最大迭代次数可比）
+        :param patience: 无改进轮数上限，默认取 Algorithm4.no_improve_threshold 按链数折算
+        :param on_iteration: 每轮结束时以轮数调用（模型保存策略等）
+        """
+        if patience is None:
+            patience = max(1, self.coldest.no_improve_threshold // len(self.chains))
+        while self.evaluations < max_evaluations and self.no_improve_rounds < patience:
+            self.step(validate)
+            if on_iteration is not None:
+                on_iteration(self.rounds)
+        if self.no_improve_rounds >= patience:
+            print(f"\n提前终止：连续{patience}轮无更优达标解")
+
+    def summary(self) -> str:
+        rates = "，".join(
+            f"{k}↔{k + 1}: {accepts}/{attempts}"
+            for k, (accepts, attempts) in enumerate(
+                zip(self.swap_accepts, self.swap_attempts)
+            )
+        )
+        return (
+            f"并行回火：{len(self.chains)}条链，{self.rounds}轮，评估{self.evaluations}个方案；"
+            f"相邻链交换 {rates or '无'}"
+        )
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+总缓冲区容量–吞吐量的增量帕累托存档
+
+Algorithm4.get_best_solution 每次调用都要过滤并排序整个 history_solutions，
+且只能回答"达标（≥29000件）且总容量最小"这一个问题。存档增量维护
+非支配方案集合（总容量越小越好、平均吞吐量越高越好）：
+- 前沿按总容量严格递增保存，吞吐量也随之严格递增，两列各自有序
+- 插入时二分查找位置：被前一个点支配则丢弃，否则删除其后连续一段
+  被新点支配的点（O(log n) 查找）
+- 同一方案多次评估时按各次平均吞吐量更新其在前沿上的位置；前沿上的方案
+  平均吞吐量下降时从全部方案的平均值重建前沿
+
+查询：
+- min_buffer_for(T)：平均吞吐量 ≥ T 的最小总容量方案
+- best_throughput_for(B)：总容量 ≤ B 时平均吞吐量最高的方案
+一次优化结束后即可回答多个目标产量/容量预算，无需重新运行或重新排序历史。
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from .solution_types import SolutionKey, solution_key
+
+# 前沿上的点：(方案, 总容量, 平均吞吐量)
+ParetoPoint = Tuple[Dict[str, int], int, float]
+
+
+class ParetoArchive:
+    """非支配方案存档（总容量↓，平均吞吐量↑）"""
+
+    def __init__(self):
+        self.totals: List[int] = []
+        self.throughputs: List[float] = []
+        self.keys: List[SolutionKey] = []
+        self.solutions: Dict[SolutionKey, Dict[str, int]] = {}
+        # 方案 → (吞吐量之和, 评估次数)
+        self.sums: Dict[SolutionKey, Tuple[float, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def add(self, solution: Dict[str, int], throughput: float) -> bool:
+        """
+        记录一次评估结果
+        :param throughput: 本次评估的平均吞吐量，与该方案以往的评估合并取平均
+        :return: 方案是否位于更新后的前沿上
+        """
+        key = solution_key(solution)
+        total = sum(solution.values())
+        throughput_sum, count = self.sums.get(key, (0.0, 0))
+        self.sums[key] = (throughput_sum + throughput, count + 1)
+        self.solutions.setdefault(key, dict(solution))
+        mean = (throughput_sum + throughput) / (count + 1)
+        position = bisect_left(self.totals, total)
+        if position < len(self.keys) and self.keys[position] == key:
+            if mean < self.throughputs[position]:
+                # 前沿上的方案变差后，原先被它支配的方案可能重新非支配，全部重建（少见）
+                self._rebuild()
+                return self._on_front(key, total)
+            del self.totals[position]
+            del self.throughputs[position]
+            del self.keys[position]
+        return self._insert(key, total, mean)
+
+    def _insert(self, key: SolutionKey, total: int, mean: float) -> bool:
+        position = bisect_right(self.totals, total)
+        if position and self.throughputs[position - 1] >= mean:
+            return False  # 被总容量不大、吞吐量不低的点支配
+        start = bisect_left(self.totals, total)
+        # 从 start 起吞吐量不高于新点的连续一段都被新点支配
+        end = bisect_right(self.throughputs, mean, lo=start)
+        self.totals[start:end] = [total]
+        self.throughputs[start:end] = [mean]
+        self.keys[start:end] = [key]
+        return True
+
+    def _rebuild(self) -> None:
+        self.totals, self.throughputs, self.keys = [], [], []
+        for key, (throughput_sum, count) in self.sums.items():
+            self._insert(key, sum(cap for _, cap in key), throughput_sum / count)
+
+    def _on_front(self, key: SolutionKey, total: int) -> bool:
+        position = bisect_left(self.totals, total)
+        return position < len(self.keys) and self.keys[position] == key
+
+    def _point(self, position: int) -> ParetoPoint:
+        key = self.keys[position]
+        return self.solutions[key], self.totals[position], self.throughputs[position]
+
+    def min_buffer_for(self, target: float) -> Optional[ParetoPoint]:
+        """平均吞吐量 ≥ target 的最小总容量方案，没有时返回 None"""
+        position = bisect_left(self.throughputs, target)
+        return self._point(position) if position < len(self.throughputs) else None
+
+    def best_throughput_for(self, budget: int) -> Optional[ParetoPoint]:
+        """总容量 ≤ budget 时平均吞吐量最高的方案，没有时返回 None"""
+        position = bisect_right(self.totals, budget)
+        return self._point(position - 1) if position else None
+
+    def front(self) -> List[ParetoPoint]:
+        """按总容量升序的前沿"""
+        return [self._point(position) for position in range(len(self.keys))]
+
+    def report(self, targets: Optional[List[float]] = None) -> str:
+        lines = [f"帕累托前沿：{len(self)}个非支配方案（评估{len(self.sums)}个方案）"]
+        for _, total, throughput in self.front():
+            lines.append(f"  总容量{total:>3}  平均吞吐量{throughput:>8.0f}")
+        for target in targets or []:
+            point = self.min_buffer_for(target)
+            if point is None:
+                lines.append(f"  目标{target:.0f}件：没有达到该产量的方案")
+            else:
+                solution, total, throughput = point
+                lines.append(
+                    f"  目标{target:.0f}件：最小总容量{total}"
+                    f"（平均吞吐量{throughput:.0f}）{solution}"
+                )
+        return "\n".join(lines)
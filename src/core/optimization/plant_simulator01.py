@@ -7,7 +7,7 @@ import json
 import re
 import os
 import pythoncom
-from typing import Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 from src.generation.simtalk_generator import capacity_json_to_simtalk, json_to_simtalk
 from src.config.path_config import (
     MODEL_FILE,
@@ -27,6 +27,19 @@ class PlantSimState:
     _model_loaded = False
     _model_path = ""
     _data_writing = None
+    # 模型保存与数据输出路径（并行仿真时每个进程使用独立路径）
+    _saved_model_file = SAVED_MODEL_FILE
+    _data_output_file = DATA_OUTPUT_FILE
+    # 物料终结名称（直接读取统计值用，首个为吞吐量来源）
+    _drain_names = ["OP130"]
+    # 工位与物料终结名称（读取状态统计用）
+    _station_names = []
+    # 内存中的模型是否与磁盘上的保存文件不一致
+    _model_dirty = False
+    # 当前会话中已应用到模型的缓冲区容量，及属性写入统计
+    _applied_capacities = {}
+    _capacity_writes = 0
+    _capacity_writes_avoided = 0
 
     @classmethod
     def get_instance(cls):
@@ -66,6 +79,77 @@ class PlantSimState:
     def data_writing(self, value):
         self._data_writing = value
 
+    @property
+    def saved_model_file(self):
+        return self._saved_model_file
+
+    @saved_model_file.setter
+    def saved_model_file(self, value):
+        self._saved_model_file = value
+
+    @property
+    def data_output_file(self):
+        return self._data_output_file
+
+    @data_output_file.setter
+    def data_output_file(self, value):
+        self._data_output_file = value
+
+    @property
+    def drain_names(self):
+        return self._drain_names
+
+    @drain_names.setter
+    def drain_names(self, value):
+        self._drain_names = value
+
+    @property
+    def station_names(self):
+        return self._station_names
+
+    @station_names.setter
+    def station_names(self, value):
+        self._station_names = value
+
+    @property
+    def model_dirty(self):
+        return self._model_dirty
+
+    @model_dirty.setter
+    def model_dirty(self, value):
+        self._model_dirty = value
+
+    @property
+    def applied_capacities(self):
+        return self._applied_capacities
+
+    @applied_capacities.setter
+    def applied_capacities(self, value):
+        self._applied_capacities = value
+
+    @property
+    def capacity_writes(self):
+        return self._capacity_writes
+
+    @capacity_writes.setter
+    def capacity_writes(self, value):
+        self._capacity_writes = value
+
+    @property
+    def capacity_writes_avoided(self):
+        return self._capacity_writes_avoided
+
+    @capacity_writes_avoided.setter
+    def capacity_writes_avoided(self, value):
+        self._capacity_writes_avoided = value
+
+
+def configure_output_paths(saved_model_file: str, data_output_file: str) -> None:
+    """设置当前进程使用的模型保存路径与数据输出路径"""
+    state = PlantSimState.get_instance()
+    state.saved_model_file = saved_model_file
+    state.data_output_file = data_output_file
+
 
 def reset_and_increment() -> bool:
     """在Plant Simulation中执行SimTalk，启用重置时递增变量功能"""
@@ -91,8 +175,28 @@ def reset_and_increment() -> bool:
     return True
 
 
-def init_plant_sim_instance(model_file: str = MODEL_FILE) -> bool:
-    """初始化Plant Simulation实例并加载模型"""
+def set_random_variant(variant: int) -> bool:
+    """显式设置事件控制器的随机数变体（并行仿真时避免各实例重复同一随机流）"""
+    state = PlantSimState.get_instance()
+
+    if not state.model_loaded:
+        return False
+
+    try:
+        state.plant_sim.ExecuteSimTalk(
+            f".模型.模型.事件控制器.RandomNumbersVariant := {variant};"
+        )
+        return True
+    except Exception as e:
+        print(f"❌ 设置随机数变体失败: {str(e)}")
+        return False
+
+
+def init_plant_sim_instance(model_file: str = MODEL_FILE, launch_gui: bool = True) -> bool:
+    """初始化Plant Simulation实例并加载模型
+
+    :param launch_gui: 是否额外启动Plant Simulation界面打开模型（并行工作进程中应关闭）
+    """
     state = PlantSimState.get_instance()
 
     if state.plant_sim is not None and state.model_loaded:
@@ -155,14 +259,19 @@ def init_plant_sim_instance(model_file: str = MODEL_FILE) -> bool:
         state.plant_sim.loadModel(model_file)
         state.model_path = model_file
         state.model_loaded = True
+        state.model_dirty = True  # 尚未保存到 saved_model_file
+        state.applied_capacities = {}  # 新加载的模型，容量状态未知
         print(f"✅ 模型已加载：{model_file}")
 
+        if not launch_gui:
+            return True
+
         # 启动Plant Simulation并打开模型
         found = False
         for path in PLANT_SIM_PATHS:
             if os.path.exists(path):
                 try:
-                    subprocess.Popen([path, SAVED_MODEL_FILE])
+                    subprocess.Popen([path, state.saved_model_file])
                     print(f"✅ 已启动 Plant Simulation 并打开模型: {path}")
                     found = True
                     break
@@ -171,7 +280,7 @@ def init_plant_sim_instance(model_file: str = MODEL_FILE) -> bool:
 
         if not found:
             print("⚠️ 未找到 Plant Simulation 可执行文件")
-            print(f"请手动打开模型文件: {SAVED_MODEL_FILE}")
+            print(f"请手动打开模型文件: {state.saved_model_file}")
 
         return True
 
@@ -184,8 +293,8 @@ def init_plant_sim_instance(model_file: str = MODEL_FILE) -> bool:
         return False
 
 
-def add_production_line() -> bool:
-    """动态添加生产线结构"""
+def add_production_line(json_data: Optional[dict] = None) -> bool:
+    """动态添加生产线结构（json_data 为空时读取默认生产线配置文件）"""
     state = PlantSimState.get_instance()
 
     if not state.model_loaded:
@@ -193,15 +302,34 @@ def add_production_line() -> bool:
         return False
 
     try:
-        file_path = DEFAULT_PRODUCTION_LINE_FILE
-        # 读取生产线配置文件
-        with open(file_path, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
+        if json_data is None:
+            file_path = DEFAULT_PRODUCTION_LINE_FILE
+            # 读取生产线配置文件
+            with open(file_path, "r", encoding="utf-8") as f:
+                json_data = json.load(f)
 
         # 生成并执行SimTalk代码
-        line_setup, data_writing = json_to_simtalk(json_data)
+        line_setup, data_writing = json_to_simtalk(json_data, state.data_output_file)
         state.plant_sim.ExecuteSimTalk(line_setup)
         state.data_writing = data_writing
+        state.drain_names = [
+            node["name"] for node in json_data["nodes"] if node["type"] == "物料终结"
+        ]
+        state.station_names = [
+            node["name"]
+            for node in json_data["nodes"]
+            if node["type"] in ("工位", "物料终结")
+        ]
+        # 建线代码已按配置文件设置了各缓冲区容量
+        state.applied_capacities = {
+            node["name"]: node["data"]["capacity"]
+            for node in json_data["nodes"]
+            if node["type"] == "缓冲区" and "capacity" in node.get("data", {})
+        }
+        state.model_dirty = True
+        # 建线代码末尾会启动一次仿真，等待其结束后模型才可用
+        if not wait_for_simulation():
+            return False
         print("✅ 已动态添加生产线结构")
         return True
     except Exception as e:
@@ -210,33 +338,47 @@ def add_production_line() -> bool:
 
 
 def modify_buffer_capacity(buffer_solution: Dict[str, int]) -> bool:
-    """动态修改模型中的缓冲区容量"""
+    """动态修改模型中的缓冲区容量（只写入与当前已应用容量不同的缓冲区）"""
     state = PlantSimState.get_instance()
 
     if not state.model_loaded:
         print("❌ 模型未加载，无法修改缓冲区容量")
         return False
 
+    applied = state.applied_capacities
+    delta = {
+        buf_name: capacity
+        for buf_name, capacity in buffer_solution.items()
+        if applied.get(buf_name) != capacity
+    }
+    state.capacity_writes_avoided += len(buffer_solution) - len(delta)
+    if not delta:
+        print("✅ 缓冲区容量与当前模型一致，无需修改")
+        return True
+
     try:
-        # 构造缓冲区配置数据
+        # 构造缓冲区配置数据（仅变化部分）
         buffer_nodes = [
             {"name": buf_name, "type": "缓冲区", "data": {"capacity": capacity}}
-            for buf_name, capacity in buffer_solution.items()
+            for buf_name, capacity in delta.items()
         ]
 
         json_data = {"nodes": buffer_nodes, "edges": []}  # 无需边信息
 
         # 生成并执行SimTalk代码
-        model_setup, data_writing = capacity_json_to_simtalk(json_data)
+        model_setup, data_writing = capacity_json_to_simtalk(
+            json_data, state.data_output_file
+        )
         state.plant_sim.ExecuteSimTalk(model_setup)
         state.data_writing = data_writing
-        print(f"✅ 已动态修改缓冲区容量：{buffer_solution}")
-
-        # 保存模型
-        state.plant_sim.SaveModel(SAVED_MODEL_FILE)
-        print(f"✅ 模型已成功保存至：{SAVED_MODEL_FILE}")
+        state.model_dirty = True
+        applied.update(delta)
+        state.capacity_writes += len(delta)
+        print(f"✅ 已动态修改缓冲区容量：{delta}")
         return True
     except Exception as e:
+        # 部分写入后模型状态不确定，清空记录以便下次全量写入
+        state.applied_capacities = {}
         print(f"❌ 修改缓冲区容量失败: {str(e)}")
         return False
 
@@ -250,6 +392,7 @@ def reset_simulation_results() -> bool:
 
     try:
         reset_code = ".模型.模型.事件控制器.reset;"
+        # 仿真结果与事件控制器的运行状态不属于模型内容，不标记为待保存
         state.plant_sim.ExecuteSimTalk(reset_code)
         print("✅ 已重置上一次仿真结果")
         return True
@@ -258,8 +401,43 @@ def reset_simulation_results() -> bool:
         return False
 
 
+def save_model(force: bool = False) -> bool:
+    """保存模型；内存中的模型与磁盘一致时跳过（force=True 时强制保存）"""
+    state = PlantSimState.get_instance()
+
+    if not state.model_loaded:
+        return False
+    if not state.model_dirty and not force:
+        return True
+
+    try:
+        state.plant_sim.SaveModel(state.saved_model_file)
+        state.model_dirty = False
+        print(f"✅ 模型已成功保存至：{state.saved_model_file}")
+        return True
+    except Exception as e:
+        print(f"❌ 保存模型失败: {str(e)}")
+        return False
+
+
+def wait_for_simulation(timeout: float = 1800.0, poll_interval: float = 0.05) -> bool:
+    """完成握手：轮询 IsSimulationRunning 直到仿真结束（替代固定等待）"""
+    state = PlantSimState.get_instance()
+    deadline = time.monotonic() + timeout
+    try:
+        while state.plant_sim.IsSimulationRunning():
+            if time.monotonic() > deadline:
+                print(f"⚠️ 等待仿真结束超时（{timeout:.0f}秒）")
+                return False
+            time.sleep(poll_interval)
+        return True
+    except Exception as e:
+        print(f"❌ 查询仿真运行状态失败: {str(e)}")
+        return False
+
+
 def run_simulation(end_time: str = "2592000") -> bool:
-    """运行仿真并等待数据写入完成"""
+    """运行仿真并等待仿真结束"""
     state = PlantSimState.get_instance()
 
     if not state.model_loaded:
@@ -273,30 +451,8 @@ def run_simulation(end_time: str = "2592000") -> bool:
         ]
         state.plant_sim.ExecuteSimTalk("\n".join(simtalk_code))
         print(f"⏳ 正在运行仿真...")
-
-        # 等待仿真完成并写入数据
-        time.sleep(1)
-        print("⏳ 正在写入仿真数据...")
-        state.plant_sim.ExecuteSimTalk(state.data_writing)
-
-        # 等待数据文件生成
-        max_wait = 30
-        wait_count = 0
-        while wait_count < max_wait:
-            if (
-                os.path.exists(DATA_OUTPUT_FILE)
-                and os.path.getsize(DATA_OUTPUT_FILE) > 0
-            ):
-                print("✅ 数据文件写入完成")
-                break
-            time.sleep(1)
-            wait_count += 1
-        else:
-            print("⚠️ 数据文件写入超时，可能导致读取失败")
-
-        # 保存模型
-        state.plant_sim.SaveModel(SAVED_MODEL_FILE)
-        print(f"✅ 模型已成功保存至：{SAVED_MODEL_FILE}")
+        if not wait_for_simulation():
+            return False
         print("✅ 仿真完成")
         return True
     except Exception as e:
@@ -304,79 +460,123 @@ def run_simulation(end_time: str = "2592000") -> bool:
         return False
 
 
-def get_simulation_results() -> Tuple[bool, int]:
-    """获取当前仿真结果（30天总吞吐量）"""
+def advance_simulation(until: float) -> Optional[int]:
+    """不复位地继续运行仿真到 until 秒（分片运行），返回首个物料终结的累计产出"""
+    if not run_simulation(str(int(until))):
+        return None
+    state = PlantSimState.get_instance()
+    try:
+        return int(state.plant_sim.GetValue(f".模型.模型.{state.drain_names[0]}.statdeleted"))
+    except Exception as e:
+        print(f"❌ 读取累计产出失败: {str(e)}")
+        return None
+
+
+# 直接从模型读取的物料终结统计属性
+DRAIN_STAT_ATTRIBUTES = (
+    "statdeleted",
+    "statavglifespan",
+    "statavgexitinterval",
+    "statthroughputperday",
+)
+
+
+def read_drain_statistics() -> Dict[str, Dict[str, float]]:
+    """通过 GetValue 直接读取各物料终结的统计值"""
+    state = PlantSimState.get_instance()
+    return {
+        name: {
+            attr: state.plant_sim.GetValue(f".模型.模型.{name}.{attr}")
+            for attr in DRAIN_STAT_ATTRIBUTES
+        }
+        for name in state.drain_names
+    }
+
+
+# 工位状态时间占比属性（键与 des_simulator.STATION_STATES 一致）
+STATION_STAT_ATTRIBUTES = {
+    "working": "statworkingportion",
+    "blocked": "statblockingportion",
+    "starved": "statwaitingportion",
+    "failed": "statfailportion",
+}
+# 缓冲区占用统计属性（容量取已应用到模型的值）
+BUFFER_STAT_ATTRIBUTES = {
+    "max_occupancy": "statmaxcontents",
+    "mean_occupancy": "statavgcontents",
+    "full": "statfullportion",
+}
+
+
+def read_state_statistics() -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, float]]]:
+    """通过 GetValue 读取各工位的状态时间占比与各缓冲区的占用统计"""
+    state = PlantSimState.get_instance()
+    stations = {
+        name: {
+            key: state.plant_sim.GetValue(f".模型.模型.{name}.{attr}")
+            for key, attr in STATION_STAT_ATTRIBUTES.items()
+        }
+        for name in state.station_names
+    }
+    buffers = {}
+    for name, capacity in state.applied_capacities.items():
+        buffers[name] = {"capacity": capacity}
+        for key, attr in BUFFER_STAT_ATTRIBUTES.items():
+            buffers[name][key] = state.plant_sim.GetValue(f".模型.模型.{name}.{attr}")
+    return stations, buffers
+
+
+def _read_throughput_from_file() -> Optional[int]:
+    """回退方式：执行数据写入SimTalk后读取一次数据文件"""
+    state = PlantSimState.get_instance()
+    state.plant_sim.ExecuteSimTalk(state.data_writing)
+    with open(state.data_output_file, encoding="utf_8_sig") as fp:
+        match = re.search(r"总吞吐量\s*(\d+)", fp.read(), re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+def collect_simulation_results() -> Dict[str, Any]:
+    """获取当前仿真结果（结构化）：{"throughput": 总吞吐量, "drains": 各物料终结统计,
+    "stations": 各工位状态时间占比, "buffers": 各缓冲区占用统计}"""
     state = PlantSimState.get_instance()
 
     if not state.model_loaded:
-        return False, 0
+        return {"throughput": 0, "drains": {}}
 
     try:
-        total_30d_throughput = None
-        max_attempts = 5
-        attempt = 0
-        target_total_30d = 29000
-
-        # 多次尝试读取数据文件
-        while attempt < max_attempts and total_30d_throughput is None:
-            if not os.path.exists(DATA_OUTPUT_FILE):
-                print(
-                    f"⚠️ 数据文件不存在，等待1秒后重试（{attempt + 1}/{max_attempts}）"
-                )
-                time.sleep(1)
-                attempt += 1
-                continue
-
-            # 检查文件是否写完
-            file_size = os.path.getsize(DATA_OUTPUT_FILE)
-            time.sleep(0.5)
-            if os.path.getsize(DATA_OUTPUT_FILE) != file_size:
-                print(
-                    f"⚠️ 数据文件正在写入，等待1秒后重试（{attempt + 1}/{max_attempts}）"
-                )
-                attempt += 1
-                continue
+        drains = read_drain_statistics()
+        throughput = int(drains[state.drain_names[0]]["statdeleted"])
+    except Exception as e:
+        print(f"⚠️ 直接读取模型统计失败（{str(e)}），改为读取数据文件")
+        drains = {}
+        try:
+            throughput = _read_throughput_from_file() or 0
+        except Exception as file_error:
+            print(f"❌ 获取仿真结果失败: {str(file_error)}")
+            throughput = 0
+    try:
+        stations, buffers = read_state_statistics()
+    except Exception as e:
+        # 状态统计只用于瓶颈引导，读取失败不影响吞吐量结果
+        print(f"⚠️ 读取工位/缓冲区状态统计失败: {str(e)}")
+        stations, buffers = {}, {}
+    return {
+        "throughput": throughput,
+        "drains": drains,
+        "stations": stations,
+        "buffers": buffers,
+    }
 
-            # 读取并解析文件
-            try:
-                with open(DATA_OUTPUT_FILE, "r", encoding="utf-8") as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                print(
-                    f"⚠️ 数据文件编码错误（非utf-8），重试（{attempt + 1}/{max_attempts}）"
-                )
-                attempt += 1
-                continue
-
-            if not content:
-                print(f"⚠️ 数据文件为空，重试（{attempt + 1}/{max_attempts}）")
-                attempt += 1
-                continue
-
-            # 提取总吞吐量
-            with open(DATA_OUTPUT_FILE, encoding="utf_8_sig") as fp:
-                for line in fp:
-                    match = re.search(r"总吞吐量\s*(\d+)", line, re.IGNORECASE)
-                    if match:
-                        total_30d_throughput = int(match.group(1))
-                        break
-                else:
-                    print(f"⚠️ 未找到总吞吐量，重试（{attempt + 1}/{max_attempts}）")
-                    attempt += 1
-                    time.sleep(1)
-
-        # 验证结果是否达标
-        is_qualified = (
-            total_30d_throughput >= target_total_30d if total_30d_throughput else False
-        )
-        print(
-            f"📊 仿真结果：30天总吞吐量={total_30d_throughput or 0:.0f}件（目标≥{target_total_30d:.0f}件），是否达标：{is_qualified}"
-        )
-        return is_qualified, total_30d_throughput or 0
 
-    except Exception as e:
-        print(f"❌ 获取仿真结果失败: {str(e)}")
-        return False, 0
+def get_simulation_results() -> Tuple[bool, int]:
+    """获取当前仿真结果（30天总吞吐量）"""
+    target_total_30d = 29000
+    total_30d_throughput = collect_simulation_results()["throughput"]
+    is_qualified = total_30d_throughput >= target_total_30d
+    print(
+        f"📊 仿真结果：30天总吞吐量={total_30d_throughput:.0f}件（目标≥{target_total_30d:.0f}件），是否达标：{is_qualified}"
+    )
+    return is_qualified, total_30d_throughput
 
 
 def create_plant_simulation_model(
@@ -387,8 +587,6 @@ def create_plant_simulation_model(
     if not reset_simulation_results():
         return False, 0
 
-    time.sleep(1)
-
     if not modify_buffer_capacity(buffer_solution):
         return False, 0
 
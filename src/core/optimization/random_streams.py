@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公共随机数（CRN）与对偶变量的随机数流管理
+
+reset_and_increment 使每次重复仿真都使用新的随机数变体，相邻方案的
+比较因此被噪声主导。公共随机数让每个方案的第k次重复仿真使用同一个
+随机数变体，两方案吞吐量之差只反映缓冲区方案本身的影响。
+
+对偶模式下重复仿真成对进行：第 2j 次使用变体 v，第 2j+1 次使用
+变体 -v（同一随机数流的 1-U 对偶流，需后端支持）。
+
+同时记录各方案在每个变体下的吞吐量，用于报告方差缩减效果：
+- 公共随机数：配对差值的方差 与 独立抽样时差值方差（两方案方差之和）之比
+- 对偶变量：对偶对均值的方差 与 独立两次仿真均值方差之比
+"""
+from statistics import variance
+from typing import Any, Dict, List, Optional, Tuple
+
+from .solution_types import solution_key
+
+
+# 对偶估计至少需要的不同对偶变体数，少于此数时报告附带不可靠提示
+MIN_ANTITHETIC_VARIANTS = 10
+
+
+def antithetic_samples(
+    throughputs: List[int], variants: Optional[List[Optional[int]]] = None
+) -> Tuple[List[float], int]:
+    """估计方差所用的独立样本及每个样本包含的仿真次数
+
+    变体 v 与 -v 的两次仿真负相关，不是独立样本：至少有2个完整对偶对时
+    取对偶对均值（每个样本2次仿真），否则取逐次吞吐量
+    """
+    if variants is not None:
+        observed = dict(zip(variants, throughputs))
+        pairs = [
+            (observed[v] + observed[-v]) / 2
+            for v in observed
+            if v is not None and v > 0 and -v in observed
+        ]
+        if len(pairs) >= 2:
+            return pairs, 2
+    return list(throughputs), 1
+
+
+class CommonRandomNumbers:
+    """按重复仿真序号分配随机数变体，并统计方差缩减"""
+
+    def __init__(self, first_variant: int = 1, antithetic: bool = False):
+        """
+        :param first_variant: 第1次重复仿真使用的随机数变体
+        :param antithetic: 是否成对使用对偶随机数流
+        """
+        self.first_variant = first_variant
+        self.antithetic = antithetic
+        # 各方案在每个变体下的吞吐量
+        self.samples: Dict[Tuple, Dict[int, int]] = {}
+        # 每次比较的 (配对差值方差, 独立抽样差值方差)
+        self.comparisons: List[Tuple[float, float]] = []
+
+    def variants(self, start: int, count: int) -> List[int]:
+        """第 start ~ start+count-1 次重复仿真（从0计）使用的随机数变体"""
+        if not self.antithetic:
+            return [self.first_variant + k for k in range(start, start + count)]
+        return [
+            (self.first_variant + k // 2) * (-1 if k % 2 else 1)
+            for k in range(start, start + count)
+        ]
+
+    def batch_size(self, count: int, limit: Optional[int] = None) -> int:
+        """对偶模式下将重复次数补齐为偶数，保证对偶对完整；
+        limit 为允许的最多次数，补齐后超出时不补（最后一次仿真不成对）"""
+        if self.antithetic and count % 2 and (limit is None or count < limit):
+            return count + 1
+        return count
+
+    def observe(
+        self, solution: Dict[str, int], variants: List[int], throughputs: List[int]
+    ) -> None:
+        self.samples.setdefault(solution_key(solution), {}).update(
+            zip(variants, throughputs)
+        )
+
+    def compare(
+        self, current: Dict[str, int], candidate: Dict[str, int]
+    ) -> Optional[float]:
+        """记录一次方案比较，返回配对差值方差相对独立抽样的比值（无法估计时为None）"""
+        a = self.samples.get(solution_key(current), {})
+        b = self.samples.get(solution_key(candidate), {})
+        common = sorted(set(a) & set(b))
+        if len(common) < 2 or a is b:
+            return None
+        paired = variance([b[v] - a[v] for v in common])
+        independent = variance([a[v] for v in common]) + variance(
+            [b[v] for v in common]
+        )
+        if independent <= 0:
+            return None
+        self.comparisons.append((paired, independent))
+        return paired / independent
+
+    def antithetic_ratio(self) -> Optional[float]:
+        """对偶对均值的方差相对独立两次仿真均值方差的比值（汇总所有方案）"""
+        # 按方案合并分子与分母后再求比值：每个方案通常只有2～3个对偶对，
+        # 逐方案求比值再平均会被小样本比值的偏差主导
+        paired = independent = 0.0
+        for observed in self.samples.values():
+            pairs = [
+                (observed[v], observed[-v]) for v in observed if v > 0 and -v in observed
+            ]
+            if len(pairs) < 2:
+                continue
+            singles = [x for pair in pairs for x in pair]
+            paired += variance([(x + y) / 2 for x, y in pairs])
+            independent += variance(singles) / 2
+        if independent <= 0:
+            return None
+        return paired / independent
+
+    def antithetic_variants(self) -> int:
+        """参与对偶估计的不同变体个数（各方案共用变体，实际独立样本数）"""
+        return len(
+            {
+                v
+                for observed in self.samples.values()
+                for v in observed
+                if v > 0 and -v in observed
+            }
+        )
+
+    def get_state(self) -> Dict[str, Any]:
+        """导出可JSON序列化的状态（用于检查点）"""
+        return {
+            "samples": [
+                [list(key), list(observed.items())] for key, observed in self.samples.items()
+            ],
+            "comparisons": self.comparisons,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.samples = {
+            tuple((name, cap) for name, cap in key): dict(observed)
+            for key, observed in state["samples"]
+        }
+        self.comparisons = [tuple(c) for c in state["comparisons"]]
+
+    def summary(self) -> str:
+        lines = []
+        if self.comparisons:
+            paired = sum(p for p, _ in self.comparisons)
+            independent = sum(i for _, i in self.comparisons)
+            lines.append(
+                f"公共随机数：{len(self.comparisons)}次方案比较，差值方差为独立抽样的"
+                f"{paired / independent:.1%}（方差缩减{1 - paired / independent:.1%}）"
+            )
+        else:
+            lines.append("公共随机数：尚无可配对的方案比较")
+        if self.antithetic:
+            ratio = self.antithetic_ratio()
+            if ratio is None:
+                lines.append("对偶变量：对偶对不足，无法估计")
+            else:
+                lines.append(
+                    f"对偶变量：对偶对均值方差为独立抽样的{ratio:.1%}（方差缩减{1 - ratio:.1%}）"
+                )
+                # 公共随机数下各方案共用同一批变体，方案间噪声高度相关，
+                # 有效样本数是不同对偶变体的个数而不是方案数
+                pairs = self.antithetic_variants()
+                if pairs < MIN_ANTITHETIC_VARIANTS:
+                    lines.append(
+                        f"⚠️ 上述估计只基于{pairs}个不同的对偶变体，各方案共用这些变体，"
+                        f"估计不可靠，不能作为对偶变量效果的依据"
+                    )
+        return "\n".join(lines)
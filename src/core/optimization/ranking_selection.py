@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+最优计算量分配（OCBA）：在候选方案中选出真正的最优方案
+
+Algorithm4.get_best_solution 直接取总容量最小的达标方案，完全信任该方案
+恰好得到的重复仿真次数，平均吞吐量接近29000的边界方案经常被错判。
+本模块在优化结束后做一轮排序与选择：
+- 候选方案：历史平均吞吐量不低于 目标×(1-margin) 的方案中总容量最小的若干个
+  （包括差一点不达标、但可能其实达标且总容量更小的方案）
+- 最优方案定义为"真实平均吞吐量达标的方案中总容量最小者"，因此选择正确
+  当且仅当被选方案达标、且所有总容量更小的候选都不达标
+- 每轮按可行性判定的 OCBA 比例 n_i ∝ s_i² / (x̄_i - 目标)² 把增量重复仿真
+  分配给影响决策的候选（被选方案与总容量更小者），离目标越近、方差越大的
+  方案分得越多；总容量更大的候选不影响决策，不再分配
+- 正确选择概率（PCS）按独立正态近似：
+  P(被选方案达标) × Π P(总容量更小的候选不达标)
+- 对偶模式下同一对偶对的两次仿真负相关，方差按对偶对均值估计
+
+达到目标PCS或预算用尽即停止，返回选出的方案与PCS估计。
+"""
+import math
+from statistics import NormalDist, mean, variance
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .random_streams import antithetic_samples
+from .solution_types import SolutionKey, solution_key
+
+# 追加重复仿真：(方案列表, 各方案已完成次数, 追加次数)
+#   → (各方案新增仿真的随机数变体, 各方案新增的吞吐量)
+Replicator = Callable[
+    [List[Dict[str, int]], int, int], Tuple[List[List[Optional[int]]], List[List[int]]]
+]
+# 方案已有的逐次仿真：方案 → [(随机数变体, 吞吐量)]
+Prior = Callable[[Dict[str, int]], List[Tuple[Optional[int], int]]]
+
+
+class OCBASelection:
+    """按OCBA比例分配重复仿真，选出达标且总容量最小的方案并估计PCS"""
+
+    def __init__(
+        self,
+        replicate: Replicator,
+        target_total: int = 29000,
+        budget: int = 50,
+        increment: int = 4,
+        initial_replications: int = 3,
+        pcs_target: float = 0.95,
+        max_candidates: int = 10,
+        margin: float = 0.02,
+    ):
+        """
+        :param replicate: 追加重复仿真的函数（如 EvaluationPipeline.simulate）
+        :param budget: 本阶段最多追加的重复仿真次数（含补齐最少重复次数的仿真）
+        :param increment: 每轮分配的重复仿真次数（通常为并行度）
+        :param initial_replications: 每个候选至少的重复次数（估计方差所需）
+        :param pcs_target: 正确选择概率达到该值即停止
+        :param max_candidates: 参与选择的候选方案数上限
+        :param margin: 历史平均吞吐量低于 目标×(1-margin) 的方案不参与选择
+        """
+        self.replicate = replicate
+        self.target_total = target_total
+        self.budget = budget
+        self.increment = max(1, increment)
+        self.initial_replications = max(2, initial_replications)
+        self.pcs_target = pcs_target
+        self.max_candidates = max_candidates
+        self.margin = margin
+        self.solutions: Dict[SolutionKey, Dict[str, int]] = {}
+        self.samples: Dict[SolutionKey, List[int]] = {}
+        self.variants: Dict[SolutionKey, List[Optional[int]]] = {}
+        self.used = 0  # 本阶段追加的重复仿真次数
+
+    def add_candidates(
+        self,
+        history: List[Tuple[Dict[str, int], int, bool, int]],
+        prior: Optional[Prior] = None,
+    ) -> int:
+        """
+        从历史方案中挑选候选
+        :param history: Algorithm4.history_solutions
+        :param prior: 读取方案已有的逐次仿真 (变体, 吞吐量)（如评估缓存），为空时从零开始
+        :return: 候选数
+        """
+        averages: Dict[SolutionKey, List[int]] = {}
+        for solution, _, _, throughput in history:
+            key = solution_key(solution)
+            self.solutions.setdefault(key, dict(solution))
+            averages.setdefault(key, []).append(throughput)
+        threshold = self.target_total * (1.0 - self.margin)
+        eligible = [key for key, values in averages.items() if mean(values) >= threshold]
+        eligible.sort(
+            key=lambda key: (sum(self.solutions[key].values()), -mean(averages[key]))
+        )
+        for key in eligible[: self.max_candidates]:
+            runs = list(prior(self.solutions[key])) if prior is not None else []
+            self.variants[key] = [variant for variant, _ in runs]
+            self.samples[key] = [throughput for _, throughput in runs]
+        return len(self.samples)
+
+    def _total(self, key: SolutionKey) -> int:
+        return sum(self.solutions[key].values())
+
+    def _run_variance(self, key: SolutionKey) -> float:
+        """折算到单次仿真的方差：均值的方差 = 该值 / 仿真次数（对偶模式按对偶对均值估计）"""
+        samples, runs_per_sample = antithetic_samples(self.samples[key], self.variants[key])
+        return max(variance(samples) * runs_per_sample, 1.0)
+
+    def _feasible_probability(self, key: SolutionKey) -> float:
+        """P(真实平均吞吐量 >= 目标) 的正态近似"""
+        values = self.samples[key]
+        std_error = math.sqrt(self._run_variance(key) / len(values))
+        return 1.0 - NormalDist(mean(values), std_error).cdf(self.target_total)
+
+    def selected(self) -> Optional[SolutionKey]:
+        """当前样本均值下达标且总容量最小的方案（同容量取吞吐量高者）"""
+        feasible = [
+            key for key, values in self.samples.items() if mean(values) >= self.target_total
+        ]
+        if not feasible:
+            return None
+        return min(feasible, key=lambda key: (self._total(key), -mean(self.samples[key])))
+
+    def _relevant(self, best: Optional[SolutionKey]) -> List[SolutionKey]:
+        """影响选择结果的候选：被选方案及总容量更小的方案"""
+        if best is None:
+            return list(self.samples)
+        return [key for key in self.samples if self._total(key) < self._total(best)] + [best]
+
+    def pcs(self) -> float:
+        """正确选择概率估计"""
+        best = self.selected()
+        if best is None:
+            return 0.0
+        probability = self._feasible_probability(best)
+        for key in self._relevant(best)[:-1]:
+            probability *= 1.0 - self._feasible_probability(key)
+        return probability
+
+    def _allocate(self, count: int) -> Dict[SolutionKey, int]:
+        """按 n_i ∝ s_i²/δ_i² 计算目标次数，把 count 次仿真逐次分给缺口最大的候选"""
+        relevant = self._relevant(self.selected())
+        weights = {}
+        for key in relevant:
+            values = self.samples[key]
+            gap = max(abs(mean(values) - self.target_total), 1.0)
+            weights[key] = self._run_variance(key) / gap**2
+        total_weight = sum(weights.values())
+        planned = sum(len(self.samples[key]) for key in relevant) + count
+        deficits = {
+            key: planned * weights[key] / total_weight - len(self.samples[key])
+            for key in relevant
+        }
+        allocation: Dict[SolutionKey, int] = {}
+        for _ in range(count):
+            key = max(deficits, key=deficits.get)
+            allocation[key] = allocation.get(key, 0) + 1
+            deficits[key] -= 1
+        return allocation
+
+    def _run(self, allocation: Dict[SolutionKey, int]) -> None:
+        """执行分配：已完成次数与追加次数相同的候选合并为一批"""
+        groups: Dict[Tuple[int, int], List[SolutionKey]] = {}
+        for key, count in allocation.items():
+            groups.setdefault((len(self.samples[key]), count), []).append(key)
+        for (first, count), keys in groups.items():
+            variants_of, results = self.replicate(
+                [self.solutions[key] for key in keys], first, count
+            )
+            for key, variants, runs in zip(keys, variants_of, results):
+                self.variants[key].extend(variants)
+                self.samples[key].extend(runs)
+                self.used += len(runs)
+
+    def run(self) -> Optional[Dict[str, object]]:
+        """
+        执行排序与选择
+        :return: {solution, total, throughput, replications, pcs}；没有候选时返回 None
+        """
+        if not self.samples:
+            return None
+        # 补齐每个候选的最少重复次数（计入预算）：按总容量从小到大补齐，
+        # 预算不够补齐的候选不再参与选择
+        initial: Dict[SolutionKey, int] = {}
+        remaining = self.budget - self.used
+        for key in list(self.samples):
+            deficit = self.initial_replications - len(self.samples[key])
+            if deficit <= 0:
+                continue
+            if deficit > remaining:
+                print(f"⚠️ 预算不足以补齐总容量{self._total(key)}的候选，不参与选择")
+                del self.samples[key], self.variants[key]
+                continue
+            initial[key] = deficit
+            remaining -= deficit
+        self._run(initial)
+        if not self.samples:
+            return None
+        while self.used < self.budget and self.pcs() < self.pcs_target:
+            self._run(self._allocate(min(self.increment, self.budget - self.used)))
+        best = self.selected()
+        print(self.report())
+        if best is None:
+            return None
+        return {
+            "solution": self.solutions[best],
+            "total": self._total(best),
+            "throughput": int(round(mean(self.samples[best]))),
+            "replications": len(self.samples[best]),
+            "pcs": self.pcs(),
+        }
+
+    def report(self) -> str:
+        best = self.selected()
+        lines = [f"OCBA选择：追加仿真{self.used}次，正确选择概率{self.pcs():.3f}"]
+        for key in sorted(self.samples, key=lambda key: (self._total(key), key)):
+            values = self.samples[key]
+            mark = "★" if key == best else " "
+            lines.append(
+                f" {mark} 总容量{self._total(key):>3}  仿真{len(values):>3}次  "
+                f"平均吞吐量{mean(values):>8.0f}  P(达标)={self._feasible_probability(key):.3f}"
+            )
+        return "\n".join(lines)
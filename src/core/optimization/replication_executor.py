@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多进程并行重复仿真执行器
+
+将同一方案的多次重复仿真分发到 ProcessPoolExecutor 的多个工作进程，
+每个工作进程持有独立的仿真后端实例（独立的模型副本与数据输出文件），
+按完成顺序汇总吞吐量，使一个方案的N次重复仿真约等于一次仿真的耗时；
+evaluate_batch 一次提交多个方案的重复仿真（接口同 SimulatorPool）。
+
+评估流水线（EvaluationPipeline）默认使用本执行器（每个CPU核心一个工作进程）；需要健康检查、
+超时与故障会话回收时改用 --pool（SimulatorPool）。
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config.path_config import RESULT_DIR
+from .simulation_backend import DESBackend, SimulationBackend
+
+# 工作进程内的仿真后端实例（由 _init_worker 加载）
+_backend: Optional[SimulationBackend] = None
+
+
+def _init_worker(backend: SimulationBackend, work_dir: str) -> None:
+    """工作进程初始化：创建私有目录并加载仿真后端"""
+    global _backend
+    worker_dir = os.path.join(work_dir, f"worker_{os.getpid()}")
+    os.makedirs(worker_dir, exist_ok=True)
+    if not backend.load(worker_dir):
+        raise RuntimeError(f"工作进程 {os.getpid()} 加载仿真后端失败")
+    _backend = backend
+
+
+def _run_replication(
+    solution: Dict[str, int], end_time: str, variant: int
+) -> Tuple[int, Dict[str, Any], float]:
+    """在工作进程中执行一次重复仿真，返回 (随机数变体, 结果字典, 耗时)"""
+    start = time.perf_counter()
+    results: Dict[str, Any] = {}
+    # 各次重复仿真显式使用不同的随机数变体，避免并行实例重复同一随机流
+    if _backend.apply_buffers(solution) and _backend.run(end_time, variant):
+        results = _backend.results()
+    return variant, results, time.perf_counter() - start
+
+
+class ReplicationExecutor:
+    """并行重复仿真执行器（默认每个CPU核心一个仿真工作进程）"""
+
+    def __init__(
+        self,
+        backend: Optional[SimulationBackend] = None,
+        max_workers: Optional[int] = None,
+        work_dir: str = os.path.join(RESULT_DIR, "workers"),
+        first_variant: int = 1,
+    ):
+        """
+        :param backend: 未加载的仿真后端，会被复制到每个工作进程中分别加载
+        :param max_workers: 工作进程数，默认CPU核心数
+        :param work_dir: 工作进程私有目录的父目录
+        :param first_variant: 首个随机数变体编号，之后每次重复仿真递增
+        """
+        self.backend = backend if backend is not None else DESBackend()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.work_dir = work_dir
+        self.next_variant = first_variant
+        os.makedirs(work_dir, exist_ok=True)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.backend, work_dir),
+        )
+
+    @property
+    def size(self) -> int:
+        """并行度（工作进程数）"""
+        return self.max_workers
+
+    def run_replications(
+        self,
+        solution: Dict[str, int],
+        end_time: str,
+        num_replications: int,
+        variants: Optional[List[int]] = None,
+    ) -> List[int]:
+        """并行执行多次重复仿真，返回与随机数变体顺序一致的吞吐量
+
+        :param variants: 指定各次仿真的随机数变体（公共随机数），为空时顺延递增
+        """
+        return self.evaluate_batch([solution], end_time, num_replications, variants)[0]
+
+    def evaluate_batch(
+        self,
+        solutions: List[Dict[str, int]],
+        end_time: str,
+        num_replications: int,
+        variants: Optional[List[int]] = None,
+        observer: Optional[Callable[[Dict[str, int], Dict[str, Any]], None]] = None,
+    ) -> List[List[int]]:
+        """一次性提交多个方案的全部重复仿真，返回各方案的吞吐量列表
+
+        :param variants: 各方案共用的随机数变体（公共随机数）；为空时每个方案各自顺延递增
+        :param observer: 每次仿真完成后以 (方案, 结果字典) 调用，用于收集状态统计
+        """
+        futures = {}
+        for index, solution in enumerate(solutions):
+            if variants is None:
+                solution_variants = range(
+                    self.next_variant, self.next_variant + num_replications
+                )
+                self.next_variant += num_replications
+            else:
+                solution_variants = variants
+            for position, variant in enumerate(solution_variants):
+                future = self._pool.submit(_run_replication, solution, end_time, variant)
+                futures[future] = (index, position)
+        throughputs = [[0] * num_replications for _ in solutions]
+        for done, future in enumerate(as_completed(futures), start=1):
+            variant, results, elapsed = future.result()
+            index, position = futures[future]
+            throughput = results.get("throughput", 0)
+            throughputs[index][position] = throughput
+            if observer is not None:
+                observer(solutions[index], results)
+            print(
+                f"--- 完成 {done}/{len(futures)} 次仿真"
+                f"（变体{variant}，吞吐量{throughput}，耗时{elapsed:.1f}秒）---"
+            )
+        return throughputs
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
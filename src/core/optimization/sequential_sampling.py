@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+序贯抽样的重复仿真控制
+
+validate_solution 固定执行5次重复仿真，而多数候选解在前两三次后
+平均吞吐量就已明显高于或低于29000。序贯检验在每次仿真后更新均值与
+单侧置信区间，一旦"达标/不达标"的判断达到设定置信度即停止，
+并受最少/最多重复次数约束。
+
+对偶模式下变体 v 与 -v 的两次仿真负相关，不是独立样本：置信区间按
+对偶对均值计算，下一轮的重复次数按剩余的置信区间缺口估计并补齐为整对。
+"""
+import math
+from statistics import NormalDist, stdev
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.stat_utils import mean_half_width
+from .random_streams import antithetic_samples
+from .solution_types import solution_key
+
+
+class SequentialQualificationTest:
+    """基于置信区间的序贯达标判定"""
+
+    def __init__(
+        self,
+        target_total: int = 29000,
+        confidence: float = 0.95,
+        min_replications: int = 2,
+        max_replications: int = 10,
+    ):
+        """
+        :param target_total: 月产能目标
+        :param confidence: 判定所需的单侧置信度
+        :param min_replications: 最少重复次数（至少2次才能估计方差）
+        :param max_replications: 最多重复次数，达到后按均值判定
+        """
+        self.target_total = target_total
+        self.confidence = confidence
+        self.min_replications = max(2, min_replications)
+        self.max_replications = max(self.min_replications, max_replications)
+        # 每次判定的记录：(重复次数, 是否达标, 是否在上限前提前判定)
+        self.decisions: List[Tuple[int, bool, bool]] = []
+        # 暂缓计入的判定（推测执行中尚不知道是否被采用的候选解）：方案 → 判定记录
+        self._deferred: Optional[Dict[Tuple, Tuple[int, bool, bool]]] = None
+
+    def decide(
+        self, throughputs: List[int], variants: Optional[List[int]] = None
+    ) -> Optional[bool]:
+        """根据已有观测判定；尚不能以设定置信度判定时返回 None
+
+        :param variants: 各次仿真的随机数变体，含对偶对时按对偶对均值估计置信区间
+        """
+        n = len(throughputs)
+        if n < self.min_replications:
+            return None
+        samples, _ = antithetic_samples(throughputs, variants)
+        _, half_width = mean_half_width(samples, self.confidence, one_sided=True)
+        mean = sum(throughputs) / n
+        if mean - half_width >= self.target_total:
+            return True
+        if mean + half_width < self.target_total:
+            return False
+        if n >= self.max_replications:
+            return mean >= self.target_total
+        return None
+
+    def next_batch_size(
+        self,
+        completed: int,
+        throughputs: Optional[List[int]] = None,
+        variants: Optional[List[int]] = None,
+    ) -> int:
+        """下一轮应提交的重复仿真次数
+
+        首轮补足最少次数；之后估计置信区间半宽缩小到均值与目标之差所需的
+        样本数，只补差额（对偶模式按整对补），不超过最多重复次数
+        """
+        if completed < self.min_replications:
+            return self.min_replications - completed
+        remaining = self.max_replications - completed
+        if not throughputs:
+            return min(1, remaining)
+        samples, runs_per_sample = antithetic_samples(throughputs, variants)
+        if runs_per_sample == 1 and variants is not None and any(v < 0 for v in variants):
+            # 对偶对不足2个，负相关的逐次吞吐量会高估方差：先补成2个对偶对
+            return min(2, remaining)
+        # 小样本的 t 分位数很大，用正态分位数估计所需样本数，且每轮至多翻倍
+        z = NormalDist().inv_cdf(self.confidence)
+        gap = max(abs(sum(throughputs) / len(throughputs) - self.target_total), 1.0)
+        needed = math.ceil((z * stdev(samples) / gap) ** 2) - len(samples)
+        needed = min(max(1, needed), len(samples))
+        return min(needed * runs_per_sample, remaining)
+
+    def record(
+        self, replications: int, qualified: bool, solution: Optional[Dict[str, int]] = None
+    ) -> None:
+        early = replications < self.max_replications
+        if self._deferred is not None and solution is not None:
+            self._deferred[solution_key(solution)] = (replications, qualified, early)
+        else:
+            self.decisions.append((replications, qualified, early))
+        print(
+            f"📏 序贯判定：{replications}次仿真后判定{'达标' if qualified else '不达标'}"
+            f"{'（提前停止）' if early else '（达到上限）'}"
+        )
+
+    def defer(self) -> None:
+        """此后带方案的判定暂不计入，由 commit 逐个计入、discard_deferred 丢弃"""
+        self._deferred = {}
+
+    def commit(self, solution: Dict[str, int]) -> None:
+        """计入被采用的方案的暂缓判定"""
+        if self._deferred is not None:
+            decision = self._deferred.pop(solution_key(solution), None)
+            if decision is not None:
+                self.decisions.append(decision)
+
+    def discard_deferred(self) -> int:
+        """丢弃其余暂缓的判定并恢复直接计入，返回丢弃的判定数"""
+        discarded = len(self._deferred or {})
+        self._deferred = None
+        return discarded
+
+    def get_state(self) -> Dict[str, Any]:
+        """导出可JSON序列化的状态（用于检查点）"""
+        return {"decisions": self.decisions}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.decisions = [tuple(d) for d in state["decisions"]]
+
+    def summary(self, fixed_replications: int = 5) -> str:
+        """汇总各次判定使用的重复次数，并与固定次数方案比较"""
+        if not self.decisions:
+            return "序贯抽样：尚无判定"
+        total = sum(n for n, _, _ in self.decisions)
+        count = len(self.decisions)
+        early = sum(1 for _, _, e in self.decisions if e)
+        fixed = count * fixed_replications
+        saved = fixed - total
+        comparison = (
+            f"节省{saved}次（{saved / fixed:.1%}）"
+            if saved >= 0
+            else f"多用{-saved}次（{-saved / fixed:.1%}），序贯抽样未能减少仿真次数"
+        )
+        return (
+            f"序贯抽样：{count}次判定共{total}次仿真（平均{total / count:.2f}次/判定，"
+            f"提前停止{early}次）；固定{fixed_replications}次需{fixed}次，{comparison}"
+        )
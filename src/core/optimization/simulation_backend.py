@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+仿真后端接口
+
+优化循环只依赖 SimulationBackend 协议（load / apply_buffers / run / results / save_model / close），
+具体实现可以是：
+- PlantSimBackend：封装 plant_simulator01 中基于COM的现有流程
+- DESBackend：进程内本地离散事件仿真（des_simulator）
+- FakeBackend：记录调用并按解析响应面在微秒级返回结果，用于基准测试与性能分析
+"""
+import json
+import os
+import random
+import shutil
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+from src.config.path_config import DEFAULT_PRODUCTION_LINE_FILE, MODEL_FILE
+from .des_simulator import (
+    DEFAULT_END_TIME,
+    SECONDS_PER_DAY,
+    parse_time_seconds,
+    simulate_production_line,
+)
+from .batch_means import BatchMeansEstimator, open_ended
+from .early_termination import EarlyTermination
+
+
+class SimulationBackend(Protocol):
+    """仿真后端协议"""
+
+    # 是否支持对偶随机数（负的 variant 表示与 |variant| 对偶的随机数流）
+    supports_antithetic: bool
+
+    def load(self, work_dir: Optional[str] = None) -> bool:
+        """加载模型与生产线；work_dir 非空时使用私有目录存放模型副本与结果文件"""
+        ...
+
+    def apply_buffers(self, buffer_solution: Dict[str, int]) -> bool:
+        """将缓冲区方案应用到模型"""
+        ...
+
+    def run(self, end_time: str = DEFAULT_END_TIME, variant: Optional[int] = None) -> bool:
+        """运行一次仿真；variant 指定随机数变体，为空时沿用后端自身的递增规则
+
+        同一 variant 在不同方案间复用同一组随机数流（公共随机数）
+        """
+        ...
+
+    def results(self) -> Dict[str, Any]:
+        """返回最近一次仿真的结果（至少包含 throughput；variant 为实际使用的随机数变体，未知时为空）"""
+        ...
+
+    def save_model(self, force: bool = False) -> bool:
+        """将内存中的模型写回磁盘；模型未改变时跳过（无模型文件的后端直接返回True）"""
+        ...
+
+    def close(self) -> None:
+        """释放后端资源"""
+        ...
+
+
+class PlantSimBackend:
+    """Plant Simulation（COM）后端，封装 plant_simulator01 的现有函数"""
+
+    # 事件控制器只能切换随机数变体，无法生成 1-U 的对偶流
+    supports_antithetic = False
+
+    def __init__(
+        self,
+        model_file: str = MODEL_FILE,
+        launch_gui: bool = True,
+        early_stop: bool = False,
+        slice_seconds: float = SECONDS_PER_DAY,
+        batch_means_period: Optional[float] = None,
+    ):
+        """
+        :param early_stop: 是否分片运行（逐片设置事件控制器结束时间），达标与否确定后提前结束
+        :param slice_seconds: 提前结束的检查间隔（仿真秒）
+        :param batch_means_period: 提供时源不再在30天时停止，每次仿真逐周期记录产出
+            并按批均值估计稳态吞吐量（单次长时间仿真）
+        """
+        self.model_file = model_file
+        self.launch_gui = launch_gui
+        self.early_stop = early_stop
+        self.slice_seconds = slice_seconds
+        self.batch_means_period = batch_means_period
+        self._early_stop: Optional[EarlyTermination] = None
+        self._batch_means: Optional[BatchMeansEstimator] = None
+        self._estimate: Optional[Dict[str, Any]] = None
+        self.buffer_solution: Dict[str, int] = {}
+        self._truncated: Optional[Dict[str, Any]] = None
+        self._end_seconds = 0.0
+        self._variant: Optional[int] = None
+        self._loaded = False  # load 成功后才需要在 close 时释放COM与汇总写入统计
+
+    def load(self, work_dir: Optional[str] = None) -> bool:
+        import pythoncom
+        from . import plant_simulator01 as ps
+
+        pythoncom.CoInitialize()
+        model_file = self.model_file
+        if work_dir is not None:
+            # 私有模型副本与结果文件，避免多个实例争用同一路径
+            model_file = os.path.join(work_dir, os.path.basename(self.model_file))
+            shutil.copyfile(self.model_file, model_file)
+            ps.configure_output_paths(
+                saved_model_file=os.path.join(work_dir, "saved.spp"),
+                data_output_file=os.path.join(work_dir, "data_output.txt"),
+            )
+        launch_gui = self.launch_gui and work_dir is None
+        if not ps.init_plant_sim_instance(model_file, launch_gui=launch_gui):
+            return False
+        with open(DEFAULT_PRODUCTION_LINE_FILE, "r", encoding="utf-8") as f:
+            graph_data = json.load(f)
+        if self.batch_means_period:
+            graph_data = open_ended(graph_data)
+            self._batch_means = BatchMeansEstimator(self.batch_means_period)
+        if not ps.add_production_line(graph_data):
+            return False
+        if self.early_stop:
+            self._early_stop = EarlyTermination(graph_data, slice_seconds=self.slice_seconds)
+        self._loaded = ps.reset_and_increment()
+        return self._loaded
+
+    def apply_buffers(self, buffer_solution: Dict[str, int]) -> bool:
+        from . import plant_simulator01 as ps
+
+        if not ps.reset_simulation_results():
+            return False
+        self.buffer_solution = dict(buffer_solution)
+        return ps.modify_buffer_capacity(buffer_solution)
+
+    def run(self, end_time: str = DEFAULT_END_TIME, variant: Optional[int] = None) -> bool:
+        from . import plant_simulator01 as ps
+
+        if variant is not None and variant < 0:
+            raise ValueError("Plant Simulation 后端不支持对偶随机数")
+        if variant is not None and not ps.set_random_variant(variant):
+            return False
+        # 未指定变体时由模型内部递增，无法得知实际使用的变体
+        self._variant = variant
+        self._truncated = self._estimate = None
+        self._end_seconds = parse_time_seconds(end_time)
+        if self._early_stop is None and self._batch_means is None:
+            return ps.run_simulation(end_time)
+
+        def advance(until: float) -> int:
+            deleted = ps.advance_simulation(until)
+            if deleted is None:
+                raise RuntimeError(f"分片运行仿真到{until:.0f}秒失败")
+            return deleted
+
+        try:
+            if self._batch_means is not None:
+                self._estimate = self._batch_means.run(advance, self._end_seconds)
+            else:
+                self._truncated = self._early_stop.run(
+                    advance, self._end_seconds, self.buffer_solution
+                )
+        except RuntimeError as e:
+            print(f"❌ {str(e)}")
+            return False
+        return True
+
+    def results(self) -> Dict[str, Any]:
+        from . import plant_simulator01 as ps
+
+        results = ps.collect_simulation_results()
+        results["end_time"] = (
+            self._truncated["time"] if self._truncated is not None else self._end_seconds
+        )
+        results["variant"] = self._variant
+        if self._estimate is not None:
+            return BatchMeansEstimator.apply(results, self._estimate)
+        return EarlyTermination.apply(results, self._truncated)
+
+    def save_model(self, force: bool = False) -> bool:
+        from . import plant_simulator01 as ps
+
+        return ps.save_model(force)
+
+    def close(self) -> None:
+        if not self._loaded:
+            return
+        import pythoncom
+        from . import plant_simulator01 as ps
+
+        self._loaded = False
+        state = ps.PlantSimState.get_instance()
+        print(
+            f"📉 缓冲区容量属性写入{state.capacity_writes}次，"
+            f"增量更新避免{state.capacity_writes_avoided}次"
+        )
+        state.plant_sim = None
+        state.model_loaded = False
+        pythoncom.CoUninitialize()
+
+
+class DESBackend:
+    """进程内本地离散事件仿真后端"""
+
+    supports_antithetic = True
+
+    def __init__(
+        self,
+        graph_data: Optional[dict] = None,
+        base_seed: int = 1,
+        early_stop: bool = False,
+        slice_seconds: float = SECONDS_PER_DAY,
+        batch_means_period: Optional[float] = None,
+    ):
+        """
+        :param early_stop: 是否按时间片检查累计产出，达标与否确定后提前结束仿真
+        :param slice_seconds: 提前结束的检查间隔（仿真秒）
+        :param batch_means_period: 提供时源不再在30天时停止，每次仿真逐周期记录产出
+            并按批均值估计稳态吞吐量（单次长时间仿真）
+        """
+        self.graph_data = graph_data
+        self.base_seed = base_seed
+        self.early_stop = early_stop
+        self.slice_seconds = slice_seconds
+        self.batch_means_period = batch_means_period
+        self._early_stop: Optional[EarlyTermination] = None
+        self._batch_means: Optional[BatchMeansEstimator] = None
+        self.buffer_solution: Dict[str, int] = {}
+        self.replication = 0  # 未指定变体时递增，对应 IncrementRandomNumbersVariantOnReset
+        self._results: Dict[str, Any] = {}
+
+    def load(self, work_dir: Optional[str] = None) -> bool:
+        if self.graph_data is None:
+            with open(DEFAULT_PRODUCTION_LINE_FILE, "r", encoding="utf-8") as f:
+                self.graph_data = json.load(f)
+        if self.batch_means_period and self._batch_means is None:
+            self.graph_data = open_ended(self.graph_data)
+            self._batch_means = BatchMeansEstimator(self.batch_means_period)
+        if self.early_stop:
+            self._early_stop = EarlyTermination(
+                self.graph_data, slice_seconds=self.slice_seconds
+            )
+        return True
+
+    def apply_buffers(self, buffer_solution: Dict[str, int]) -> bool:
+        self.buffer_solution = dict(buffer_solution)
+        return True
+
+    def run(self, end_time: str = DEFAULT_END_TIME, variant: Optional[int] = None) -> bool:
+        if variant is None:
+            variant = self.base_seed + self.replication
+            self.replication += 1
+        self._results = simulate_production_line(
+            self.graph_data,
+            self.buffer_solution,
+            end_time,
+            variant,
+            self._early_stop,
+            self._batch_means,
+        )
+        self._results["variant"] = variant
+        return True
+
+    def results(self) -> Dict[str, Any]:
+        return self._results
+
+    def save_model(self, force: bool = False) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+def default_fake_throughput(buffer_solution: Dict[str, int]) -> float:
+    """伪后端默认响应面：各缓冲区容量的边际收益递减，全1方案略低于29000"""
+    return 23500 + sum(1200 * (1 - 0.55**cap) for cap in buffer_solution.values())
+
+
+class FakeBackend:
+    """记录调用的伪后端：按响应面加高斯噪声即时返回吞吐量，用于基准测试与性能分析"""
+
+    supports_antithetic = True
+
+    def __init__(
+        self,
+        throughput_fn: Callable[[Dict[str, int]], float] = default_fake_throughput,
+        noise_sigma: float = 300.0,
+        base_seed: int = 1,
+        failure_rate: float = 0.0,
+        crn_correlation: float = 0.8,
+        antithetic_correlation: float = -0.8,
+    ):
+        """
+        :param failure_rate: 每次运行抛出异常的概率，用于模拟仿真实例故障
+        :param crn_correlation: 同一随机数变体下不同方案噪声的相关系数（模拟公共随机数效果）
+        :param antithetic_correlation: 变体 v 与对偶变体 -v 噪声的相关系数（模拟对偶变量效果）
+        """
+        self.throughput_fn = throughput_fn
+        self.noise_sigma = noise_sigma
+        self.base_seed = base_seed
+        self.failure_rate = failure_rate
+        self.crn_correlation = crn_correlation
+        self.antithetic_correlation = antithetic_correlation
+        self._failure_rng = random.Random()  # 故障不参与随机数变体，重建后也不重放
+        self.buffer_solution: Dict[str, int] = {}
+        self.replication = 0
+        self.calls: List[Tuple[str, Any]] = []  # 调用记录 (方法名, 参数)
+        self._results: Dict[str, Any] = {}
+
+    def load(self, work_dir: Optional[str] = None) -> bool:
+        self.calls.append(("load", work_dir))
+        # 会话子进程由 fork 复制后端，重新播种使重建的会话不重放同一故障序列
+        self._failure_rng.seed()
+        return True
+
+    def apply_buffers(self, buffer_solution: Dict[str, int]) -> bool:
+        self.calls.append(("apply_buffers", dict(buffer_solution)))
+        self.buffer_solution = dict(buffer_solution)
+        return True
+
+    def run(self, end_time: str = DEFAULT_END_TIME, variant: Optional[int] = None) -> bool:
+        self.calls.append(("run", (end_time, variant)))
+        if self.failure_rate and self._failure_rng.random() < self.failure_rate:
+            raise RuntimeError("模拟的仿真实例故障")
+        if variant is None:
+            variant = self.base_seed + self.replication
+            self.replication += 1
+        # 噪声 = 变体公共部分 + 方案私有部分，同一变体下各方案噪声按 crn_correlation 相关；
+        # 负变体与正变体的噪声按 antithetic_correlation 相关（对偶），而不是完全相反，
+        # 否则每个对偶对的均值都恰好等于无噪声值
+        key = sorted(self.buffer_solution.items())
+        rho = self.crn_correlation
+
+        def standard_noise(seed: str) -> float:
+            common = random.Random(seed).gauss(0, 1)
+            own = random.Random(f"{seed}/{key}").gauss(0, 1)
+            return rho**0.5 * common + (1 - rho) ** 0.5 * own
+
+        noise = standard_noise(str(abs(variant)))
+        if variant < 0:
+            a = self.antithetic_correlation
+            noise = a * noise + (1 - a * a) ** 0.5 * standard_noise(f"-{abs(variant)}")
+        noise *= self.noise_sigma
+        mean = self.throughput_fn(self.buffer_solution)
+        # 响应面以30天为基准，按仿真时长线性缩放
+        scale = parse_time_seconds(end_time) / parse_time_seconds(DEFAULT_END_TIME)
+        throughput = max(0, int(round((mean + noise) * scale)))
+        self._results = {"throughput": throughput, "variant": variant}
+        return True
+
+    def results(self) -> Dict[str, Any]:
+        self.calls.append(("results", None))
+        return self._results
+
+    def save_model(self, force: bool = False) -> bool:
+        self.calls.append(("save_model", force))
+        return True
+
+    def close(self) -> None:
+        self.calls.append(("close", None))
+
+
+class BackendEvaluator:
+    """将后端包装为单次仿真评估函数，签名同 create_plant_simulation_model"""
+
+    def __init__(self, backend: SimulationBackend, target_total: int = 29000):
+        self.backend = backend
+        self.target_total = target_total
+        self.last_results: Dict[str, Any] = {}  # 最近一次仿真的完整结果（含状态统计）
+
+    def __call__(
+        self,
+        buffer_solution: Dict[str, int],
+        end_time: str = DEFAULT_END_TIME,
+        variant: Optional[int] = None,
+    ) -> Tuple[bool, int]:
+        self.last_results = {}
+        if not self.backend.apply_buffers(buffer_solution):
+            return False, 0
+        if not self.backend.run(end_time, variant):
+            return False, 0
+        self.last_results = self.backend.results()
+        throughput = self.last_results.get("throughput", 0)
+        is_qualified = throughput >= self.target_total
+        print(
+            f"📊 仿真结果：总吞吐量={throughput}件（目标≥{self.target_total}件），"
+            f"是否达标：{is_qualified}"
+        )
+        return is_qualified, throughput
+
+
+BACKENDS = {
+    "plantsim": PlantSimBackend,
+    "des": DESBackend,
+    "fake": FakeBackend,
+}
+
+
+def create_backend(name: str, **kwargs) -> SimulationBackend:
+    """按名称创建仿真后端（plantsim / des / fake）"""
+    if name not in BACKENDS:
+        raise ValueError(f"未知的仿真后端: {name}，可选：{', '.join(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
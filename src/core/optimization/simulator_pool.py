@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+仿真实例池
+
+PlantSimState 是进程级单例，同一进程内只能驱动一个Plant Simulation实例。
+实例池为每个会话启动一个独立的子进程，子进程内加载一个仿真后端
+（私有模型副本与唯一的结果路径），主进程通过管道下发仿真任务。
+
+提供：
+- checkout / checkin：借出与归还空闲会话
+- health_check：探测会话是否存活，异常会话自动回收重建
+- 失败回收：仿真出错或超时的会话被终止并重启，任务转交其他会话重试
+- submit / run_replications / evaluate_batch：让所有授权实例保持忙碌
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.path_config import RESULT_DIR
+from .simulation_backend import DESBackend, SimulationBackend
+
+
+class SimulationSessionError(RuntimeError):
+    """仿真会话异常（进程退出、超时或后端报错）"""
+
+
+def _session_main(conn, backend: SimulationBackend, work_dir: str) -> None:
+    """会话子进程主循环：加载后端后按命令执行仿真"""
+    try:
+        conn.send(("ready", backend.load(work_dir)))
+    except Exception as e:
+        conn.send(("error", f"加载失败: {e}"))
+        return
+
+    while True:
+        try:
+            command, payload = conn.recv()
+        except EOFError:
+            break
+        if command == "ping":
+            conn.send(("pong", None))
+        elif command == "evaluate":
+            solution, end_time, variant = payload
+            try:
+                if backend.apply_buffers(solution) and backend.run(end_time, variant):
+                    conn.send(("result", backend.results()))
+                else:
+                    conn.send(("error", "仿真后端返回失败"))
+            except Exception as e:
+                conn.send(("error", str(e)))
+        elif command == "close":
+            backend.close()
+            break
+
+
+class SimulatorSession:
+    """单个仿真会话：一个子进程 + 一个已加载的仿真后端"""
+
+    # 多个会话并发重建时，子进程会继承其他会话尚未关闭的管道子端，
+    # 使崩溃的会话只能靠超时发现；创建子进程与关闭子端须串行
+    _fork_lock = threading.Lock()
+
+    def __init__(
+        self,
+        index: int,
+        backend: SimulationBackend,
+        work_dir: str,
+        startup_timeout: float = 300.0,
+    ):
+        self.index = index
+        self.backend = backend
+        self.work_dir = work_dir  # 私有目录：模型副本与结果文件
+        self.startup_timeout = startup_timeout
+        self.evaluations = 0
+        self.restarts = 0
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn = None
+
+    def start(self) -> None:
+        os.makedirs(self.work_dir, exist_ok=True)
+        with self._fork_lock:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            self._process = multiprocessing.Process(
+                target=_session_main,
+                args=(child_conn, self.backend, self.work_dir),
+                daemon=True,
+            )
+            self._process.start()
+            child_conn.close()
+        self._conn = parent_conn
+        kind, payload = self._receive(self.startup_timeout)
+        if kind != "ready" or not payload:
+            self.terminate()
+            raise SimulationSessionError(f"会话{self.index}启动失败: {payload}")
+        self.evaluations = 0
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def ping(self, timeout: float = 10.0) -> bool:
+        """健康检查：子进程存活且能及时响应"""
+        if not self.is_alive():
+            return False
+        try:
+            self._conn.send(("ping", None))
+            kind, _ = self._receive(timeout)
+            return kind == "pong"
+        except (SimulationSessionError, OSError):
+            return False
+
+    def evaluate(
+        self,
+        solution: Dict[str, int],
+        end_time: str,
+        variant: Optional[int],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """执行一次仿真并返回结果字典"""
+        if not self.is_alive():
+            raise SimulationSessionError(f"会话{self.index}进程已退出")
+        try:
+            self._conn.send(("evaluate", (solution, end_time, variant)))
+        except OSError as e:
+            raise SimulationSessionError(f"会话{self.index}通信失败: {e}")
+        kind, payload = self._receive(timeout)
+        if kind != "result":
+            raise SimulationSessionError(f"会话{self.index}仿真失败: {payload}")
+        self.evaluations += 1
+        return payload
+
+    def _receive(self, timeout: Optional[float]):
+        try:
+            if not self._conn.poll(timeout):
+                raise SimulationSessionError(f"会话{self.index}响应超时")
+            return self._conn.recv()
+        except (EOFError, OSError) as e:
+            raise SimulationSessionError(f"会话{self.index}连接中断: {e}")
+
+    def terminate(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=5)
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def restart(self) -> None:
+        """回收并重建会话（重新复制模型并加载）"""
+        self.terminate()
+        self.restarts += 1
+        self.start()
+
+    def close(self) -> None:
+        if self.is_alive():
+            try:
+                self._conn.send(("close", None))
+                self._process.join(timeout=30)
+            except OSError:
+                pass
+        self.terminate()
+
+
+class SimulatorPool:
+    """仿真实例池：管理N个独立会话，支持借出/归还、健康检查与失败回收"""
+
+    def __init__(
+        self,
+        backend: Optional[SimulationBackend] = None,
+        size: Optional[int] = None,
+        work_dir: str = os.path.join(RESULT_DIR, "sessions"),
+        evaluation_timeout: Optional[float] = None,
+        max_retries: int = 2,
+        recycle_after: Optional[int] = None,
+        first_variant: int = 1,
+    ):
+        """
+        :param backend: 未加载的仿真后端，每个会话子进程各自加载一份
+        :param size: 会话数量（通常为Plant Simulation授权实例数），默认CPU核心数
+        :param work_dir: 会话私有目录的父目录
+        :param evaluation_timeout: 单次仿真超时（秒），超时视为会话故障
+        :param max_retries: 单个任务因会话故障可重试的次数
+        :param recycle_after: 会话执行多少次仿真后主动重建（None表示不主动重建）
+        :param first_variant: 首个随机数变体编号，run_replications 每次重复仿真递增
+        """
+        self.backend = backend if backend is not None else DESBackend()
+        self.size = size or os.cpu_count() or 1
+        self.work_dir = work_dir
+        self.evaluation_timeout = evaluation_timeout
+        self.max_retries = max_retries
+        self.recycle_after = recycle_after
+        self.next_variant = first_variant
+        # 统计
+        self.evaluations = 0
+        self.failures = 0
+        self.recycles = 0
+        self._lock = threading.Lock()
+
+        self.sessions: List[SimulatorSession] = []
+        self._idle: "queue.Queue[SimulatorSession]" = queue.Queue()
+        for index in range(self.size):
+            session = SimulatorSession(
+                index, self.backend, os.path.join(work_dir, f"session_{index}")
+            )
+            session.start()
+            self.sessions.append(session)
+            self._idle.put(session)
+        self._dispatcher = ThreadPoolExecutor(max_workers=self.size)
+        print(f"✅ 仿真实例池已启动：{self.size}个会话")
+
+    def checkout(self, timeout: Optional[float] = None) -> SimulatorSession:
+        """借出一个空闲会话（无空闲时阻塞等待）"""
+        try:
+            session = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise SimulationSessionError("等待空闲仿真会话超时")
+        if not session.is_alive():
+            try:
+                self._recycle(session)
+            except SimulationSessionError:
+                self._idle.put(session)
+                raise
+        return session
+
+    def checkin(self, session: SimulatorSession, failed: bool = False) -> None:
+        """归还会话；失败或达到使用上限的会话先回收重建"""
+        if failed:
+            with self._lock:
+                self.failures += 1
+        expired = (
+            self.recycle_after is not None
+            and session.evaluations >= self.recycle_after
+        )
+        if failed or expired:
+            try:
+                self._recycle(session)
+            except SimulationSessionError as e:
+                print(f"⚠️ {e}，会话暂不可用，将在下次借出时重试")
+        self._idle.put(session)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """with 语句借出会话，异常时自动标记失败"""
+        session = self.checkout(timeout)
+        failed = False
+        try:
+            yield session
+        except SimulationSessionError:
+            failed = True
+            raise
+        finally:
+            self.checkin(session, failed=failed)
+
+    def _recycle(self, session: SimulatorSession) -> None:
+        print(f"♻️ 回收并重建仿真会话{session.index}")
+        with self._lock:
+            self.recycles += 1
+        session.restart()
+
+    def health_check(self) -> int:
+        """逐个检查空闲会话，回收无响应的会话，返回健康会话数"""
+        healthy = 0
+        for _ in range(self.size):
+            session = self.checkout()
+            ok = session.ping()
+            if ok:
+                healthy += 1
+            self.checkin(session, failed=not ok)
+        return healthy
+
+    def evaluate(
+        self, solution: Dict[str, int], end_time: str, variant: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """在任一空闲会话上执行一次仿真（会话故障时回收并重试）"""
+        last_error = None
+        for _ in range(self.max_retries + 1):
+            try:
+                with self.session() as session:
+                    result = session.evaluate(
+                        solution, end_time, variant, self.evaluation_timeout
+                    )
+                with self._lock:
+                    self.evaluations += 1
+                return result
+            except SimulationSessionError as e:
+                print(f"⚠️ {e}")
+                last_error = e
+        raise SimulationSessionError(f"仿真任务重试{self.max_retries}次后仍失败: {last_error}")
+
+    def submit(
+        self, solution: Dict[str, int], end_time: str, variant: Optional[int] = None
+    ) -> Future:
+        """异步提交一次仿真，返回结果字典的 Future"""
+        return self._dispatcher.submit(self.evaluate, solution, end_time, variant)
+
+    def _reserve_variants(self, count: int) -> range:
+        with self._lock:
+            variants = range(self.next_variant, self.next_variant + count)
+            self.next_variant += count
+        return variants
+
+    def run_replications(
+        self,
+        solution: Dict[str, int],
+        end_time: str,
+        num_replications: int,
+        variants: Optional[List[int]] = None,
+    ) -> List[int]:
+        """并行执行同一方案的多次重复仿真（接口同 ReplicationExecutor）"""
+        return self.evaluate_batch([solution], end_time, num_replications, variants)[0]
+
+    def evaluate_batch(
+        self,
+        solutions: List[Dict[str, int]],
+        end_time: str,
+        num_replications: int,
+        variants: Optional[List[int]] = None,
+        observer: Optional[Callable[[Dict[str, int], Dict[str, Any]], None]] = None,
+    ) -> List[List[int]]:
+        """一次性提交多个方案的全部重复仿真，返回各方案的吞吐量列表
+
+        :param variants: 各方案共用的随机数变体（公共随机数）；为空时每个方案各自顺延递增
+        :param observer: 每次仿真完成后以 (方案, 结果字典) 调用，用于收集状态统计
+        """
+        start = time.perf_counter()
+        futures = [
+            [
+                self.submit(solution, end_time, variant)
+                for variant in (
+                    variants
+                    if variants is not None
+                    else self._reserve_variants(num_replications)
+                )
+            ]
+            for solution in solutions
+        ]
+        # 按完成顺序汇总，结果仍按提交顺序排列
+        positions = {
+            future: (index, position)
+            for index, solution_futures in enumerate(futures)
+            for position, future in enumerate(solution_futures)
+        }
+        throughputs = [[0] * len(solution_futures) for solution_futures in futures]
+        for future in as_completed(positions):
+            index, position = positions[future]
+            results = future.result()
+            throughputs[index][position] = results.get("throughput", 0)
+            if observer is not None:
+                observer(solutions[index], results)
+        print(
+            f"--- 完成 {len(solutions)}个方案 × {num_replications}次仿真，"
+            f"耗时{time.perf_counter() - start:.1f}秒 ---"
+        )
+        return throughputs
+
+    def close(self) -> None:
+        self._dispatcher.shutdown(wait=True)
+        for session in self.sessions:
+            session.close()
+        print(
+            f"✅ 仿真实例池已关闭：仿真{self.evaluations}次，"
+            f"失败{self.failures}次，回收{self.recycles}次"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
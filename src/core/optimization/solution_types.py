@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓冲区方案的公共类型
+
+各优化器、评估组件与统计模块共用的方案键与批量评估函数类型，
+方案键按缓冲区名称排序，与评估缓存的JSON方案键顺序一致
+"""
+from typing import Callable, Dict, List, Tuple
+
+# 方案键：按缓冲区名称排序的 (名称, 容量) 元组，可哈希
+SolutionKey = Tuple[Tuple[str, int], ...]
+# 批量评估函数：方案列表 → [(是否达标, 平均吞吐量)]
+BatchValidator = Callable[[List[Dict[str, int]]], List[Tuple[bool, int]]]
+
+
+def solution_key(solution: Dict[str, int]) -> SolutionKey:
+    """将方案转换为可哈希的元组键（按名称排序）"""
+    return tuple(sorted(solution.items()))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+推测式并行模拟退火
+
+低温阶段绝大多数候选解被拒绝，而 optimize.run_annealing 每次都要等一个候选解的
+完整验证结束才生成下一个，仿真实例池中其余实例空闲。推测式执行：
+- 假设接下来的候选解都被拒绝，从当前解一次生成 width 个候选解：
+  第k个候选解按"前k次均被拒绝"后的状态生成（温度冷却k次、
+  前k个候选解已计入已访问集合）
+- width 个候选解作为一批并行验证（validate_batch）
+- 按生成顺序依次执行与顺序路径完全相同的记录、接受判定
+  （Algorithm4._accept_candidate）、迭代计数与冷却；第一个被接受的
+  候选解提交后，其后的候选解是从错误的状态生成的，丢弃其评估结果
+  （不计入观测、历史、已访问集合与序贯判定统计；启用评估缓存时仿真结果仍可复用）
+
+每个被处理的候选解都恰好在顺序路径中它该被生成的状态下生成、按同一温度
+判定，因此链的统计语义与顺序路径一致，只是随机数的消耗顺序不同。
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .algorithm4 import Algorithm4
+from .sequential_sampling import SequentialQualificationTest
+from .solution_types import BatchValidator
+
+
+
+class SpeculativeAnnealing:
+    """按"假设拒绝"一次生成多个候选解并行验证，顺序提交第一个被接受的候选解"""
+
+    def __init__(self, algo4: Algorithm4, width: int):
+        """
+        :param algo4: 模拟退火状态（当前解、温度、已访问集合等）
+        :param width: 每批推测生成的候选解数（通常为仿真实例数）
+        """
+        self.algo4 = algo4
+        self.width = max(1, width)
+        self.blocks = 0
+        self.evaluated = 0  # 提交验证的候选解数
+        self.discarded = 0  # 因前面的候选解被接受而作废的候选解数
+
+    def _propose(self, max_iterations: int, stop_temperature: float) -> List[Dict[str, int]]:
+        """按"前面的候选解均被拒绝"依次生成候选解（不超过剩余迭代次数）"""
+        algo4 = self.algo4
+        temperature = algo4.temperature
+        added = []
+        candidates = []
+        for k in range(self.width):
+            if algo4.iteration + k >= max_iterations or algo4.temperature <= stop_temperature:
+                break
+            candidate = algo4._generate_candidate_solution()
+            candidates.append(candidate)
+            # 顺序路径中该候选解被验证后才生成下一个：计入已访问并冷却一次
+            key = algo4._get_solution_key(candidate)
+            if key not in algo4.visited:
+                algo4.visited.add(key)
+                added.append(key)
+            algo4.cool_temperature()
+        # 恢复状态，处理阶段按顺序路径重新记录
+        algo4.temperature = temperature
+        algo4.visited.difference_update(added)
+        return candidates
+
+    def step(
+        self,
+        validate: BatchValidator,
+        current_qualified: bool,
+        current_throughput: int,
+        max_iterations: int,
+        stop_temperature: float,
+        on_evaluated: Optional[Callable[[Dict[str, int], Dict[str, int]], None]] = None,
+        on_iteration: Optional[Callable[[int], None]] = None,
+        sequential: Optional[SequentialQualificationTest] = None,
+    ) -> Tuple[bool, int]:
+        """
+        推测执行一批迭代
+        :param on_evaluated: 以 (当前解, 候选解) 调用，用于公共随机数比较等统计
+        :param on_iteration: 每处理完一次迭代以迭代次数调用（模型保存策略等）
+        :param sequential: validate 使用的序贯检验，只计入被处理的候选解的判定
+        :return: 更新后的 (当前解是否达标, 当前解吞吐量)
+        """
+        algo4 = self.algo4
+        candidates = self._propose(max_iterations, stop_temperature)
+        print(
+            f"\n--- 推测执行：迭代 {algo4.iteration + 1}-{algo4.iteration + len(candidates)}，"
+            f"温度：{algo4.temperature:.2f}，{len(candidates)}个候选解批量验证 ---"
+        )
+        if sequential is not None:
+            sequential.defer()
+        results = validate(candidates)
+        self.blocks += 1
+        self.evaluated += len(candidates)
+
+        for k, (candidate, (qualified, throughput)) in enumerate(zip(candidates, results)):
+            total = algo4._calculate_total_buffer(candidate)
+            if sequential is not None:
+                sequential.commit(candidate)
+            if on_evaluated is not None:
+                on_evaluated(algo4.current_solution, candidate)
+            algo4._update_observations(candidate, throughput)
+            algo4.add_history_solution(candidate, total, qualified, throughput)
+            accept = algo4._accept_candidate(
+                candidate_total=total,
+                candidate_qualified=qualified,
+                current_qualified=current_qualified,
+            )
+            if accept:
+                print(
+                    f"✅ 接受第{k + 1}个候选解，总容量从 {algo4.current_total_buffer} 变为 {total}"
+                )
+                algo4.update_current_solution(candidate, total)
+                current_qualified, current_throughput = qualified, throughput
+            else:
+                algo4.reject_candidate()
+            algo4.iteration += 1
+            algo4.cool_temperature()
+            if on_iteration is not None:
+                on_iteration(algo4.iteration)
+            if accept:
+                discarded = len(candidates) - k - 1
+                if discarded:
+                    print(f"♻️ 作废其后{discarded}个推测候选解的评估")
+                self.discarded += discarded
+                break
+        if sequential is not None:
+            sequential.discard_deferred()
+        return current_qualified, current_throughput
+
+    def summary(self) -> str:
+        used = self.evaluated - self.discarded
+        return (
+            f"推测式并行退火：{self.blocks}批，验证{self.evaluated}个候选解，"
+            f"有效{used}个，作废{self.discarded}个"
+            f"（平均每批推进{used / self.blocks if self.blocks else 0:.1f}次迭代）"
+        )
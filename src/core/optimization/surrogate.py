@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+代理模型预筛
+
+每个候选解都直接做完整的重复仿真，即使它的总容量大于当前达标解、
+几乎必然被拒绝。RidgeSurrogate 用岭回归（缓冲区容量一次项 + 两两交叉项）
+在线拟合已仿真方案的平均吞吐量，给出预测均值与预测标准差；
+SurrogateScreen 据此估计候选解被模拟退火接受的概率，概率可忽略时：
+- skip：不仿真，直接按拒绝处理
+- single：只做1次低精度仿真，达标时才进入完整验证
+
+不依赖numpy：特征维数很小（10个缓冲区时56维），正规方程用Cholesky分解求解。
+"""
+import math
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+
+SCREEN_MODES = ("skip", "single")
+
+
+def _cholesky(matrix: List[List[float]]) -> List[List[float]]:
+    """对称正定矩阵的Cholesky分解（下三角L，matrix = L·Lᵀ）"""
+    n = len(matrix)
+    lower = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        row_i = lower[i]
+        for j in range(i + 1):
+            row_j = lower[j]
+            total = matrix[i][j] - sum(row_i[k] * row_j[k] for k in range(j))
+            if i == j:
+                row_i[i] = math.sqrt(max(total, 1e-12))
+            else:
+                row_i[j] = total / row_j[j]
+    return lower
+
+
+def _cholesky_solve(lower: List[List[float]], b: List[float]) -> List[float]:
+    """解 L·Lᵀ·x = b"""
+    n = len(lower)
+    y = [0.0] * n
+    for i in range(n):
+        y[i] = (b[i] - sum(lower[i][k] * y[k] for k in range(i))) / lower[i][i]
+    x = [0.0] * n
+    for i in reversed(range(n)):
+        x[i] = (y[i] - sum(lower[k][i] * x[k] for k in range(i + 1, n))) / lower[i][i]
+    return x
+
+
+class RidgeSurrogate:
+    """吞吐量的岭回归代理模型（一次项 + 两两交叉项，增量累积正规方程）"""
+
+    def __init__(self, buffer_names: List[str], ridge: float = 1.0):
+        """
+        :param buffer_names: 缓冲区名称（决定特征顺序）
+        :param ridge: 岭回归正则化系数（截距项不惩罚）
+        """
+        self.buffer_names = list(buffer_names)
+        self.ridge = ridge
+        self._reset()
+
+    def _reset(self) -> None:
+        size = 1 + len(self.buffer_names) * (len(self.buffer_names) + 1) // 2
+        self._xtx = [[0.0] * size for _ in range(size)]
+        self._xty = [0.0] * size
+        self._rows: List[Tuple[List[float], float]] = []
+        self._weights: Optional[List[float]] = None
+        self._lower: Optional[List[List[float]]] = None
+        self._sigma2 = 0.0
+
+    @property
+    def n(self) -> int:
+        return len(self._rows)
+
+    def features(self, solution: Dict[str, int]) -> List[float]:
+        caps = [float(solution[name]) for name in self.buffer_names]
+        pairs = [
+            caps[i] * caps[j] for i in range(len(caps)) for j in range(i + 1, len(caps))
+        ]
+        return [1.0] + caps + pairs
+
+    def update(self, solution: Dict[str, int], throughput: float) -> None:
+        """加入一条观测（秩1更新正规方程），下次预测时重新求解"""
+        x = self.features(solution)
+        for i, xi in enumerate(x):
+            if xi:
+                row = self._xtx[i]
+                for j, xj in enumerate(x):
+                    row[j] += xi * xj
+                self._xty[i] += xi * throughput
+        self._rows.append((x, float(throughput)))
+        self._weights = None
+
+    def fit(self, observations: Dict[Tuple[Tuple[str, int], ...], List[int]]) -> None:
+        """从 Algorithm4.observations 重建（续跑时使用）"""
+        self._reset()
+        for key, throughputs in observations.items():
+            for throughput in throughputs:
+                self.update(dict(key), throughput)
+
+    def _solve(self) -> None:
+        size = len(self._xty)
+        penalized = [row[:] for row in self._xtx]
+        for i in range(1, size):
+            penalized[i][i] += self.ridge
+        penalized[0][0] += 1e-9
+        self._lower = _cholesky(penalized)
+        self._weights = _cholesky_solve(self._lower, self._xty)
+        # 残差方差，自由度扣除岭回归的有效参数个数 p - λ·tr(A⁻¹)
+        rss = sum(
+            (y - sum(w * xi for w, xi in zip(self._weights, x))) ** 2
+            for x, y in self._rows
+        )
+        unit = [0.0] * size
+        trace = 0.0
+        for i in range(1, size):
+            unit[i] = 1.0
+            trace += _cholesky_solve(self._lower, unit)[i]
+            unit[i] = 0.0
+        effective = size - self.ridge * trace
+        self._sigma2 = rss / max(1.0, self.n - effective)
+
+    def predict(self, solution: Dict[str, int]) -> Tuple[float, float]:
+        """预测平均吞吐量，返回 (均值, 预测标准差)"""
+        if self._weights is None:
+            self._solve()
+        x = self.features(solution)
+        mean = sum(w * xi for w, xi in zip(self._weights, x))
+        leverage = sum(a * b for a, b in zip(x, _cholesky_solve(self._lower, x)))
+        return mean, math.sqrt(self._sigma2 * (1.0 + leverage))
+
+
+class SurrogateScreen:
+    """按代理模型估计的接受概率预筛候选解，并统计节省的仿真次数"""
+
+    def __init__(
+        self,
+        surrogate: RidgeSurrogate,
+        mode: str = "skip",
+        target_total: int = 29000,
+        threshold: float = 0.01,
+        min_observations: int = 20,
+    ):
+        """
+        :param mode: 预筛方式（skip：直接跳过；single：先做1次低精度仿真）
+        :param threshold: 预测接受概率低于该值时视为可忽略
+        :param min_observations: 代理模型至少积累多少条观测后才开始预筛
+        """
+        if mode not in SCREEN_MODES:
+            raise ValueError(f"未知的预筛方式: {mode}，可选：{', '.join(SCREEN_MODES)}")
+        self.surrogate = surrogate
+        self.mode = mode
+        self.target_total = target_total
+        self.threshold = threshold
+        self.min_observations = min_observations
+        self.screened = 0  # 预测接受概率可忽略的候选解数
+        self.skipped = 0  # 最终未做完整验证的候选解数
+        self.promoted = 0  # 低精度仿真后仍进入完整验证的候选解数
+
+    def acceptance_probability(
+        self,
+        algo4,
+        candidate: Dict[str, int],
+        candidate_total: int,
+        current_qualified: bool,
+    ) -> Optional[float]:
+        """代理模型估计的接受概率；观测不足时返回 None"""
+        if self.surrogate.n < self.min_observations:
+            return None
+        mean, std = self.surrogate.predict(candidate)
+        p_qualified = 1.0 - NormalDist(mean, max(std, 1e-9)).cdf(self.target_total)
+        return p_qualified * algo4._acceptance_probability(
+            candidate_total, True, current_qualified
+        ) + (1.0 - p_qualified) * algo4._acceptance_probability(
+            candidate_total, False, current_qualified
+        )
+
+    def screen_out(
+        self,
+        algo4,
+        candidate: Dict[str, int],
+        candidate_total: int,
+        current_qualified: bool,
+    ) -> bool:
+        """判断候选解是否应被预筛掉（single 模式下还需低精度仿真确认）"""
+        prob = self.acceptance_probability(
+            algo4, candidate, candidate_total, current_qualified
+        )
+        if prob is None or prob >= self.threshold:
+            return False
+        self.screened += 1
+        print(f"🔎 代理模型预测接受概率{prob:.4f}，低于阈值{self.threshold}")
+        return True
+
+    def after_single(self, single_qualified: bool) -> bool:
+        """single 模式：低精度仿真不达标则跳过，返回是否仍然跳过"""
+        if single_qualified:
+            self.promoted += 1
+            return False
+        return True
+
+    def record_skip(self) -> None:
+        self.skipped += 1
+
+    def get_state(self) -> Dict[str, Any]:
+        """导出预筛统计（代理模型本身由 observations 重建）"""
+        return {
+            "screened": self.screened,
+            "skipped": self.skipped,
+            "promoted": self.promoted,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.screened = state["screened"]
+        self.skipped = state["skipped"]
+        self.promoted = state["promoted"]
+
+    def summary(self, replications_per_evaluation: float = 5) -> str:
+        """预筛统计：节省的仿真次数按每次完整验证的平均重复次数估算"""
+        single_cost = self.screened if self.mode == "single" else 0
+        saved = self.skipped * replications_per_evaluation - single_cost
+        return (
+            f"代理模型预筛（{self.mode}）：{self.screened}个候选解接受概率可忽略，"
+            f"跳过完整验证{self.skipped}个，低精度仿真后转完整验证{self.promoted}个，"
+            f"约节省{saved:.0f}次仿真"
+        )
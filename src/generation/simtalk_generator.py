@@ -5,9 +5,10 @@ from src.utils.time_utils import format_time_value
 from src.config.path_config import DATA_OUTPUT_FILE
 
 
-def json_to_simtalk(json_data):
+def json_to_simtalk(json_data, data_output_file=DATA_OUTPUT_FILE):
     """
     将JSON格式的有向图转换为两部分SimTalk代码：模型建立 + 数据写入
+    data_output_file: 数据表写出路径（并行仿真时每个实例使用独立文件）
     """
     nodes = json_data.get("nodes", [])
     edges = json_data.get("edges", [])
@@ -314,12 +315,12 @@ def json_to_simtalk(json_data):
             )
             row += 2  # 不同物料终结间空一行
 
-    data_writing.append(f'.模型.模型.数据表.writefile("{DATA_OUTPUT_FILE}")')
+    data_writing.append(f'.模型.模型.数据表.writefile("{data_output_file}")')
 
     return "\n".join(model_setup), "\n".join(data_writing)
 
 
-def capacity_json_to_simtalk(json_data):
+def capacity_json_to_simtalk(json_data, data_output_file=DATA_OUTPUT_FILE):
 
     model_setup = []
     nodes = json_data.get("nodes", [])
@@ -334,7 +335,7 @@ def capacity_json_to_simtalk(json_data):
             '.信息流.数据表.createObject(.模型.模型, 100, 250, "数据表")',
             '.模型.模型.数据表[1, 1] := "总吞吐量"',
             ".模型.模型.数据表[2, 1] := To_str(.模型.模型.OP130.statdeleted)",
-            f'.模型.模型.数据表.writefile("{DATA_OUTPUT_FILE}")',
+            f'.模型.模型.数据表.writefile("{data_output_file}")',
             "sleep(3)",
         ]
     return "\n".join(model_setup), "\n".join(data_writing)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+from statistics import NormalDist, fmean, stdev
+
+
+def t_quantile(p, df):
+    """
+    Student t 分布的分位数（不依赖scipy）
+    df=1、2 使用解析式，df>=3 使用 Cornish-Fisher 展开近似
+    """
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    g1 = (z**3 + z) / 4
+    g2 = (5 * z**5 + 16 * z**3 + 3 * z) / 96
+    g3 = (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384
+    g4 = (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / 92160
+    return z + g1 / df + g2 / df**2 + g3 / df**3 + g4 / df**4
+
+
+def mean_half_width(samples, confidence=0.95, one_sided=False):
+    """
+    样本均值及其置信区间半宽
+    返回 (均值, 半宽)；样本数少于2时半宽为无穷大
+    """
+    n = len(samples)
+    mean = fmean(samples)
+    if n < 2:
+        return mean, math.inf
+    p = confidence if one_sided else (1 + confidence) / 2
+    return mean, t_quantile(p, n - 1) * stdev(samples) / math.sqrt(n)
+
+
+def mser_truncation(series, batch_size=5):
+    """
+    MSER-m 预热期截断点（默认 MSER-5）
+    将观测序列每 batch_size 个取平均，选使剩余批均值的
+    标准误平方 sum((Y_i - Ȳ_d)^2) / (n-d)^2 最小的截断批数 d（d ≤ n/2），
+    返回应删除的原始观测个数
+    """
+    batches = [
+        fmean(series[i : i + batch_size])
+        for i in range(0, len(series) - batch_size + 1, batch_size)
+    ]
+    n = len(batches)
+    if n < 2:
+        return 0
+    # 自后向前累计剩余批的和与平方和，O(n) 计算所有截断点
+    total = square = 0.0
+    values = [0.0] * n
+    for d in range(n - 1, -1, -1):
+        total += batches[d]
+        square += batches[d] ** 2
+        remaining = n - d
+        values[d] = (square - total**2 / remaining) / remaining**2
+    return min(range(n // 2 + 1), key=values.__getitem__) * batch_size
+
+
+def batch_means(series, num_batches=20, confidence=0.95):
+    """
+    非重叠批均值法估计稳态均值
+    序列按时间顺序等分为 num_batches 批（多余的最早观测舍去），
+    返回 (均值, 置信区间半宽, 每批观测数)
+    """
+    size = len(series) // num_batches
+    if size < 1:
+        raise ValueError(f"观测数{len(series)}少于批数{num_batches}")
+    start = len(series) - size * num_batches
+    means = [fmean(series[start + i * size : start + (i + 1) * size]) for i in range(num_batches)]
+    mean, half_width = mean_half_width(means, confidence)
+    return mean, half_width, size
@@ -0,0 +1,174 @@
+import math
+import random
+
+import pytest
+
+from src.core.optimization.des_simulator import _AntitheticRandom, simulate_production_line
+
+
+def test_uniforms_are_mirrored():
+    plain, mirrored = random.Random("7/S1"), _AntitheticRandom("7/S1")
+    for _ in range(1000):
+        assert mirrored.random() == 1.0 - plain.random()
+
+
+def test_normal_and_lognormal_are_mirrored():
+    plain, mirrored = random.Random("7/S1"), _AntitheticRandom("7/S1")
+    for _ in range(1000):
+        assert math.isclose(mirrored.gauss(5, 2) - 5, 5 - plain.gauss(5, 2))
+        assert math.isclose(mirrored.normalvariate(5, 2) - 5, 5 - plain.normalvariate(5, 2))
+        x, y = mirrored.lognormvariate(1, 0.5), plain.lognormvariate(1, 0.5)
+        assert math.isclose(x * y, math.exp(2))
+
+
+def _line(*specs, edges=None):
+    """按顺序串联的有向图：specs 为 (名称, 类型, data)"""
+    nodes = [{"name": name, "type": node_type, "data": data} for name, node_type, data in specs]
+    if edges is None:
+        edges = [{"from": a[0], "to": b[0]} for a, b in zip(specs, specs[1:])]
+    return {"nodes": nodes, "edges": edges}
+
+
+def _source(interval, start=0, stop=0):
+    return (
+        "S",
+        "源",
+        {"time": {"interval_time": interval, "start_time": start, "stop_time": stop}},
+    )
+
+
+def _station(name, proc_time, failure=None):
+    data = {"time": {"processing_time": proc_time}}
+    if failure:
+        data["failure"] = failure
+    return name, "工位", data
+
+
+def _drain(proc_time=0):
+    return "D", "物料终结", {"time": {"processing_time": proc_time}}
+
+
+def _dist(pattern, **parameters):
+    return {"distribution_pattern": pattern, "parameters": parameters}
+
+
+def test_source_interval_start_and_stop():
+    graph = _line(_source(10, start=100, stop=1000), _station("M", 0), _drain())
+    results = simulate_production_line(graph, end_time=5000)
+    # 100, 110, ..., 1000 共91个零件
+    assert results["throughput"] == 91
+    empty = _line(_source(10, start=1000, stop=100), _station("M", 0), _drain())
+    assert simulate_production_line(empty, end_time=5000)["throughput"] == 0
+
+
+@pytest.mark.parametrize(
+    "proc_time",
+    [
+        _dist("negexp", mean=10),
+        _dist("normal", mean=10, sigma=1),
+        _dist("uniform", lower_bound=5, upper_bound=15),
+        _dist("lognorm", mean=10, sigma=2),
+        _dist("erlang", mean=10, order=2),
+        _dist("gamma", shape=2, rate=5),
+    ],
+)
+def test_proc_time_distribution_sets_station_rate(proc_time):
+    # 源不阻塞时瓶颈为工位，吞吐量 ≈ 时长 / 平均加工时间
+    graph = _line(_source(1), _station("M", proc_time), _drain())
+    results = simulate_production_line(graph, end_time=200000)
+    assert results["throughput"] == pytest.approx(20000, rel=0.03)
+    # 加工时间短于源间隔时工位偶尔等待
+    assert results["stations"]["M"]["working"] == pytest.approx(1.0, abs=0.01)
+
+
+def test_failures_pause_processing():
+    # 每运行90秒故障10秒：可用率90%
+    failure = {"interval_time": 90, "duration_time": 10}
+    graph = _line(_source(1), _station("M", 10, failure), _drain())
+    results = simulate_production_line(graph, end_time=100000)
+    assert results["throughput"] == pytest.approx(9000, abs=2)
+    assert results["stations"]["M"]["failed"] == pytest.approx(0.1, abs=1e-3)
+
+
+def test_buffer_capacity_blocks_upstream_at_bottleneck_rate():
+    graph = _line(
+        _source(1),
+        _station("M1", 5),
+        ("B", "缓冲区", {"capacity": 3}),
+        _station("M2", 10),
+        _drain(),
+    )
+    results = simulate_production_line(graph, end_time=100000)
+    assert results["throughput"] == pytest.approx(10000, abs=2)
+    buffer = results["buffers"]["B"]
+    assert buffer["max_occupancy"] == 3
+    assert buffer["full"] == pytest.approx(1.0, abs=1e-3)
+    # 上游快一倍，一半时间被满缓冲区阻塞
+    assert results["stations"]["M1"]["blocked"] == pytest.approx(0.5, abs=1e-3)
+
+
+def test_buffer_solution_sets_capacity():
+    graph = _line(_source(1), _station("M", 0), ("B", "缓冲区", {"capacity": 1}), _drain(2))
+    results = simulate_production_line(graph, {"B": 4}, end_time=1000)
+    assert results["buffers"]["B"]["capacity"] == 4
+    assert results["buffers"]["B"]["max_occupancy"] == 4
+
+
+def test_conveyor_capacity_length_and_speed():
+    # 运行时间 10m / 2m/s = 5秒，同时最多2件：每5秒通过2件
+    conveyor = ("C", "传送器", {"capacity": 2, "length": 10, "speed": 2})
+    results = simulate_production_line(
+        _line(_source(1), conveyor, _drain()), end_time=10000
+    )
+    assert results["throughput"] == pytest.approx(4000, abs=2)
+    # 默认长度5m、速度1m/s，容量不限：不成为瓶颈
+    unlimited = ("C", "传送器", {"capacity": -1})
+    results = simulate_production_line(
+        _line(_source(1), unlimited, _drain()), end_time=10000
+    )
+    assert results["throughput"] == pytest.approx(10000, abs=6)
+    assert results["drains"]["D"]["statavglifespan"] == pytest.approx(5.0)
+
+
+def test_percentage_exit_strategy_splits_parts():
+    station = _station("M", 1)
+    station[2]["production_status"] = {"qualified": 50, "unqualified": 50}
+    station[2]["production_destination"] = {"qualified": "D", "unqualified": "Scrap"}
+    scrap = ("Scrap", "物料终结", {"time": {"processing_time": 0}})
+    graph = _line(
+        _source(1),
+        station,
+        _drain(),
+        scrap,
+        edges=[
+            {"from": "S", "to": "M"},
+            {"from": "M", "to": "D"},
+            {"from": "M", "to": "Scrap"},
+        ],
+    )
+    results = simulate_production_line(graph, end_time=20000)
+    good = results["drains"]["D"]["statdeleted"]
+    bad = results["drains"]["Scrap"]["statdeleted"]
+    assert good + bad == pytest.approx(20000, abs=2)
+    assert good == pytest.approx(10000, rel=0.03)
+
+
+def test_drain_statistics():
+    graph = _line(_source(10), _station("M", 4), _drain(1))
+    drain = simulate_production_line(graph, end_time=2 * 86400)["drains"]["D"]
+    # 0, 10, ..., 172790 创建的零件各需5秒
+    assert drain["statdeleted"] == 17280
+    assert drain["statavglifespan"] == pytest.approx(5.0)
+    assert drain["statavgexitinterval"] == pytest.approx(10.0)
+    assert drain["statthroughputperday"] == pytest.approx(8640)
+
+
+def test_same_seed_is_reproducible():
+    graph = _line(
+        _source(_dist("negexp", mean=5)),
+        _station("M", _dist("normal", mean=4, sigma=1)),
+        _drain(),
+    )
+    first = simulate_production_line(graph, end_time=10000, seed=3)
+    assert simulate_production_line(graph, end_time=10000, seed=3) == first
+    assert simulate_production_line(graph, end_time=10000, seed=4) != first
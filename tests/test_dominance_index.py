@@ -0,0 +1,54 @@
+from src.core.optimization.dominance_index import DominanceIndex
+
+NAMES = ["B1", "B2", "B3"]
+
+
+def solution(*caps):
+    return dict(zip(NAMES, caps))
+
+
+def test_classify_from_monotonicity():
+    index = DominanceIndex(NAMES)
+    index.add(solution(2, 2, 2), True, 29100)
+    index.add(solution(1, 2, 1), False, 28400)
+    assert index.classify(solution(2, 3, 2)) == (True, 29100)
+    assert index.classify(solution(1, 1, 1)) == (False, 28400)
+    assert index.classify(solution(3, 1, 1)) is None  # 两者都不支配
+    assert index.decided_qualified == 1
+    assert index.decided_failed == 1
+
+
+def test_boundaries_keep_only_extreme_points():
+    index = DominanceIndex(NAMES)
+    index.add(solution(3, 3, 3), True, 29500)
+    index.add(solution(2, 3, 3), True, 29200)  # 取代 (3,3,3)
+    index.add(solution(3, 3, 4), True, 29600)  # 已被覆盖，不保存
+    assert [entry[1] for entry in index.qualified] == [(2, 3, 3)]
+    index.add(solution(1, 1, 1), False, 27000)
+    index.add(solution(1, 2, 1), False, 27500)  # 取代 (1,1,1)
+    index.add(solution(1, 1, 1), False, 27100)  # 已被覆盖，不保存
+    assert [entry[1] for entry in index.failed] == [(1, 2, 1)]
+    assert index.qualified == sorted(index.qualified)
+
+
+def test_conflicting_evidence_is_not_decided():
+    index = DominanceIndex(NAMES)
+    index.add(solution(1, 1, 1), True, 29001)
+    index.add(solution(2, 2, 2), False, 28999)
+    assert index.classify(solution(1, 2, 1)) is None
+    assert index.conflicts == 1
+
+
+def test_wrap_skips_decided_solutions():
+    index = DominanceIndex(NAMES)
+    simulated = []
+
+    def validate(solutions):
+        simulated.extend(solutions)
+        return [(sum(s.values()) >= 6, 28000 + 200 * sum(s.values())) for s in solutions]
+
+    validate_with_index = index.wrap(validate)
+    validate_with_index([solution(2, 2, 2), solution(1, 1, 1)])
+    results = validate_with_index([solution(3, 2, 2), solution(1, 1, 0), solution(3, 1, 1)])
+    assert results[:2] == [(True, 29200), (False, 28600)]
+    assert simulated[2:] == [solution(3, 1, 1)]
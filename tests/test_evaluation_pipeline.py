@@ -0,0 +1,73 @@
+from src.core.optimization.evaluation_pipeline import EvaluationPipeline
+from src.core.optimization.optimization_options import (
+    DEFAULT_SIMULATION_END_TIME,
+    OptimizationOptions,
+    build_parser,
+)
+from src.core.optimization.optimize import BUFFER_NAMES, load_production_line_data
+from src.core.optimization.random_streams import CommonRandomNumbers
+from src.config.path_config import DEFAULT_PRODUCTION_LINE_FILE
+
+SOLUTION = {name: 2 for name in BUFFER_NAMES}
+
+
+def make_pipeline(**kwargs):
+    options = OptimizationOptions(backend_name="fake", parallel_workers=0, **kwargs)
+    options.normalize()
+    graph = load_production_line_data(DEFAULT_PRODUCTION_LINE_FILE)
+    pipeline = EvaluationPipeline.from_options(options, graph, BUFFER_NAMES)
+    assert pipeline.load()
+    return pipeline
+
+
+def test_options_from_default_arguments():
+    options = OptimizationOptions.from_args(build_parser().parse_args([]))
+    assert options == OptimizationOptions()
+
+
+def test_normalize_resolves_incompatible_options(tmp_path):
+    options = OptimizationOptions(
+        backend_name="fake",
+        greedy=True,
+        resume=True,
+        screen_mode="skip",
+        early_stop=True,
+        batch_means_days=10,
+    )
+    options.normalize()
+    assert (options.resume, options.state_file, options.screen_mode) == (False, None, None)
+    assert not options.early_stop and options.batch_means_days == 0
+    assert options.end_time == DEFAULT_SIMULATION_END_TIME and options.backend_options == {}
+
+    checkpointed = OptimizationOptions(state_file=str(tmp_path / "state.json"))
+    checkpointed.normalize()
+    assert checkpointed.cache_file is not None
+
+
+def test_pipeline_validates_with_its_components():
+    pipeline = make_pipeline(streams=CommonRandomNumbers())
+    try:
+        assert pipeline.executor is None
+        qualified, throughput = pipeline.validate_solution(SOLUTION)
+        assert throughput > 0
+        # 公共随机数记录了各次仿真，可作为OCBA的先验
+        assert [variant for variant, _ in pipeline.prior(SOLUTION)] == [1, 2, 3, 4, 5]
+        variants, results = pipeline.simulate([SOLUTION], 5, 2)
+        assert variants == [[6, 7]] and len(results[0]) == 2
+    finally:
+        pipeline.close()
+
+
+def test_batch_validator_skips_dominated_candidates():
+    pipeline = make_pipeline(dominance=True)
+    calls = []
+    validate = pipeline.batch_validator(after=calls.append)
+    try:
+        qualified, throughput = validate([SOLUTION])[0]
+        larger = {name: 3 for name in BUFFER_NAMES}
+        smaller = {name: 1 for name in BUFFER_NAMES}
+        dominated = larger if qualified else smaller
+        assert validate([dominated]) == [(qualified, throughput)]
+        assert calls == [[SOLUTION]]
+    finally:
+        pipeline.close()
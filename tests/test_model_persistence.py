@@ -0,0 +1,63 @@
+from unittest import mock
+
+import pytest
+
+from src.core.optimization.greedy_allocation import GreedyAllocation
+from src.core.optimization.model_persistence import ModelPersistencePolicy
+from src.core.optimization.simulation_backend import FakeBackend
+
+BUFFER_NAMES = ["B1", "B2", "B3"]
+
+
+def saves(backend):
+    return sum(1 for name, _ in backend.calls if name == "save_model")
+
+
+def test_checkpoint_mode_saves_during_population_runs():
+    backend = FakeBackend()
+    policy = ModelPersistencePolicy(backend, "checkpoint", checkpoint_interval=2)
+    greedy = GreedyAllocation(BUFFER_NAMES, {name: 0 for name in BUFFER_NAMES})
+    # 总容量达到6即达标
+    validate = lambda solutions: [
+        (sum(s.values()) >= 6, 28000 + 200 * sum(s.values())) for s in solutions
+    ]
+    iterations = []
+    on_iteration = lambda iteration: (iterations.append(iteration), policy.on_iteration(iteration))
+    greedy.initialize(validate)
+    greedy.run(validate, max_evaluations=100, on_iteration=on_iteration)
+    assert iterations == list(range(1, len(iterations) + 1))
+    assert len(iterations) >= 4
+    assert saves(backend) == policy.saves == len(iterations) // 2
+
+
+def test_never_mode_does_not_save():
+    backend = FakeBackend()
+    policy = ModelPersistencePolicy(backend, "never")
+    for iteration in range(1, 10):
+        policy.on_iteration(iteration)
+    policy.finalize()
+    assert saves(backend) == 0
+
+
+def test_runs_do_not_mark_model_dirty():
+    pytest.importorskip("win32com")
+    from src.core.optimization import plant_simulator01 as ps
+
+    state = ps.PlantSimState.get_instance()
+    state.plant_sim = mock.MagicMock()
+    state.plant_sim.IsSimulationRunning.return_value = False
+    state.model_loaded = True
+    state.applied_capacities = {}
+    state.model_dirty = False
+    try:
+        assert ps.reset_simulation_results() and ps.run_simulation()
+        assert not state.model_dirty
+        assert ps.save_model()
+        state.plant_sim.SaveModel.assert_not_called()
+        assert ps.modify_buffer_capacity({"B1": 2})
+        assert state.model_dirty
+        assert ps.save_model()
+        state.plant_sim.SaveModel.assert_called_once()
+    finally:
+        state.plant_sim = None
+        state.model_loaded = False
@@ -0,0 +1,88 @@
+import pytest
+
+from src.core.optimization.algorithm4 import Algorithm4
+from src.core.optimization.optimize import (
+    create_buffer_conveyor_map,
+    extract_conveyor_capacities,
+    load_production_line_data,
+)
+from src.core.optimization.optimizer_checkpoint import OptimizerCheckpoint
+from src.core.optimization.random_streams import CommonRandomNumbers
+from src.core.optimization.sequential_sampling import SequentialQualificationTest
+from src.config.path_config import DEFAULT_PRODUCTION_LINE_FILE
+
+BUFFER_NAMES = [f"B{i}" for i in range(1, 11)]
+
+
+def make_algorithm():
+    graph = load_production_line_data(DEFAULT_PRODUCTION_LINE_FILE)
+    conv_map = create_buffer_conveyor_map(extract_conveyor_capacities(graph))
+    return Algorithm4(BUFFER_NAMES, 10, conv_map)
+
+
+def step(algo4, throughput=29100):
+    candidate = algo4._generate_candidate_solution()
+    total = algo4._calculate_total_buffer(candidate)
+    algo4._update_observations(candidate, throughput)
+    algo4.add_history_solution(candidate, total, True, throughput)
+    if algo4._accept_candidate(total, True, True):
+        algo4.update_current_solution(candidate, total)
+    algo4.iteration += 1
+    algo4.cool_temperature()
+    return candidate
+
+
+def test_round_trip_resumes_same_sequence(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    algo4 = make_algorithm()
+    streams = CommonRandomNumbers(antithetic=True)
+    streams.observe({"B1": 1}, [1, -1], [28900, 29100])
+    sequential = SequentialQualificationTest()
+    sequential.decisions.append((3, True, True))
+    for _ in range(5):
+        step(algo4)
+    checkpoint = OptimizerCheckpoint(path, config={"backend": "fake"})
+    checkpoint.save(algo4, {"current_qualified": True}, streams=streams, sequential=sequential)
+    saved_iteration = algo4.iteration
+    expected = [step(algo4) for _ in range(5)]
+
+    restored = make_algorithm()
+    restored_streams = CommonRandomNumbers(antithetic=True)
+    restored_sequential = SequentialQualificationTest()
+    reader = OptimizerCheckpoint(path, config={"backend": "fake"})
+    loop = reader.restore(
+        reader.load(),
+        restored,
+        streams=restored_streams,
+        sequential=restored_sequential,
+    )
+    assert loop == {"current_qualified": True}
+    assert restored.iteration == saved_iteration
+    assert restored_streams.samples == streams.samples
+    assert restored_sequential.decisions == [(3, True, True)]
+    assert [step(restored) for _ in range(5)] == expected
+    assert restored.get_state() == algo4.get_state()
+
+
+def test_load_checks_config(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    assert OptimizerCheckpoint(path).load() is None
+    OptimizerCheckpoint(path, config={"backend": "fake"}).save(make_algorithm(), {})
+    with pytest.raises(ValueError):
+        OptimizerCheckpoint(path, config={"backend": "des"}).load()
+
+
+def test_interval(tmp_path):
+    checkpoint = OptimizerCheckpoint(str(tmp_path / "checkpoint.json"), interval=3)
+    algo4 = make_algorithm()
+    saved = [checkpoint.on_iteration(i, algo4, {}) for i in range(1, 7)]
+    assert saved == [False, False, True, False, False, True]
+    assert checkpoint.saves == 2
+
+
+def test_interval_with_skipped_iterations(tmp_path):
+    # 接受候选解时迭代计数一次增加2，越过间隔的整数倍也要写检查点
+    checkpoint = OptimizerCheckpoint(str(tmp_path / "checkpoint.json"), interval=3)
+    algo4 = make_algorithm()
+    saved = [checkpoint.on_iteration(i, algo4, {}) for i in (1, 2, 4, 5, 7)]
+    assert saved == [False, False, True, False, True]
@@ -0,0 +1,56 @@
+import random
+
+from src.core.optimization.pareto_archive import ParetoArchive
+
+
+def brute_force_front(means):
+    """按定义求非支配集合：不存在总容量不大且平均吞吐量不低的其他方案"""
+    points = [(sum(cap for _, cap in key), mean, key) for key, mean in means.items()]
+    front = [
+        (total, mean)
+        for total, mean, key in points
+        if not any(
+            other != key and t <= total and m >= mean and (t, m) != (total, mean)
+            for t, m, other in points
+        )
+    ]
+    return sorted(set(front))
+
+
+def test_front_matches_brute_force():
+    rng = random.Random(7)
+    archive = ParetoArchive()
+    sums = {}
+    for _ in range(400):
+        solution = {f"B{i}": rng.randint(1, 4) for i in range(1, 4)}
+        throughput = 20000 + 800 * sum(solution.values()) + rng.gauss(0, 1500)
+        archive.add(solution, throughput)
+        key = tuple(sorted(solution.items()))
+        total, count = sums.get(key, (0.0, 0))
+        sums[key] = (total + throughput, count + 1)
+        means = {key: total / count for key, (total, count) in sums.items()}
+        assert [(t, m) for _, t, m in archive.front()] == brute_force_front(means)
+    assert archive.totals == sorted(archive.totals)
+    assert archive.throughputs == sorted(archive.throughputs)
+
+
+def test_rebuild_restores_dominated_point():
+    archive = ParetoArchive()
+    small = {"B1": 1, "B2": 1}
+    large = {"B1": 2, "B2": 2}
+    assert archive.add(small, 29500)
+    assert not archive.add(large, 29000)  # 被总容量更小、吞吐量更高的方案支配
+    # small 的平均吞吐量降到 28000 后，large 重新非支配
+    assert archive.add(small, 26500)
+    assert [(total, mean) for _, total, mean in archive.front()] == [(2, 28000), (4, 29000)]
+
+
+def test_queries():
+    archive = ParetoArchive()
+    archive.add({"B1": 1}, 28000)
+    archive.add({"B1": 2}, 29100)
+    archive.add({"B1": 3}, 29600)
+    assert archive.min_buffer_for(29000)[1] == 2
+    assert archive.min_buffer_for(30000) is None
+    assert archive.best_throughput_for(2)[2] == 29100
+    assert archive.best_throughput_for(0) is None
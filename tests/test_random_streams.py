@@ -0,0 +1,31 @@
+from src.core.optimization.random_streams import MIN_ANTITHETIC_VARIANTS, CommonRandomNumbers
+from src.core.optimization.simulation_backend import BackendEvaluator, FakeBackend
+
+END_TIME = "2592000"
+
+
+def observe_pairs(streams, solutions, count):
+    evaluator = BackendEvaluator(FakeBackend())
+    variants = streams.variants(0, count)
+    for solution in solutions:
+        streams.observe(
+            solution, variants, [evaluator(solution, END_TIME, v)[1] for v in variants]
+        )
+
+
+def test_fake_antithetic_pairs_are_not_exact_mirrors():
+    # 对偶相关系数 -0.8：对偶对均值方差约为独立抽样的 (1-0.8) = 20%，而不是0
+    streams = CommonRandomNumbers(antithetic=True)
+    observe_pairs(streams, [{"B1": 3}], 400)
+    assert 0.1 < streams.antithetic_ratio() < 0.35
+
+
+def test_summary_flags_too_few_antithetic_variants():
+    streams = CommonRandomNumbers(antithetic=True)
+    observe_pairs(streams, [{"B1": cap} for cap in range(1, 20)], 4)
+    assert streams.antithetic_variants() == 2
+    assert "估计不可靠" in streams.summary()
+
+    streams = CommonRandomNumbers(antithetic=True)
+    observe_pairs(streams, [{"B1": 3}], 2 * MIN_ANTITHETIC_VARIANTS)
+    assert "估计不可靠" not in streams.summary()
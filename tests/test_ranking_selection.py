@@ -0,0 +1,56 @@
+import random
+
+from src.core.optimization.ranking_selection import OCBASelection
+
+
+def make_selection(budget, means, initial_replications=3):
+    rng = random.Random(5)
+    calls = []
+
+    def replicate(solutions, first, count):
+        calls.append((len(solutions), count))
+        return [[None] * count for _ in solutions], [
+            [int(rng.gauss(means[solution["B1"]], 300)) for _ in range(count)]
+            for solution in solutions
+        ]
+
+    selection = OCBASelection(
+        replicate, budget=budget, increment=4, initial_replications=initial_replications
+    )
+    history = [({"B1": cap, "B2": 1}, cap + 1, True, 29050) for cap in means]
+    selection.add_candidates(history)
+    return selection, calls
+
+
+def test_initial_top_up_counts_against_budget():
+    means = {cap: 28800 + 100 * cap for cap in range(1, 9)}
+    selection, calls = make_selection(budget=10, means=means)
+    selection.run()
+    assert selection.used <= 10
+    assert sum(n * count for n, count in calls) == selection.used
+    # 预算只够补齐总容量最小的3个候选
+    assert sorted(key[0][1] for key in selection.samples) == [1, 2, 3]
+
+
+def test_budget_is_respected_after_top_up():
+    means = {1: 28900, 2: 29100, 3: 29400}
+    selection, _ = make_selection(budget=23, means=means)
+    result = selection.run()
+    assert selection.used <= 23
+    assert result is None or result["total"] in (2, 3, 4)
+
+
+def test_antithetic_variance_uses_pair_means():
+    solution = {"B1": 1, "B2": 1}
+    # 逐次吞吐量分散，但对偶对均值几乎不变
+    runs = [(1, 28000), (-1, 30020), (2, 30100), (-2, 27900), (3, 28500), (-3, 29540)]
+    selection = OCBASelection(lambda solutions, first, count: ([], []))
+    selection.add_candidates([(solution, 2, True, 29000)], prior=lambda _: runs)
+    key = next(iter(selection.samples))
+    assert selection._run_variance(key) < 1000
+
+    independent = OCBASelection(lambda solutions, first, count: ([], []))
+    independent.add_candidates(
+        [(solution, 2, True, 29000)], prior=lambda _: [(None, t) for _, t in runs]
+    )
+    assert independent._run_variance(key) > 100 * selection._run_variance(key)
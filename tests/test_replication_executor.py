@@ -0,0 +1,63 @@
+import time
+
+from src.core.optimization.evaluation_cache import EvaluationCache
+from src.core.optimization.evaluation_pipeline import validate_batch
+from src.core.optimization.replication_executor import ReplicationExecutor
+from src.core.optimization.simulation_backend import BackendEvaluator, FakeBackend
+
+END_TIME = "2592000"
+SOLUTIONS = [{"B1": cap, "B2": 1} for cap in range(1, 4)]
+
+
+class SlowBackend(FakeBackend):
+    """变体越小运行越久的伪后端，使完成顺序与提交顺序相反"""
+
+    def run(self, end_time=END_TIME, variant=None) -> bool:
+        time.sleep(0.1 * (5 - variant))
+        return super().run(end_time, variant)
+
+
+def expected_throughput(solution, variant):
+    return BackendEvaluator(FakeBackend())(solution, END_TIME, variant)[1]
+
+
+def test_results_in_submission_order(tmp_path):
+    variants = [1, 2, 3]
+    with ReplicationExecutor(FakeBackend(), 3, str(tmp_path)) as executor:
+        results = executor.evaluate_batch(SOLUTIONS, END_TIME, len(variants), variants)
+    assert results == [[expected_throughput(s, v) for v in variants] for s in SOLUTIONS]
+
+
+def test_aggregates_as_completed(tmp_path):
+    completed = []
+    with ReplicationExecutor(SlowBackend(), 4, str(tmp_path)) as executor:
+        start = time.perf_counter()
+        results = executor.evaluate_batch(
+            SOLUTIONS[:1],
+            END_TIME,
+            4,
+            [1, 2, 3, 4],
+            observer=lambda solution, results: completed.append(results["variant"]),
+        )
+        elapsed = time.perf_counter() - start
+    assert completed == [4, 3, 2, 1]
+    assert results == [[expected_throughput(SOLUTIONS[0], v) for v in (1, 2, 3, 4)]]
+    # 4次仿真并行执行，总耗时约等于最慢的一次（0.4秒），远小于顺序执行的1.0秒
+    assert elapsed < 0.8
+
+
+def test_independent_variants_reserved_per_solution(tmp_path):
+    with ReplicationExecutor(FakeBackend(), 2, str(tmp_path), first_variant=7) as executor:
+        executor.evaluate_batch(SOLUTIONS[:2], END_TIME, 3)
+        assert executor.next_variant == 13
+
+
+def test_cached_variants_match_throughputs(tmp_path):
+    cache = EvaluationCache("fake", str(tmp_path / "cache.sqlite"))
+    with ReplicationExecutor(SlowBackend(), 4, str(tmp_path / "workers")) as executor:
+        validate_batch(SOLUTIONS[:1], END_TIME, 4, executor=executor, cache=cache)
+    runs = cache.load(SOLUTIONS[0], END_TIME)
+    assert sorted(variant for variant, _ in runs) == [1, 2, 3, 4]
+    for variant, throughput in runs:
+        assert throughput == expected_throughput(SOLUTIONS[0], variant)
+    cache.close()
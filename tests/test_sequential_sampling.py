@@ -0,0 +1,35 @@
+from src.core.optimization.sequential_sampling import SequentialQualificationTest
+
+
+def test_antithetic_pairs_use_pair_means():
+    test = SequentialQualificationTest(target_total=29000, max_replications=10)
+    # 逐次吞吐量分散，但对偶对均值稳定地高于目标
+    throughputs = [28200, 31000, 31200, 28200]
+    variants = [1, -1, 2, -2]
+    assert test.decide(throughputs) is None
+    assert test.decide(throughputs, variants) is True
+
+
+def test_next_batch_size_rounds_to_pairs_and_respects_limit():
+    test = SequentialQualificationTest(target_total=29000, max_replications=10)
+    # 只有1个对偶对时先补成2个对偶对
+    assert test.next_batch_size(2, [28000, 30100], [1, -1]) == 2
+    # 均值离目标很近时按整对补，不超过最多次数
+    throughputs = [28900, 29150, 29200, 28880, 29010, 29050]
+    count = test.next_batch_size(6, throughputs, [1, -1, 2, -2, 3, -3])
+    assert count % 2 == 0 and 0 < count <= 4
+
+
+def test_next_batch_size_grows_with_remaining_gap():
+    test = SequentialQualificationTest(target_total=29000, max_replications=20)
+    near = test.next_batch_size(4, [29100, 28800, 29400, 29000])
+    far = test.next_batch_size(4, [30100, 29800, 30400, 30000])
+    assert near > far >= 1
+
+
+def test_summary_reports_negative_saving():
+    test = SequentialQualificationTest()
+    test.decisions = [(6, True, True), (7, False, True)]
+    assert "多用3次" in test.summary(fixed_replications=5)
+    test.decisions = [(2, True, True), (3, False, True)]
+    assert "节省5次" in test.summary(fixed_replications=5)
@@ -0,0 +1,7 @@
+from src.core.optimization.simulation_backend import PlantSimBackend
+
+
+def test_plant_sim_close_without_load_is_noop(capsys):
+    # 实例池模式下主进程的后端从未加载，关闭时不应导入 pythoncom 或打印统计
+    PlantSimBackend().close()
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from src.core.optimization.simulation_backend import BackendEvaluator, FakeBackend
+from src.core.optimization.simulator_pool import SimulationSessionError, SimulatorPool
+
+END_TIME = "2592000"
+SOLUTIONS = [{"B1": cap, "B2": 1} for cap in range(1, 5)]
+
+
+class FlakyBackend(FakeBackend):
+    """每个随机数变体第一次运行时失败（抛出异常或直接退出会话进程）的伪后端
+
+    是否已运行过用标记文件记录，会话重建后仍然可见
+    """
+
+    def __init__(self, marker_dir: str, crash: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.marker_dir = marker_dir
+        self.crash = crash
+
+    def run(self, end_time=END_TIME, variant=None) -> bool:
+        marker = os.path.join(self.marker_dir, f"{variant}")
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            if self.crash:
+                os._exit(1)
+            raise RuntimeError("模拟的仿真实例故障")
+        return super().run(end_time, variant)
+
+
+def expected_throughputs(variants):
+    """同一变体下伪后端结果确定，在主进程中逐次计算期望值"""
+    evaluator = BackendEvaluator(FakeBackend())
+    return [[evaluator(solution, END_TIME, v)[1] for v in variants] for solution in SOLUTIONS]
+
+
+def make_pool(backend, tmp_path, **kwargs):
+    return SimulatorPool(backend, size=3, work_dir=str(tmp_path / "sessions"), **kwargs)
+
+
+def test_results_in_submission_order(tmp_path):
+    variants = [1, 2, 3]
+    with make_pool(FakeBackend(), tmp_path) as pool:
+        results = pool.evaluate_batch(SOLUTIONS, END_TIME, len(variants), variants)
+        assert pool.evaluations == len(SOLUTIONS) * len(variants)
+    assert results == expected_throughputs(variants)
+
+
+def test_failed_session_is_recycled_and_retried(tmp_path):
+    markers = tmp_path / "markers"
+    markers.mkdir()
+    variants = [1, 2]
+    with make_pool(FlakyBackend(str(markers)), tmp_path, max_retries=1) as pool:
+        results = pool.evaluate_batch(SOLUTIONS[:1], END_TIME, len(variants), variants)
+        assert pool.failures == len(variants)
+        assert pool.recycles == len(variants)
+    assert results == expected_throughputs(variants)[:1]
+
+
+def test_retries_are_bounded(tmp_path):
+    with make_pool(FakeBackend(failure_rate=1.0), tmp_path, max_retries=2) as pool:
+        with pytest.raises(SimulationSessionError):
+            pool.evaluate(SOLUTIONS[0], END_TIME, 1)
+        assert pool.failures == 3
+
+
+def test_random_failures_do_not_lose_replications(tmp_path):
+    with make_pool(FakeBackend(failure_rate=0.5), tmp_path, max_retries=30) as pool:
+        results = pool.evaluate_batch(SOLUTIONS, END_TIME, 3, [1, 2, 3])
+        assert pool.failures > 0
+    assert results == expected_throughputs([1, 2, 3])
+
+
+def test_session_crash_does_not_lose_replications(tmp_path):
+    markers = tmp_path / "markers"
+    markers.mkdir()
+    variants = [1, 2, 3]
+    backend = FlakyBackend(str(markers), crash=True)
+    with make_pool(backend, tmp_path, evaluation_timeout=30) as pool:
+        results = pool.evaluate_batch(SOLUTIONS[:2], END_TIME, len(variants), variants)
+        assert pool.failures >= len(variants)
+    assert results == expected_throughputs(variants)[:2]
+
+
+def test_recycle_after(tmp_path):
+    with SimulatorPool(
+        FakeBackend(), size=1, work_dir=str(tmp_path / "sessions"), recycle_after=2
+    ) as pool:
+        pool.evaluate_batch(SOLUTIONS[:1], END_TIME, 5, [1, 2, 3, 4, 5])
+        assert pool.recycles == 2
+        assert pool.failures == 0
+        assert pool.sessions[0].restarts == 2
+        assert pool.sessions[0].evaluations == 1
@@ -0,0 +1,46 @@
+from src.core.optimization.algorithm4 import Algorithm4
+from src.core.optimization.optimize import (
+    create_buffer_conveyor_map,
+    extract_conveyor_capacities,
+    load_production_line_data,
+)
+from src.core.optimization.sequential_sampling import SequentialQualificationTest
+from src.core.optimization.speculative_annealing import SpeculativeAnnealing
+from src.config.path_config import DEFAULT_PRODUCTION_LINE_FILE
+
+BUFFER_NAMES = [f"B{i}" for i in range(1, 11)]
+
+
+def make_algorithm():
+    graph = load_production_line_data(DEFAULT_PRODUCTION_LINE_FILE)
+    conv_map = create_buffer_conveyor_map(extract_conveyor_capacities(graph))
+    return Algorithm4(BUFFER_NAMES, 10, conv_map)
+
+
+def test_only_consumed_candidates_record_sequential_decisions():
+    algo4 = make_algorithm()
+    sequential = SequentialQualificationTest()
+    # 第2个候选解被接受，其后2个候选解作废
+    verdicts = iter([False, True])
+    algo4._accept_candidate = lambda **kwargs: next(verdicts)
+
+    def validate(solutions):
+        for solution in solutions:
+            sequential.record(3, True, solution)
+        return [(True, 29100)] * len(solutions)
+
+    speculative = SpeculativeAnnealing(algo4, width=4)
+    speculative.step(validate, True, 29100, max_iterations=100, stop_temperature=0.1)
+    assert speculative.discarded == 2
+    assert len(sequential.decisions) == 4
+
+    sequential.decisions.clear()
+    verdicts = iter([False, True])
+    algo4._accept_candidate = lambda **kwargs: next(verdicts)
+    speculative.step(
+        validate, True, 29100, max_iterations=100, stop_temperature=0.1, sequential=sequential
+    )
+    assert len(sequential.decisions) == 2
+    # 推测执行结束后恢复直接计入
+    sequential.record(3, True, {"B1": 1})
+    assert len(sequential.decisions) == 3
@@ -0,0 +1,39 @@
+import math
+import random
+
+import pytest
+
+from src.utils.stat_utils import batch_means, mean_half_width, mser_truncation
+
+
+def test_mser_removes_initial_transient():
+    rng = random.Random(3)
+    # 前50个观测从0线性爬升到稳态均值100
+    series = [2 * i + rng.gauss(0, 1) for i in range(50)]
+    series += [100 + rng.gauss(0, 1) for _ in range(950)]
+    warmup = mser_truncation(series, 5)
+    assert warmup % 5 == 0
+    assert 40 <= warmup <= 100
+
+
+def test_mser_keeps_stationary_series():
+    rng = random.Random(4)
+    series = [100 + rng.gauss(0, 5) for _ in range(1000)]
+    assert mser_truncation(series, 5) <= 50
+    assert mser_truncation([1, 2, 3], 5) == 0
+
+
+def test_batch_means():
+    series = list(range(105))
+    mean, half_width, size = batch_means(series, num_batches=10)
+    assert size == 10
+    # 舍去最早的5个观测
+    assert mean == pytest.approx(sum(range(5, 105)) / 100)
+    means = [sum(series[5 + 10 * i : 15 + 10 * i]) / 10 for i in range(10)]
+    assert (mean, half_width) == pytest.approx(mean_half_width(means))
+    with pytest.raises(ValueError):
+        batch_means([1, 2, 3], num_batches=5)
+
+
+def test_mean_half_width_single_sample():
+    assert mean_half_width([5]) == (5, math.inf)
@@ -0,0 +1,35 @@
+from src.core.optimization.evaluation_cache import EvaluationCache
+from src.core.optimization.throughput_estimator import (
+    AnalyticPruner,
+    ThroughputEstimator,
+    calibration_fingerprints,
+    load_cached_records,
+)
+
+END_TIME = "2592000"
+SOLUTION = {f"B{i}": 1 for i in range(1, 11)}
+
+
+def test_load_cached_records_filters_fingerprint(tmp_path):
+    estimator = ThroughputEstimator()
+    db_file = str(tmp_path / "cache.sqlite")
+    des, crn = calibration_fingerprints(estimator.graph_data, "des")[:2]
+    fake = calibration_fingerprints(estimator.graph_data, "fake")[0]
+    for fingerprint, throughput in ((des, 28400), (crn, 28600), (fake, 99999)):
+        cache = EvaluationCache(fingerprint, db_file)
+        cache.store(SOLUTION, END_TIME, 0, [1, 2], [throughput, throughput], [0.0, 0.0])
+        cache.close()
+    records = load_cached_records(db_file, [des, crn], END_TIME)
+    assert sorted(mean for _, mean in records) == [28400, 28600]
+    assert load_cached_records(db_file, [des], "86400") == []
+
+
+def test_pruner_uses_calibrated_estimate():
+    estimator = ThroughputEstimator()
+    pruner = AnalyticPruner(estimator, margin=0.0, target_total=29000)
+    raw = estimator.estimate(SOLUTION)["raw_throughput"]
+    assert raw > 29000
+    assert not pruner.prune(SOLUTION)
+    estimator.evaluate_against_records([(SOLUTION, 28400)])
+    assert pruner.estimate(SOLUTION) == raw * estimator.calibration
+    assert pruner.prune(SOLUTION)
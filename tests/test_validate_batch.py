@@ -0,0 +1,105 @@
+import pytest
+
+from src.core.optimization.des_simulator import DESEvaluator
+from src.core.optimization.evaluation_cache import EvaluationCache
+from src.core.optimization.evaluation_pipeline import (
+    skip_cached_variants,
+    validate_batch,
+    validate_solution,
+)
+from src.core.optimization.random_streams import CommonRandomNumbers
+from src.core.optimization.sequential_sampling import SequentialQualificationTest
+from src.core.optimization.simulation_backend import BackendEvaluator, FakeBackend
+
+END_TIME = "2592000"
+
+
+def run_variants(backend):
+    """伪后端各次仿真使用的随机数变体"""
+    return [args[1] for name, args in backend.calls if name == "run"]
+
+
+def test_fixed_replications():
+    backend = FakeBackend()
+    results = validate_batch(
+        [{"B1": 1}, {"B1": 3}, {"B1": 1}], END_TIME, 3, evaluator=BackendEvaluator(backend)
+    )
+    assert len(results) == 3
+    assert results[0] == results[2]
+    # 重复的方案只评估一次
+    assert len(run_variants(backend)) == 6
+
+
+def test_odd_replications_antithetic_do_not_overshoot():
+    for num_simulations in (1, 3, 5):
+        backend = FakeBackend()
+        streams = CommonRandomNumbers(antithetic=True)
+        results = validate_batch(
+            [{"B1": 1}, {"B1": 2}],
+            END_TIME,
+            num_simulations,
+            evaluator=BackendEvaluator(backend),
+            streams=streams,
+        )
+        assert len(results) == 2
+        variants = run_variants(backend)
+        assert len(variants) == 2 * num_simulations
+        assert variants[:num_simulations] == streams.variants(0, num_simulations)
+
+
+def test_even_replications_antithetic_are_paired():
+    backend = FakeBackend()
+    streams = CommonRandomNumbers(antithetic=True)
+    validate_batch([{"B1": 1}], END_TIME, 4, evaluator=BackendEvaluator(backend), streams=streams)
+    assert run_variants(backend) == [1, -1, 2, -2]
+
+
+def test_sequential_respects_max_replications():
+    backend = FakeBackend(throughput_fn=lambda solution: 29000, noise_sigma=3000)
+    sequential = SequentialQualificationTest(min_replications=3, max_replications=5)
+    streams = CommonRandomNumbers(antithetic=True)
+    validate_batch(
+        [{"B1": 1}],
+        END_TIME,
+        evaluator=BackendEvaluator(backend),
+        sequential=sequential,
+        streams=streams,
+    )
+    assert len(run_variants(backend)) <= 5
+    assert len(sequential.decisions) == 1
+
+
+def test_cache_records_variants_and_top_up_skips_them(tmp_path):
+    db_file = str(tmp_path / "cache.sqlite")
+    solution = {"B1": 2}
+    cache = EvaluationCache("fake", db_file)
+    validate_batch([solution], END_TIME, 3, evaluator=BackendEvaluator(FakeBackend()), cache=cache)
+    assert [variant for variant, _ in cache.load(solution, END_TIME)] == [1, 2, 3]
+    cache.close()
+
+    # 重启后后端计数从0开始，补齐的仿真不应重复使用已缓存的变体
+    cache = EvaluationCache("fake", db_file)
+    backend = FakeBackend()
+    skip_cached_variants(cache, backend)
+    validate_batch([solution], END_TIME, 5, evaluator=BackendEvaluator(backend), cache=cache)
+    assert [variant for variant, _ in cache.load(solution, END_TIME)] == [1, 2, 3, 4, 5]
+    cache.close()
+
+
+def test_validate_solution_with_des_evaluator():
+    evaluator = DESEvaluator(verbose=False)
+    streams = CommonRandomNumbers(antithetic=True)
+    solution = {f"B{i}": 1 for i in range(1, 11)}
+    qualified, throughput = validate_solution(
+        solution, "86400", 2, evaluator=evaluator, streams=streams
+    )
+    # 对偶对使用指定的变体 1 与 -1
+    assert sorted(streams.samples[tuple(sorted(solution.items()))]) == [-1, 1]
+    expected = [DESEvaluator(verbose=False)(solution, "86400", v)[1] for v in (1, -1)]
+    assert throughput == int(round(sum(expected) / 2))
+    assert qualified == (throughput >= 29000)
+
+
+def test_streams_require_an_evaluator_with_variants():
+    with pytest.raises(ValueError):
+        validate_batch([{"B1": 1}], END_TIME, 2, streams=CommonRandomNumbers())